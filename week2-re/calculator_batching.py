@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Micro-batching Scheduler for Calculator Calls
+=============================================
+
+Coalesces many small, independent calculator calls issued from coroutines
+into batches. Requests are collected over a short time window (or until the
+batch is full), executed together with one C-level pass per batch, and every
+caller's future is resolved with its own result or the exception the
+unbatched call would have raised.
+
+Usage:
+    async with MicroBatcher(max_batch_size=1024, max_delay=0.0005) as batcher:
+        total = await batcher.add("1.5", 2)
+        mean = await batcher.calculate_average([1, 2, 3])
+"""
+
+import asyncio
+import operator
+from typing import Callable, Dict, List, Tuple, Union
+
+from calculator_fixed import (
+    CalculatorError, validate_numeric_input, validate_numeric_list
+)
+
+
+def _batch_binary(op: Callable, requests: List[tuple]) -> list:
+    """
+    Run a binary operation over a batch of (a, b) requests
+
+    Returns a list aligned with requests holding either a result or the
+    exception the unbatched call would have raised.
+    """
+    outcomes = [None] * len(requests)
+    xs, ys, positions = [], [], []
+    for pos, (a, b) in enumerate(requests):
+        try:
+            x = validate_numeric_input(a, 'a')
+            y = validate_numeric_input(b, 'b')
+        except CalculatorError as e:
+            outcomes[pos] = e
+            continue
+        if op is operator.truediv and y == 0:
+            outcomes[pos] = CalculatorError("Division by zero is not allowed")
+            continue
+        xs.append(x)
+        ys.append(y)
+        positions.append(pos)
+    try:
+        values = list(map(op, xs, ys))
+    except Exception:
+        # Some request fails (e.g. OverflowError); redo the batch one by one
+        values = []
+        for x, y in zip(xs, ys):
+            try:
+                values.append(op(x, y))
+            except Exception as e:
+                values.append(e)
+    for pos, value in zip(positions, values):
+        outcomes[pos] = value
+    return outcomes
+
+
+def _batch_average(requests: List[tuple]) -> list:
+    """Average a batch of lists, matching calculate_average() result for result"""
+    outcomes = [None] * len(requests)
+    valid, positions = [], []
+    for pos, (numbers,) in enumerate(requests):
+        try:
+            valid.append(validate_numeric_list(numbers, 'numbers'))
+            positions.append(pos)
+        except CalculatorError as e:
+            outcomes[pos] = e
+    for pos, numbers in zip(positions, valid):
+        try:
+            outcomes[pos] = sum(numbers) / len(numbers)
+        except Exception as e:
+            outcomes[pos] = e
+    return outcomes
+
+
+BATCH_KERNELS: Dict[str, Callable[[List[tuple]], list]] = {
+    'add': lambda requests: _batch_binary(operator.add, requests),
+    'subtract': lambda requests: _batch_binary(operator.sub, requests),
+    'multiply': lambda requests: _batch_binary(operator.mul, requests),
+    'divide': lambda requests: _batch_binary(operator.truediv, requests),
+    'calculate_average': _batch_average,
+}
+
+
+def _batch_failure(name: str, cause: Exception) -> CalculatorError:
+    """A fresh CalculatorError for one caller of a batch that failed as a whole"""
+    try:
+        raise CalculatorError(f"Batched {name} failed: {type(cause).__name__}: {cause}") from cause
+    except CalculatorError as e:
+        return e
+
+
+class MicroBatcher:
+    """
+    Collects individual calculator requests and runs them in batches
+
+    A batch for an operation is flushed when it reaches ``max_batch_size``
+    requests or ``max_delay`` seconds after its first request arrived,
+    whichever comes first. Must be used from a running event loop.
+
+    Attributes:
+        batches_run: Number of batches executed so far
+        requests_run: Number of requests executed so far
+    """
+
+    def __init__(self, max_batch_size: int = 1024, max_delay: float = 0.0005):
+        if max_batch_size < 1:
+            raise CalculatorError("max_batch_size must be a positive integer")
+        if max_delay < 0:
+            raise CalculatorError("max_delay must be non-negative")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batches_run = 0
+        self.requests_run = 0
+        self._pending: Dict[str, List[Tuple[tuple, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def submit(self, name: str, *args) -> asyncio.Future:
+        """
+        Queue one request and return a future for its result
+
+        Raises:
+            CalculatorError: If name is not a batchable operation
+        """
+        if name not in BATCH_KERNELS:
+            raise CalculatorError(f"Operation '{name}' cannot be batched")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(name, [])
+        pending.append((args, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(name)
+        elif name not in self._timers:
+            self._timers[name] = loop.call_later(self.max_delay, self._flush, name)
+        return future
+
+    def _flush(self, name: str) -> None:
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(name, None)
+        if not pending:
+            return
+        try:
+            outcomes = BATCH_KERNELS[name]([args for args, _ in pending])
+        except Exception as e:
+            # Never leave callers waiting on a batch that could not run; each
+            # caller gets its own exception so tracebacks are not shared
+            outcomes = [_batch_failure(name, e) for _ in pending]
+        self.batches_run += 1
+        self.requests_run += len(pending)
+        for (_, future), outcome in zip(pending, outcomes):
+            if future.done():  # caller cancelled or timed out
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def flush(self) -> None:
+        """Run every pending batch immediately"""
+        for name in list(self._pending):
+            self._flush(name)
+
+    async def add(self, a, b) -> Union[int, float]:
+        return await self.submit('add', a, b)
+
+    async def subtract(self, a, b) -> Union[int, float]:
+        return await self.submit('subtract', a, b)
+
+    async def multiply(self, a, b) -> Union[int, float]:
+        return await self.submit('multiply', a, b)
+
+    async def divide(self, a, b) -> float:
+        return await self.submit('divide', a, b)
+
+    async def calculate_average(self, numbers) -> float:
+        return await self.submit('calculate_average', numbers)
+
+    async def __aenter__(self) -> "MicroBatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.flush()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Persistent Result Cache for Calculator Calls
+============================================
+
+Opt-in, SQLite-backed cache for expensive calculator calls such as large
+factorials or batch averages over unchanged datasets. Entries are keyed by
+the function's module and qualified name plus a SHA-256 hash of the
+normalized arguments, so a warm restart (or another worker process sharing
+the same file) skips the computation entirely. Lambdas and functions defined
+inside other functions have no stable name and are never cached.
+
+Usage:
+    cache = PersistentCache("calculator_cache.sqlite", max_entries=10000)
+    cached_factorial = cache.wrap(factorial)
+    cached_factorial(1000)        # computed and stored
+    cached_factorial("1000")      # hit: "1000" normalizes to 1000
+    print(cache.stats())
+"""
+
+import functools
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Optional
+
+from calculator_fixed import CalculatorError, validate_numeric_input
+
+
+class _Uncacheable(Exception):
+    """Raised by _normalize() for arguments that have no canonical form"""
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Reduce an argument to a canonical JSON-compatible form
+
+    Numeric strings become numbers (the same conversion the calculator
+    functions apply), and tuples and typed arrays become lists, so equivalent
+    calls map to the same key. Integers of 64 bits or more are written in hex,
+    which has no digit limit. Dicts keep the type of their keys, so {1: x}
+    and {"1": x} differ. Other buffer objects (numpy arrays, bytes,
+    memoryviews) are keyed by their format, shape and a hash of their
+    contents. Anything else raises _Uncacheable rather than guessing from
+    repr(), which can be truncated or contain an object address.
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return value if -2**63 <= value < 2**63 else {'__int__': format(value, 'x')}
+    if isinstance(value, float):
+        return value
+    if isinstance(value, str):
+        try:
+            return validate_numeric_input(value, 'value')
+        except CalculatorError:
+            return value
+    if isinstance(value, (list, tuple, array)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        items = [[k if isinstance(k, str) else _normalize(k), _normalize(v)] for k, v in value.items()]
+        return {'__dict__': sorted(items, key=lambda item: json.dumps(item[0], sort_keys=True))}
+    try:
+        view = memoryview(value)
+    except TypeError:
+        raise _Uncacheable(type(value).__name__)
+    return {'__buffer__': [view.format, list(view.shape or ()),
+                           hashlib.sha256(view.tobytes()).hexdigest()]}
+
+
+def qualified_name(func: Callable) -> Optional[str]:
+    """
+    "module.qualname" for a function that can be found again by name
+
+    Returns None for lambdas, functions defined inside other functions and
+    callables without a module or qualified name (e.g. functools.partial),
+    since two different ones could share a name.
+    """
+    module = getattr(func, '__module__', None)
+    qualname = getattr(func, '__qualname__', None)
+    if not module or not qualname or '<lambda>' in qualname or '<locals>' in qualname:
+        return None
+    return f"{module}.{qualname}"
+
+
+def make_key(func_name: str, args: tuple, kwargs: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the cache key for a call: function name plus a content hash of its arguments
+
+    Returns None when an argument cannot be normalized; such calls bypass the cache.
+    """
+    try:
+        payload = json.dumps([_normalize(list(args)), _normalize(kwargs)],
+                             sort_keys=True, separators=(',', ':'))
+    except _Uncacheable:
+        return None
+    return f"{func_name}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+class PersistentCache:
+    """
+    Size-bounded on-disk result cache shared between processes
+
+    The database runs in WAL mode with a busy timeout, so several processes
+    can read and write the same file concurrently. When the cache exceeds
+    ``max_entries`` or ``max_bytes`` the least recently used entries are
+    evicted. Calls that raise, and calls with arguments that have no
+    canonical key, are never cached.
+
+    Attributes:
+        hits: Lookups served from the cache by this instance
+        misses: Lookups that had to compute the result
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000,
+                 max_bytes: Optional[int] = None, timeout: float = 30.0):
+        if max_entries < 1:
+            raise CalculatorError("max_entries must be a positive integer")
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)")
+
+    def get(self, key: str):
+        """Return (True, value) for a stored key or (False, None) on a miss"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value and evict least recently used entries beyond the bounds"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()))
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = max(0, count - self.max_entries)
+        if excess:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_access LIMIT ?)",
+                (excess,))
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+            # Keep the newest entry even if it alone exceeds the budget
+            for key, size in rows[:-1]:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Return func(*args, **kwargs), reading and populating the cache"""
+        name = qualified_name(func)
+        key = make_key(name, args, kwargs) if name is not None else None
+        if key is None:
+            return func(*args, **kwargs)
+        found, value = self.get(key)
+        if found:
+            return value
+        value = func(*args, **kwargs)
+        self.put(key, value)
+        return value
+
+    def wrap(self, func: Callable) -> Callable:
+        """Return a cached version of func"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size of the cache"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+                'bytes': total,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Compact Columnar File Format for Numeric Series
+===============================================
+
+A small self-describing binary format so datasets are parsed once instead of
+on every run. Values are stored in fixed-size blocks; every block has an
+index entry with its count, min, max and sum, so ``calculate_average`` and
+``find_maximum`` are answered from the index without decoding any values,
+while ``process_data`` streams block by block.
+
+Layout (all integers little-endian)::
+
+    header   b'CALC' | version u8 | dtype 'q'/'d' | codec u8 | pad u8 | block_size u32 | count u64
+    blocks   encoded payloads, back to back
+    index    per block: offset u64 | length u32 | codec u8 | count u32 | min | max | sum
+    trailer  index_offset u64 | n_blocks u32 | b'CALC'
+
+``min``/``max`` are stored in the column dtype; ``sum`` is a signed 128-bit
+integer for 'q' columns (so it cannot overflow) and a float64 for 'd'.
+
+Codecs (standard library only):
+    none     raw values
+    zlib     zlib-compressed values
+    delta    first value + successive differences, zlib-compressed ('q' only)
+    shuffle  byte-shuffled values (all 1st bytes, then all 2nd bytes, ...), zlib-compressed
+
+Usage:
+    write_series("series.calc", values, codec='shuffle')
+    with ColumnarFile("series.calc") as series:
+        series.calculate_average()      # index only
+        for chunk in series.process_blocks('drop'):
+            ...
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+from calculator_fixed import (
+    CalculatorError, validate_numeric_input, validate_numeric_list, process_data
+)
+
+MAGIC = b'CALC'
+VERSION = 1
+CODECS = {'none': 0, 'zlib': 1, 'delta': 2, 'shuffle': 3}
+CODEC_NAMES = {code: name for name, code in CODECS.items()}
+HEADER = struct.Struct('<4sBcBBIQ')
+TRAILER = struct.Struct('<QI4s')
+INDEX_ENTRY = {
+    'q': struct.Struct('<QIBIqq16s'),
+    'd': struct.Struct('<QIBIddd'),
+}
+DEFAULT_BLOCK_SIZE = 65536
+_SWAP = sys.byteorder == 'big'
+
+
+class BlockStats(NamedTuple):
+    """Index entry for one block"""
+    offset: int
+    length: int
+    codec: str
+    count: int
+    minimum: Union[int, float]
+    maximum: Union[int, float]
+    total: Union[int, float]
+
+
+def _to_le_bytes(values: array) -> bytes:
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, raw: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(raw)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _shuffle(raw: bytes, width: int) -> bytes:
+    return b''.join(raw[i::width] for i in range(width))
+
+
+def _unshuffle(data: bytes, width: int) -> bytes:
+    n = len(data) // width
+    out = bytearray(len(data))
+    for i in range(width):
+        out[i::width] = data[i * n:(i + 1) * n]
+    return bytes(out)
+
+
+def _encode(values: array, codec: str) -> Tuple[bytes, str]:
+    """Encode one block, returning (payload, codec actually used)"""
+    if codec == 'delta':
+        deltas = [values[0]] + [b - a for a, b in zip(values, values[1:])]
+        try:
+            return zlib.compress(_to_le_bytes(array('q', deltas))), 'delta'
+        except OverflowError:
+            codec = 'zlib'  # differences do not fit in int64; store this block plainly
+    raw = _to_le_bytes(values)
+    if codec == 'none':
+        return raw, codec
+    if codec == 'zlib':
+        return zlib.compress(raw), codec
+    return zlib.compress(_shuffle(raw, values.itemsize)), codec
+
+
+def _decode(payload: bytes, codec: str, typecode: str) -> array:
+    if codec == 'none':
+        return _from_le_bytes(typecode, payload)
+    raw = zlib.decompress(payload)
+    if codec == 'zlib':
+        return _from_le_bytes(typecode, raw)
+    if codec == 'shuffle':
+        return _from_le_bytes(typecode, _unshuffle(raw, array(typecode).itemsize))
+    deltas = _from_le_bytes('q', raw)
+    values = array('q')
+    running = 0
+    for delta in deltas:
+        running += delta
+        values.append(running)
+    return values
+
+
+def _validate_block(chunk: list, start: int) -> List[Union[int, float]]:
+    validated = []
+    for i, value in enumerate(chunk, start):
+        try:
+            validated.append(validate_numeric_input(value, f"values[{i}]"))
+        except CalculatorError as e:
+            raise CalculatorError(f"Invalid item at index {i} in values: {str(e)}")
+    return validated
+
+
+def _auto_dtype(values: List[Union[int, float]]) -> str:
+    return 'q' if all(type(v) is int and -2**63 <= v < 2**63 for v in values) else 'd'
+
+
+def write_series(path: str, values: Iterable[Union[int, float, str]], dtype: str = 'auto',
+                 codec: str = 'shuffle', block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """
+    Validate a numeric series and write it in the columnar format
+
+    Args:
+        path: Output file path
+        values: List or iterable of numeric values (strings are converted)
+        dtype: 'q' (int64), 'd' (float64) or 'auto' ('q' when the values are
+            all int64-range integers, 'd' otherwise; for an iterable other
+            than a list the first block decides)
+        codec: 'none', 'zlib', 'delta' (int64 only) or 'shuffle'
+        block_size: Values per block
+
+    Returns:
+        Number of values written
+
+    Raises:
+        CalculatorError: If a value is not numeric or a parameter is invalid,
+            or (with dtype='auto') a value cannot be stored exactly in the
+            chosen dtype
+    """
+    if codec not in CODECS:
+        raise CalculatorError(f"codec must be one of {', '.join(CODECS)}")
+    if block_size < 1:
+        raise CalculatorError("block_size must be a positive integer")
+    auto = dtype == 'auto'
+    items = iter(values)
+    pending = []
+    if auto:
+        if isinstance(values, list):
+            values = validate_numeric_list(values, 'values') if values else []
+            dtype = _auto_dtype(values)
+            items = iter(values)
+        else:
+            pending = _validate_block(list(islice(items, block_size)), 0)
+            dtype = _auto_dtype(pending)
+    if dtype not in INDEX_ENTRY:
+        raise CalculatorError("dtype must be 'q', 'd' or 'auto'")
+    if codec == 'delta' and dtype != 'q':
+        raise CalculatorError("delta codec requires dtype 'q'")
+
+    entry = INDEX_ENTRY[dtype]
+    index = []
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, dtype.encode(), CODECS[codec], 0, block_size, 0))
+        while True:
+            validated = pending or _validate_block(list(islice(items, block_size)), count)
+            pending = []
+            if not validated:
+                break
+            if auto and dtype == 'd':
+                for i, value in enumerate(validated, count):
+                    if type(value) is int and abs(value) > 2**53:
+                        raise CalculatorError(f"Item at index {i} in values cannot be stored exactly "
+                                              f"as float64; pass dtype='d' to allow rounding")
+            try:
+                block = array(dtype, validated)
+            except (TypeError, OverflowError):
+                raise CalculatorError(f"Block starting at index {count} does not fit dtype '{dtype}'"
+                                      + (" chosen from the first block; pass dtype='d'" if auto else ""))
+            payload, used = _encode(block, codec)
+            offset = f.tell()
+            f.write(payload)
+            total = sum(block)
+            packed_total = total.to_bytes(16, 'little', signed=True) if dtype == 'q' else total
+            index.append(entry.pack(offset, len(payload), CODECS[used], len(block),
+                                    min(block), max(block), packed_total))
+            count += len(block)
+        index_offset = f.tell()
+        f.write(b''.join(index))
+        f.write(TRAILER.pack(index_offset, len(index), MAGIC))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, dtype.encode(), CODECS[codec], 0, block_size, count))
+    return count
+
+
+class ColumnarFile:
+    """Reader for the columnar format; the index is loaded eagerly, values lazily"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise CalculatorError(f"{path} is not a columnar calculator file")
+            magic, version, dtype, codec, _, self.block_size, self.count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise CalculatorError(f"{path} is not a columnar calculator file")
+            if version != VERSION:
+                raise CalculatorError(f"Unsupported columnar format version {version}")
+            self.dtype = dtype.decode()
+            self.codec = CODEC_NAMES[codec]
+            self._file.seek(-TRAILER.size, 2)
+            index_offset, n_blocks, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+            if magic != MAGIC:
+                raise CalculatorError(f"{path} is truncated (missing trailer)")
+            entry = INDEX_ENTRY[self.dtype]
+            self._file.seek(index_offset)
+            raw_index = self._file.read(entry.size * n_blocks)
+            if len(raw_index) != entry.size * n_blocks:
+                raise CalculatorError(f"{path} is truncated (incomplete block index)")
+            self.blocks: List[BlockStats] = []
+            for offset, length, block_codec, count, minimum, maximum, total in entry.iter_unpack(raw_index):
+                if self.dtype == 'q':
+                    total = int.from_bytes(total, 'little', signed=True)
+                self.blocks.append(BlockStats(offset, length, CODEC_NAMES[block_codec],
+                                              count, minimum, maximum, total))
+        except (KeyError, OSError, struct.error, UnicodeDecodeError, ValueError) as e:
+            self._file.close()
+            raise CalculatorError(f"{path} is not a valid columnar calculator file: {e}")
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _require_values(self) -> None:
+        if self.count == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+
+    def calculate_average(self) -> float:
+        """Mean of the series, computed from the block index only"""
+        self._require_values()
+        return sum(block.total for block in self.blocks) / self.count
+
+    def find_maximum(self) -> Union[int, float]:
+        """Maximum of the series, computed from the block index only"""
+        self._require_values()
+        return max(block.maximum for block in self.blocks)
+
+    def find_minimum(self) -> Union[int, float]:
+        """Minimum of the series, computed from the block index only"""
+        self._require_values()
+        return min(block.minimum for block in self.blocks)
+
+    def read_block(self, i: int) -> array:
+        """Decode block i"""
+        block = self.blocks[i]
+        self._file.seek(block.offset)
+        try:
+            values = _decode(self._file.read(block.length), block.codec, self.dtype)
+        except (zlib.error, ValueError) as e:
+            raise CalculatorError(f"Block {i} of {self.path} is corrupt: {e}")
+        if len(values) != block.count:
+            raise CalculatorError(f"Block {i} of {self.path} is corrupt: expected {block.count} "
+                                  f"values, decoded {len(values)}")
+        return values
+
+    def iter_blocks(self) -> Iterator[array]:
+        """Decode blocks one at a time"""
+        for i in range(len(self.blocks)):
+            yield self.read_block(i)
+
+    def read_all(self) -> List[Union[int, float]]:
+        """Decode the whole series into a list"""
+        values = []
+        for block in self.iter_blocks():
+            values.extend(block)
+        return values
+
+    def process_blocks(self, handle_zeros: str = 'include') -> Iterator[List[Union[int, float]]]:
+        """Stream process_data() one decoded block at a time"""
+        for block in self.iter_blocks():
+            yield process_data(block.tolist(), handle_zeros)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
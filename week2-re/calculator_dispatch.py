@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Adaptive Backend Dispatch with Startup Calibration
+==================================================
+
+Picks an implementation of calculate_average, find_maximum, process_data and
+batch_calculate_average from the input size and type:
+
+    python    the validating functions in calculator_fixed
+    numpy     vectorized kernels (only when numpy is installed)
+    threads   batch_calculate_average on a thread pool
+    process   chunks farmed out to a process pool and merged
+
+The size at which each backend starts to beat plain Python depends on the
+machine, so the thresholds come from a one-time micro-calibration whose
+result is cached in a local JSON file keyed by a machine signature. Callers
+can force a backend per call and inspect which backend handled each call.
+
+Results match the python backend; float sums from the numpy and process
+backends may differ in the last bits because they add in a different order.
+Any CalculatorError raised by another backend is re-derived by re-running
+the python backend, so error messages are identical.
+
+Usage:
+    dispatcher = Dispatcher()                 # loads or runs calibration
+    dispatcher.calculate_average(data)
+    dispatcher.last_backend                   # e.g. 'numpy'
+    dispatcher.find_maximum(data, backend='python')
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import calculator_fixed
+from calculator_fixed import CalculatorError, np
+
+DISPATCHED_FUNCTIONS = ('calculate_average', 'find_maximum', 'process_data', 'batch_calculate_average')
+BACKENDS = {
+    'calculate_average': ('python', 'numpy', 'process'),
+    'find_maximum': ('python', 'numpy', 'process'),
+    'process_data': ('python', 'numpy', 'process'),
+    'batch_calculate_average': ('python', 'threads', 'process'),
+}
+# Used when calibration is disabled and nothing is cached
+DEFAULT_THRESHOLDS = {
+    'calculate_average': {'numpy': 10000, 'process': 10000000},
+    'find_maximum': {'numpy': 10000, 'process': 10000000},
+    'process_data': {'numpy': 10000, 'process': 10000000},
+    'batch_calculate_average': {'threads': None, 'process': 100000},
+}
+CALIBRATION_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'calculator_dispatch.json')
+
+
+def machine_signature() -> str:
+    """Identify the machine and interpreter a calibration is valid for"""
+    return '|'.join([platform.node(), platform.machine(), str(os.cpu_count()),
+                     sys.version.split()[0], 'numpy' if np is not None else 'no-numpy'])
+
+
+def _numpy_exact(data) -> bool:
+    """
+    Whether the numpy kernels reproduce the python backend's results for data
+
+    numpy would parse numeric strings itself (accepting some, like " 7 " or
+    "nan", that validate_numeric_input rejects), turn mixed int/float lists
+    into floats and keep ints beyond int64 as objects, so only numeric arrays
+    and lists of all-int or all-float values qualify.
+    """
+    if np is not None and isinstance(data, np.ndarray):
+        return data.dtype.kind in 'iuf'
+    types = set(map(type, data))
+    if types == {int}:
+        return -2**63 <= min(data) and max(data) < 2**63
+    return types == {float}
+
+
+# ------------------------------------------
+# Process-pool workers (top level so they pickle)
+# ------------------------------------------
+
+def _chunk_sum_count(chunk: list):
+    values = calculator_fixed.validate_numeric_list(chunk, 'numbers')
+    return sum(values), len(values)
+
+
+def _chunk_max(chunk: list):
+    return calculator_fixed.find_maximum(chunk)
+
+
+def _chunk_process(chunk: list, handle_zeros: str):
+    return calculator_fixed.process_data(chunk, handle_zeros)
+
+
+def _chunk_batch(lists: list):
+    return calculator_fixed.batch_calculate_average(lists)
+
+
+class Dispatcher:
+    """
+    Size- and type-aware dispatcher over several backends
+
+    Attributes:
+        thresholds: {function: {backend: minimum input size or None}}
+        calls: Counter of (function, backend) pairs handled so far
+    """
+
+    def __init__(self, thresholds: Optional[Dict[str, Dict[str, Optional[int]]]] = None,
+                 cache_path: Optional[str] = DEFAULT_CACHE_PATH, calibrate: bool = True,
+                 workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = None
+        if thresholds is not None:
+            self.thresholds = thresholds
+        else:
+            cached = self._load_cache()
+            if cached is not None:
+                self.thresholds = cached
+            elif calibrate:
+                self.thresholds = self.calibrate()
+            else:
+                self.thresholds = DEFAULT_THRESHOLDS
+
+    # ------------------------------------------
+    # Calibration and cache
+    # ------------------------------------------
+
+    def _load_cache(self) -> Optional[dict]:
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('signature') != machine_signature():
+            return None
+        return cached['thresholds']
+
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp = self.cache_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'signature': machine_signature(), 'thresholds': self.thresholds}, f, indent=2)
+        os.replace(tmp, self.cache_path)
+
+    def calibrate(self, sizes=CALIBRATION_SIZES, repeats: int = 3) -> Dict[str, Dict[str, Optional[int]]]:
+        """
+        Time every backend against python at each size and derive crossover points
+
+        A backend's threshold is the smallest calibrated size from which it
+        beats python at every larger calibrated size (None if it never does).
+        The result is stored on the dispatcher and written to the cache file.
+        """
+        def best_time(func, *args) -> float:
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                func(*args)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        self.thresholds = {}
+        for name in DISPATCHED_FUNCTIONS:
+            self.thresholds[name] = {}
+            for backend in BACKENDS[name][1:]:
+                if not self._available(backend):
+                    self.thresholds[name][backend] = None
+                    continue
+                wins = []
+                for size in sizes:
+                    data = self._calibration_input(name, size)
+                    python_time = best_time(self._run, name, 'python', data, {})
+                    backend_time = best_time(self._run, name, backend, data, {})
+                    wins.append(backend_time < python_time)
+                threshold = None
+                for size, won in zip(reversed(sizes), reversed(wins)):
+                    if not won:
+                        break
+                    threshold = size
+                self.thresholds[name][backend] = threshold
+        self._save_cache()
+        return self.thresholds
+
+    @staticmethod
+    def _calibration_input(name: str, size: int) -> list:
+        if name == 'batch_calculate_average':
+            return [list(range(i % 7, i % 7 + 8)) for i in range(max(1, size // 8))]
+        return [(i * 37) % 1001 - 500 for i in range(size)]
+
+    # ------------------------------------------
+    # Backend selection
+    # ------------------------------------------
+
+    @staticmethod
+    def _available(backend: str) -> bool:
+        return backend != 'numpy' or np is not None
+
+    @staticmethod
+    def _size(name: str, data) -> int:
+        if name == 'batch_calculate_average':
+            # Malformed items are left for the backend to reject with the reference error
+            return sum(len(item) for item in data if hasattr(item, '__len__'))
+        return len(data)
+
+    def choose(self, name: str, data) -> str:
+        """Return the backend that would handle name(data)"""
+        if name not in BACKENDS:
+            raise CalculatorError(f"Function '{name}' is not dispatched")
+        if np is not None and isinstance(data, np.ndarray) and 'numpy' in BACKENDS[name] \
+                and _numpy_exact(data):
+            return 'numpy'
+        if not isinstance(data, list):
+            return 'python'
+        size = self._size(name, data)
+        chosen, chosen_threshold = 'python', -1
+        for backend, threshold in self.thresholds.get(name, {}).items():
+            if threshold is not None and self._available(backend) and chosen_threshold < threshold <= size:
+                if backend == 'numpy' and not _numpy_exact(data):
+                    continue
+                chosen, chosen_threshold = backend, threshold
+        return chosen
+
+    @property
+    def last_backend(self) -> Optional[str]:
+        """Backend that handled the most recent call on this thread"""
+        return getattr(self._local, 'backend', None)
+
+    def _dispatch(self, name: str, data, backend: Optional[str], kwargs: dict):
+        if backend is None:
+            backend = self.choose(name, data)
+        elif backend not in BACKENDS[name] or not self._available(backend):
+            raise CalculatorError(f"Backend '{backend}' is not available for {name}")
+        self._local.backend = backend
+        with self._lock:
+            self.calls[(name, backend)] += 1
+        if backend == 'python':
+            return self._run(name, backend, data, kwargs)
+        try:
+            return self._run(name, backend, data, kwargs)
+        except (CalculatorError, ValueError, TypeError):
+            # Let the reference implementation produce the exact error
+            self._local.backend = 'python'
+            return self._run(name, 'python', data, kwargs)
+
+    # ------------------------------------------
+    # Backend implementations
+    # ------------------------------------------
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _chunks(self, data: list) -> List[list]:
+        size = max(1, -(-len(data) // self.workers))
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def _run(self, name: str, backend: str, data, kwargs: dict):
+        if backend == 'python':
+            if np is not None and isinstance(data, np.ndarray):
+                data = data.tolist()
+            return getattr(calculator_fixed, name)(data, **kwargs)
+        if backend == 'threads':
+            return calculator_fixed.batch_calculate_average(data, max_workers=self.workers)
+        if backend == 'numpy':
+            return self._run_numpy(name, data, kwargs)
+        return self._run_process(name, data, kwargs)
+
+    @staticmethod
+    def _run_numpy(name: str, data, kwargs: dict):
+        values = np.asarray(data)
+        if values.dtype.kind not in 'iuf':
+            # Validate like the python backend instead of letting numpy parse strings
+            values = np.asarray(calculator_fixed.validate_numeric_list(values.tolist(), 'numbers'))
+        if name == 'process_data':
+            if values.size == 0:
+                return []
+            handle_zeros = kwargs.get('handle_zeros', 'include')
+            if handle_zeros not in ('include', 'drop', 'double'):
+                raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+            if handle_zeros == 'drop':
+                values = values[(values > 0) | (values < 0)]
+            # Anything neither positive nor negative (zero, NaN) becomes 0, as in process_data()
+            return np.where(values > 0, values * 2, np.where(values < 0, -values, 0)).tolist()
+        if values.size == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+        if name == 'calculate_average':
+            if values.dtype.kind in 'iu' and \
+                    max(-int(values.min()), int(values.max())) * values.size >= 2**63:
+                return sum(values.tolist()) / values.size  # int64 sum could wrap around
+            return values.sum().item() / values.size
+        return values.max().item()
+
+    def _run_process(self, name: str, data: list, kwargs: dict):
+        if not data:
+            return getattr(calculator_fixed, name)(data, **kwargs)
+        pool = self._executor()
+        chunks = self._chunks(data)
+        if name == 'calculate_average':
+            partials = list(pool.map(_chunk_sum_count, chunks))
+            return sum(total for total, _ in partials) / sum(count for _, count in partials)
+        if name == 'find_maximum':
+            return max(pool.map(_chunk_max, chunks))
+        if name == 'process_data':
+            handle_zeros = kwargs.get('handle_zeros', 'include')
+            results = []
+            for part in pool.map(_chunk_process, chunks, [handle_zeros] * len(chunks)):
+                results.extend(part)
+            return results
+        results = []
+        for part in pool.map(_chunk_batch, chunks):
+            results.extend(part)
+        return results
+
+    # ------------------------------------------
+    # Public API
+    # ------------------------------------------
+
+    def calculate_average(self, numbers, backend: Optional[str] = None) -> float:
+        return self._dispatch('calculate_average', numbers, backend, {})
+
+    def find_maximum(self, numbers, backend: Optional[str] = None):
+        return self._dispatch('find_maximum', numbers, backend, {})
+
+    def process_data(self, data_list, handle_zeros: str = 'include', backend: Optional[str] = None) -> list:
+        return self._dispatch('process_data', data_list, backend, {'handle_zeros': handle_zeros})
+
+    def batch_calculate_average(self, list_of_lists, backend: Optional[str] = None) -> List[float]:
+        return self._dispatch('batch_calculate_average', list_of_lists, backend, {})
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self) -> "Dispatcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
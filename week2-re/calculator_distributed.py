@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Scatter-Gather Execution over TCP Workers
+=========================================
+
+Shards calculate_average, find_maximum, describe, process_data and
+batch_calculate_average across worker processes reachable over TCP. The
+coordinator splits the input into shards, ships each shard to a worker,
+collects a mergeable partial result and combines them:
+
+    calculate_average        (count, total) pairs, summed
+    find_maximum             per-shard maxima, max of maxima
+    describe                 Welford moments, merged pairwise
+    process_data             per-shard outputs, concatenated in order
+    batch_calculate_average  per-shard averages, concatenated in order
+
+A shard whose worker cannot be reached, drops the connection or times out is
+retried on the next worker. If a worker reports a CalculatorError, the call
+is re-run locally so the error message is exactly the one the local function
+raises. Any other exception on a worker is sent back as a fault frame and
+raised once as a CalculatorError naming the worker and the original error;
+it is not retried, since another worker would fail the same way. Input the
+wire format cannot carry (non-list batch items, values JSON cannot encode)
+is never sent; the call runs locally instead. As with the dispatcher, float
+sums may differ from the local result in the last bits because shards are
+added in a different order.
+
+Wire format (big-endian), one frame per message::
+
+    frame    b'CD' | version u8 | opcode u8 | request_id u32 | length u32 | body
+    task     meta_length u16 | meta (JSON: function, params) | data
+    data     b'q' int64 values | b'd' float64 values | b'j' JSON |
+             b'L' count u32, then per list: length u32 + data
+
+Flat lists of plain ints or plain floats travel as packed arrays; anything
+else (strings, mixed types) as JSON and is validated by the worker.
+
+Usage:
+    workers = start_local_workers(4)            # or: python calculator_distributed.py worker --port 9000
+    with Coordinator([w.address for w in workers]) as coordinator:
+        coordinator.calculate_average(data)
+    stop_local_workers(workers)
+"""
+
+import argparse
+import json
+import multiprocessing
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import calculator_fixed
+from calculator_fixed import CalculatorError, Summary, validate_numeric_list
+
+MAGIC = b'CD'
+VERSION = 1
+FRAME = struct.Struct('!2sBBII')
+META_LENGTH = struct.Struct('!H')
+COUNT = struct.Struct('!I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+OP_TASK = 1
+OP_RESULT = 2
+OP_ERROR = 3
+OP_FAULT = 4
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+Address = Tuple[str, int]
+
+
+class _ShardFailed(Exception):
+    """A shard could not be completed by a worker (connection or protocol failure)"""
+
+
+class _Rejected(Exception):
+    """A worker raised CalculatorError for its shard"""
+
+
+# ==========================================
+# FRAMING AND ENCODING
+# ==========================================
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(min(size - len(buffer), 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed mid-frame")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, opcode: int, request_id: int, body: bytes = b'') -> None:
+    if len(body) > MAX_FRAME_SIZE:
+        raise CalculatorError(f"Frame of {len(body)} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+    sock.sendall(FRAME.pack(MAGIC, VERSION, opcode, request_id, len(body)) + body)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[int, int, bytes]:
+    """Read one frame, returning (opcode, request_id, body)"""
+    magic, version, opcode, request_id, length = FRAME.unpack(_recv_exact(sock, FRAME.size))
+    if magic != MAGIC or version != VERSION:
+        raise ConnectionError("not a calculator frame")
+    if length > MAX_FRAME_SIZE:
+        raise ConnectionError(f"frame of {length} bytes exceeds the limit")
+    return opcode, request_id, _recv_exact(sock, length)
+
+
+def encode_values(values: list) -> bytes:
+    """
+    Pack a flat list as int64, float64 or (for anything else) JSON
+
+    Raises:
+        CalculatorError: If a value cannot be encoded as JSON
+    """
+    if all(type(v) is int for v in values) and \
+            (not values or _INT64_MIN <= min(values) and max(values) <= _INT64_MAX):
+        return b'q' + _to_network(array('q', values))
+    if all(type(v) is float for v in values):
+        return b'd' + _to_network(array('d', values))
+    try:
+        return b'j' + json.dumps(values, separators=(',', ':')).encode()
+    except (TypeError, ValueError) as e:
+        raise CalculatorError(f"Values cannot be sent to a worker: {e}")
+
+
+def _to_network(values: array) -> bytes:
+    if sys.byteorder == 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_network(typecode: str, raw: bytes) -> list:
+    values = array(typecode)
+    values.frombytes(raw)
+    if sys.byteorder == 'little':
+        values.byteswap()
+    return values.tolist()
+
+
+def decode_values(data: bytes) -> list:
+    kind, raw = data[:1], data[1:]
+    if kind in (b'q', b'd'):
+        return _from_network(kind.decode(), raw)
+    if kind == b'j':
+        return json.loads(raw)
+    raise ConnectionError(f"unknown value encoding {kind!r}")
+
+
+def encode_lists(lists: list) -> bytes:
+    """
+    Pack a list of flat lists, each encoded with encode_values()
+
+    Raises:
+        CalculatorError: If an item is not a list (a tuple would arrive as a
+            list and be accepted by the worker) or cannot be encoded
+    """
+    parts = [b'L', COUNT.pack(len(lists))]
+    for i, item in enumerate(lists):
+        if not isinstance(item, list):
+            raise CalculatorError(f"Item {i} is a {type(item).__name__}, not a list")
+        encoded = encode_values(item)
+        parts.append(COUNT.pack(len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+
+def decode_lists(data: bytes) -> list:
+    if data[:1] != b'L':
+        raise ConnectionError("expected a list-of-lists payload")
+    (count,), offset = COUNT.unpack_from(data, 1), 1 + COUNT.size
+    lists = []
+    for _ in range(count):
+        (length,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        lists.append(decode_values(data[offset:offset + length]))
+        offset += length
+    return lists
+
+
+def encode_task(function: str, params: dict, payload: bytes) -> bytes:
+    meta = json.dumps({'fn': function, 'params': params}, separators=(',', ':')).encode()
+    return META_LENGTH.pack(len(meta)) + meta + payload
+
+
+def decode_task(body: bytes) -> Tuple[str, dict, bytes]:
+    (length,) = META_LENGTH.unpack_from(body)
+    meta = json.loads(body[META_LENGTH.size:META_LENGTH.size + length])
+    return meta['fn'], meta['params'], body[META_LENGTH.size + length:]
+
+
+# ==========================================
+# WORKER
+# ==========================================
+
+def run_task(function: str, params: dict, data: bytes) -> list:
+    """Compute one shard's partial result with the local calculator functions"""
+    if function == 'batch_calculate_average':
+        return calculator_fixed.batch_calculate_average(decode_lists(data))
+    values = decode_values(data)
+    if function == 'calculate_average':
+        validated = validate_numeric_list(values, 'numbers')
+        return [len(validated), sum(validated)]
+    if function == 'find_maximum':
+        return [calculator_fixed.find_maximum(values)]
+    if function == 'describe':
+        return list(calculator_fixed.chunk_moments(validate_numeric_list(values, 'numbers')))
+    if function == 'process_data':
+        return calculator_fixed.process_data(values, params['handle_zeros'])
+    raise CalculatorError(f"Function '{function}' cannot run on a worker")
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    """Serve frames on one coordinator connection until it closes"""
+
+    def handle(self) -> None:
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            try:
+                opcode, request_id, body = recv_frame(sock)
+            except (ConnectionError, OSError, struct.error):
+                return
+            if opcode != OP_TASK:
+                return
+            try:
+                function, params, data = decode_task(body)
+                result = encode_values(run_task(function, params, data))
+            except CalculatorError as e:
+                send_frame(sock, OP_ERROR, request_id, str(e).encode())
+                continue
+            except Exception as e:
+                send_frame(sock, OP_FAULT, request_id, f"{type(e).__name__}: {e}".encode())
+                continue
+            send_frame(sock, OP_RESULT, request_id, result)
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), _WorkerHandler)
+
+    @property
+    def address(self) -> Address:
+        return self.server_address[:2]
+
+
+class LocalWorker(NamedTuple):
+    """A worker process on this machine standing in for a remote node"""
+    process: multiprocessing.Process
+    address: Address
+
+
+def _serve_and_report(host: str, conn) -> None:
+    server = WorkerServer(host, 0)
+    conn.send(server.address)
+    conn.close()
+    server.serve_forever()
+
+
+def start_local_workers(n: int, host: str = '127.0.0.1') -> List[LocalWorker]:
+    """Start n worker processes on ephemeral ports and wait until they listen"""
+    if n < 1:
+        raise CalculatorError("n must be a positive integer")
+    workers = []
+    for _ in range(n):
+        parent, child = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_serve_and_report, args=(host, child), daemon=True)
+        process.start()
+        child.close()
+        workers.append(LocalWorker(process, tuple(parent.recv())))
+        parent.close()
+    return workers
+
+
+def stop_local_workers(workers: List[LocalWorker]) -> None:
+    for worker in workers:
+        worker.process.terminate()
+    for worker in workers:
+        worker.process.join()
+
+
+# ==========================================
+# COORDINATOR
+# ==========================================
+
+class _Connection:
+    """One lazily opened, lock-protected connection to a worker"""
+
+    def __init__(self, address: Address, timeout: float):
+        self.address = address
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sock: Optional[socket.socket] = None
+        self.next_id = 0
+
+    def request(self, body: bytes) -> Tuple[int, bytes]:
+        with self.lock:
+            try:
+                if self.sock is None:
+                    self.sock = socket.create_connection(self.address, timeout=self.timeout)
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+                send_frame(self.sock, OP_TASK, self.next_id, body)
+                opcode, request_id, reply = recv_frame(self.sock)
+                if request_id != self.next_id or opcode not in (OP_RESULT, OP_ERROR, OP_FAULT):
+                    raise ConnectionError("unexpected reply")
+                return opcode, reply
+            except (OSError, struct.error) as e:
+                self.close_locked()
+                raise _ShardFailed(f"{self.address[0]}:{self.address[1]}: {e}")
+
+    def close_locked(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def close(self) -> None:
+        with self.lock:
+            self.close_locked()
+
+
+class Coordinator:
+    """
+    Scatter-gather client for a fixed set of workers
+
+    Attributes:
+        shards_sent: Shard requests sent, including retries
+        retried: Shards that had to be re-sent to another worker
+    """
+
+    def __init__(self, addresses: List[Address], shard_size: Optional[int] = None,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES):
+        if not addresses:
+            raise CalculatorError("Coordinator needs at least one worker address")
+        if shard_size is not None and shard_size < 1:
+            raise CalculatorError("shard_size must be a positive integer")
+        if retries < 0:
+            raise CalculatorError("retries must be non-negative")
+        self.shard_size = shard_size
+        self.retries = retries
+        self.shards_sent = 0
+        self.retried = 0
+        self._connections = [_Connection(tuple(address), timeout) for address in addresses]
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=len(addresses))
+
+    def _shards(self, items: list) -> List[list]:
+        size = self.shard_size or max(1, -(-len(items) // (2 * len(self._connections))))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def _send(self, index: int, body: bytes) -> list:
+        """Run one shard, trying the next worker after a failure"""
+        attempts = self.retries + 1
+        failures = []
+        for attempt in range(attempts):
+            connection = self._connections[(index + attempt) % len(self._connections)]
+            with self._lock:
+                self.shards_sent += 1
+                if attempt:
+                    self.retried += 1
+            try:
+                opcode, reply = connection.request(body)
+            except _ShardFailed as e:
+                failures.append(str(e))
+                continue
+            if opcode == OP_ERROR:
+                raise _Rejected(reply.decode())
+            if opcode == OP_FAULT:
+                host, port = connection.address
+                raise CalculatorError(f"Shard {index} failed on worker {host}:{port}: {reply.decode()}")
+            return decode_values(reply)
+        raise CalculatorError(f"Shard {index} failed after {attempts} attempts: {'; '.join(failures)}")
+
+    def _scatter(self, function: str, shards: List[bytes], params: Optional[dict] = None) -> List[list]:
+        bodies = [encode_task(function, params or {}, payload) for payload in shards]
+        return list(self._pool.map(self._send, range(len(bodies)), bodies))
+
+    def _run(self, function: str, items: list, params: Optional[dict], merge, local):
+        """Scatter, gather and merge; re-run locally if any worker rejects its shard"""
+        if not isinstance(items, list) or not items:
+            return local()
+        encoder = encode_lists if function == 'batch_calculate_average' else encode_values
+        try:
+            payloads = [encoder(shard) for shard in self._shards(items)]
+        except CalculatorError:
+            return local()  # input the wire format cannot carry: exact local result or error
+        try:
+            partials = self._scatter(function, payloads, params)
+        except _Rejected:
+            return local()  # produces the exact local error message
+        return merge(partials)
+
+    # ------------------------------------------
+    # Public API
+    # ------------------------------------------
+
+    def calculate_average(self, numbers: List[Union[int, float, str]]) -> float:
+        def merge(partials):
+            return sum(total for _, total in partials) / sum(count for count, _ in partials)
+        return self._run('calculate_average', numbers, None, merge,
+                         lambda: calculator_fixed.calculate_average(numbers))
+
+    def find_maximum(self, numbers: List[Union[int, float, str]]) -> Union[int, float]:
+        return self._run('find_maximum', numbers, None, lambda partials: max(p[0] for p in partials),
+                         lambda: calculator_fixed.find_maximum(numbers))
+
+    def describe(self, numbers: List[Union[int, float, str]], ddof: int = 0) -> Summary:
+        if ddof < 0:
+            raise CalculatorError("ddof must be non-negative")
+
+        def merge(partials):
+            moments = calculator_fixed.EMPTY_MOMENTS
+            for partial in partials:
+                moments = calculator_fixed.merge_moments(moments, partial)
+            return calculator_fixed.summary_from_moments(moments, ddof)
+        return self._run('describe', numbers, None, merge,
+                         lambda: calculator_fixed.describe(numbers, ddof))
+
+    def process_data(self, data_list: List[Union[int, float, str]],
+                     handle_zeros: str = 'include') -> List[Union[int, float]]:
+        if handle_zeros not in ['include', 'drop', 'double']:
+            return calculator_fixed.process_data(data_list, handle_zeros)
+
+        def merge(partials):
+            results = []
+            for part in partials:
+                results.extend(part)
+            return results
+        return self._run('process_data', data_list, {'handle_zeros': handle_zeros}, merge,
+                         lambda: calculator_fixed.process_data(data_list, handle_zeros))
+
+    def batch_calculate_average(self, list_of_lists: List[List[Union[int, float]]]) -> List[float]:
+        def merge(partials):
+            results = []
+            for part in partials:
+                results.extend(part)
+            return results
+        return self._run('batch_calculate_average', list_of_lists, None, merge,
+                         lambda: calculator_fixed.batch_calculate_average(list_of_lists))
+
+    def close(self) -> None:
+        self._pool.shutdown()
+        for connection in self._connections:
+            connection.close()
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calculator scatter-gather worker")
+    sub = parser.add_subparsers(dest="command", required=True)
+    worker = sub.add_parser("worker", help="serve shards on a TCP port")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args(argv)
+
+    server = WorkerServer(args.host, args.port)
+    print(f"Worker listening on {server.address[0]}:{server.address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,8 +11,22 @@ Date: 2025-07-02
 Version: 2.0 (Fixed)
 """
 
+import bisect
+import math
+import operator
+import os
+import threading
 import time
-from typing import List, Union, Optional
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, compress, islice
+from typing import Hashable, Iterable, List, NamedTuple, Tuple, Union, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; array.array covers the vectorized path
+    np = None
 
 
 class CalculatorError(Exception):
@@ -190,7 +204,15 @@ def calculate_average(numbers: List[Union[int, float, str]]) -> float:
         
     Time Complexity: O(n)
     Space Complexity: O(1)
+
+    SparseVector input takes O(nnz). Integer range / ArithmeticSequence
+    input, and process_data() views of them, take O(1).
     """
+    if isinstance(numbers, SparseVector):
+        return numbers.average()
+    if isinstance(numbers, (range, ArithmeticSequence, ProcessedSequence)):
+        return _as_sequence(numbers).average()
+    
     validated_numbers = validate_numeric_list(numbers, 'numbers')
     
     # Use built-in sum() for better performance
@@ -213,21 +235,213 @@ def find_maximum(numbers: List[Union[int, float, str]]) -> Union[int, float]:
         
     Time Complexity: O(n)
     Space Complexity: O(1)
+
+    SparseVector input takes O(nnz). range / ArithmeticSequence input, and
+    process_data() views of them, take O(1).
     """
+    if isinstance(numbers, SparseVector):
+        return numbers.maximum()
+    if isinstance(numbers, (range, ArithmeticSequence, ProcessedSequence)):
+        return _as_sequence(numbers).maximum()
+    
     validated_numbers = validate_numeric_list(numbers, 'numbers')
     
     # Use built-in max() for better performance
     return max(validated_numbers)
 
 
+# ==========================================
+# SUMMARY STATISTICS (SINGLE PASS)
+# ==========================================
+
+DESCRIBE_CHUNK_SIZE = 4096
+
+
+class Summary(NamedTuple):
+    """Immutable result of describe()"""
+    count: int
+    total: Union[int, float]
+    mean: float
+    minimum: Union[int, float]
+    maximum: Union[int, float]
+    variance: float
+    std_dev: float
+
+
+class Moments(NamedTuple):
+    """
+    Mergeable partial statistics: count, total, mean, M2, min and max
+
+    M2 is the sum of squared deviations from the mean. Build one per chunk
+    with chunk_moments(), combine any number with merge_moments(),
+    and turn the result into a Summary with summary_from_moments().
+    Plain 6-tuples in the same order are accepted wherever a Moments is, so
+    partial results can travel through pickle or JSON.
+    """
+    count: int
+    total: Union[int, float]
+    mean: float
+    m2: float
+    minimum: Optional[Union[int, float]]
+    maximum: Optional[Union[int, float]]
+
+
+EMPTY_MOMENTS = Moments(0, 0, 0.0, 0.0, None, None)
+
+
+def chunk_moments(values: List[Union[int, float]]) -> Moments:
+    """
+    Compute the Moments of one validated, non-empty chunk
+
+    The chunk is small enough to stay in cache, so the built-in reductions
+    run over it at C speed and M2 is taken around the chunk's own mean.
+
+    Args:
+        values: Numbers already checked by validate_numeric_list()
+
+    Returns:
+        Moments of the chunk
+    """
+    count = len(values)
+    total = sum(values)
+    mean = total / count
+    m2 = math.fsum((x - mean) * (x - mean) for x in values)
+    return Moments(count, total, mean, m2, min(values), max(values))
+
+
+def merge_moments(a, b) -> Moments:
+    """
+    Merge two Moments
+
+    Uses the pairwise form of Welford's update (Chan et al.) so partial
+    results from chunks, shards or workers combine without revisiting data.
+    Either side may be EMPTY_MOMENTS.
+    """
+    n_a, total_a, mean_a, m2_a, min_a, max_a = a
+    n_b, total_b, mean_b, m2_b, min_b, max_b = b
+    if n_a == 0:
+        return Moments(*b)
+    if n_b == 0:
+        return Moments(*a)
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    return Moments(n, total_a + total_b, mean, m2,
+                   min_a if min_a <= min_b else min_b,
+                   max_a if max_a >= max_b else max_b)
+
+
+def summary_from_moments(moments, ddof: int = 0) -> Summary:
+    """
+    Build a Summary from merged Moments
+
+    Raises:
+        CalculatorError: If count does not exceed ddof
+    """
+    count, total, _, m2, minimum, maximum = moments
+    if count - ddof <= 0:
+        raise CalculatorError(f"describe() needs more than {ddof} values for ddof={ddof}")
+    variance = m2 / (count - ddof)
+    # total / count equals calculate_average() for integer data; float totals are
+    # added chunk by chunk, so they can differ from one sum() call in the last bits
+    return Summary(count, total, total / count, minimum, maximum,
+                   variance, math.sqrt(variance))
+
+
+def _describe_array(numbers, ddof: int) -> Summary:
+    """Vectorized path for numpy arrays and array.array buffers"""
+    if len(numbers) == 0:
+        raise CalculatorError("Parameter 'numbers' cannot be empty")
+    if np is not None and isinstance(numbers, np.ndarray):
+        if numbers.dtype.kind not in 'iuf':
+            raise CalculatorError(f"Parameter 'numbers' must be numeric, got dtype {numbers.dtype}")
+        values = numbers.astype(float, copy=False).ravel()
+        total = numbers.sum().item()
+        mean = total / values.size
+        centered = values - mean
+        moments = Moments(values.size, total, mean, float(centered @ centered),
+                          numbers.min().item(), numbers.max().item())
+    else:
+        # array.array is already typed, so no per-element validation is needed
+        moments = chunk_moments(numbers)
+    return summary_from_moments(moments, ddof)
+
+
+def describe(numbers: Iterable[Union[int, float, str]], ddof: int = 0,
+             chunk_size: int = DESCRIBE_CHUNK_SIZE) -> Summary:
+    """
+    Compute count, sum, mean, min, max, variance and standard deviation together
+
+    Validation and aggregation are fused: each chunk is validated once and
+    reduced while it is still hot, and chunk results are merged with Welford's
+    pairwise update. Lists, tuples, generators and other iterables are read in
+    chunks of ``chunk_size``; numpy arrays and ``array.array`` buffers take a
+    vectorized path without per-element validation.
+
+    Args:
+        numbers: Iterable of numeric values (strings are converted)
+        ddof: Delta degrees of freedom (0 = population, 1 = sample variance)
+        chunk_size: Number of items validated and reduced per chunk
+
+    Returns:
+        Summary named tuple
+
+    Raises:
+        CalculatorError: If input is empty, not iterable or contains non-numeric values
+
+    Time Complexity: O(n)
+    Space Complexity: O(chunk_size)
+    """
+    if ddof < 0:
+        raise CalculatorError("ddof must be non-negative")
+    if chunk_size < 1:
+        raise CalculatorError("chunk_size must be a positive integer")
+    if isinstance(numbers, array) or (np is not None and isinstance(numbers, np.ndarray)):
+        return _describe_array(numbers, ddof)
+    if isinstance(numbers, (str, bytes)):
+        raise CalculatorError(f"Parameter 'numbers' must be an iterable of numbers, got {type(numbers).__name__}")
+    try:
+        iterator = iter(numbers)
+    except TypeError:
+        raise CalculatorError(f"Parameter 'numbers' must be an iterable of numbers, got {type(numbers).__name__}")
+
+    moments = EMPTY_MOMENTS
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        validated = []
+        for i, num in enumerate(chunk, offset):
+            try:
+                validated.append(validate_numeric_input(num, f"numbers[{i}]"))
+            except CalculatorError as e:
+                raise CalculatorError(f"Invalid item at index {i} in numbers: {str(e)}")
+        moments = merge_moments(moments, chunk_moments(validated))
+        offset += len(chunk)
+
+    if offset == 0:
+        raise CalculatorError("Parameter 'numbers' cannot be empty")
+    return summary_from_moments(moments, ddof)
+
+
 # ==========================================
 # ADVANCED MATHEMATICAL FUNCTIONS (FIXED)
 # ==========================================
 
+# From here up the balanced product tree beats multiplying 1..n in order
+FACTORIAL_PRODUCT_TREE_MIN_N = 400
+
+
 def factorial(n: Union[int, str], iterative: bool = True) -> int:
     """
     Calculate factorial with input validation and iterative implementation
     
+    From FACTORIAL_PRODUCT_TREE_MIN_N up, the iterative path multiplies by
+    the same balanced product tree parallel_factorial() uses. n stays capped
+    at 1000; use parallel_factorial() for larger n.
+    
     Args:
         n: Non-negative integer
         iterative: Use iterative implementation (default) vs recursive
@@ -256,6 +470,8 @@ def factorial(n: Union[int, str], iterative: bool = True) -> int:
         raise CalculatorError("Factorial input too large (max 1000)")
     
     if iterative:
+        if n_int >= FACTORIAL_PRODUCT_TREE_MIN_N:
+            return _range_product(range(1, n_int + 1))
         # Iterative implementation - faster and no stack overflow risk
         result = 1
         for i in range(1, n_int + 1):
@@ -269,6 +485,318 @@ def factorial(n: Union[int, str], iterative: bool = True) -> int:
             return n_int * factorial(n_int - 1, iterative=False)
 
 
+PARALLEL_FACTORIAL_MIN_N = 20000
+# Above this n, building n! from its prime factorization beats multiplying 1..n
+PRIME_FACTORIAL_MIN_N = 5000
+
+
+def _range_product(numbers: range) -> int:
+    """
+    Product of a range by balanced binary splitting
+
+    Multiplying halves of similar size keeps both operands of every big-int
+    multiplication balanced, which is where Karatsuba multiplication pays off.
+    """
+    length = len(numbers)
+    if length <= 16:
+        result = 1
+        for value in numbers:
+            result *= value
+        return result
+    mid = length // 2
+    return _range_product(numbers[:mid]) * _range_product(numbers[mid:])
+
+
+def _strided_product(start: int, stop: int, step: int) -> int:
+    """Process-pool worker: product of range(start, stop, step)"""
+    return _range_product(range(start, stop, step))
+
+
+def _product_tree(values: List[int]) -> int:
+    """Multiply values pairwise, level by level"""
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0] if values else 1
+
+
+def parallel_factorial(n: Union[int, str], workers: Optional[int] = None,
+                       min_n: int = PARALLEL_FACTORIAL_MIN_N) -> int:
+    """
+    Calculate n! for very large n with a process pool
+
+    The factors 1..n are dealt round-robin into ``workers`` strided subranges
+    (worker k takes k+1, k+1+workers, ...), so every partial product has
+    almost the same bit length. Each worker multiplies its subrange with a
+    balanced product tree and the partial products are combined in a tree
+    of multiplications. Below ``min_n`` the pool start-up cost dominates and
+    n! is computed in-process instead, with prime_factorial() from
+    PRIME_FACTORIAL_MIN_N up and the product tree below it.
+
+    Unlike factorial(), there is no upper limit on n.
+
+    Args:
+        n: Non-negative integer
+        workers: Number of worker processes (default: os.cpu_count())
+        min_n: Smallest n that uses the process pool
+
+    Returns:
+        Factorial of n (n!)
+
+    Raises:
+        CalculatorError: If n is negative or not an integer, or workers < 1
+    """
+    n_val = validate_numeric_input(n, 'n')
+    if not isinstance(n_val, int) and not n_val.is_integer():
+        raise CalculatorError("Factorial is only defined for integers")
+    n_int = int(n_val)
+    if n_int < 0:
+        raise CalculatorError("Factorial is not defined for negative numbers")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise CalculatorError("workers must be a positive integer")
+
+    if workers == 1 or n_int < min_n:
+        if n_int >= PRIME_FACTORIAL_MIN_N:
+            return prime_factorial(n_int)
+        return _range_product(range(1, n_int + 1))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(_strided_product,
+                                 range(1, workers + 1), [n_int + 1] * workers, [workers] * workers))
+    return _product_tree(partials)
+
+
+# ==========================================
+# PRIME SIEVE
+# ==========================================
+
+# Odd numbers covered per segment: a 64 KiB byte-per-odd workspace fits in L2
+SIEVE_SEGMENT_SIZE = 1 << 16
+_BITS_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+_ASCII_TO_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def _validate_limit(limit, param_name: str = 'limit') -> int:
+    value = validate_numeric_input(limit, param_name)
+    if not isinstance(value, int) and not value.is_integer():
+        raise CalculatorError(f"Parameter '{param_name}' must be an integer")
+    return int(value)
+
+
+def _small_primes(limit: int) -> List[int]:
+    """Odd primes up to limit with a plain odd-only sieve (used for the base primes)"""
+    if limit < 3:
+        return []
+    flags = bytearray([1]) * ((limit - 1) // 2)  # flags[i] <-> 2*i + 3
+    for i in range(math.isqrt(limit) // 2):
+        if flags[i]:
+            p = 2 * i + 3
+            start = (p * p - 3) // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    return list(compress(range(3, limit + 1, 2), flags))
+
+
+def _sieve_segments(limit: int, segment_size: int = SIEVE_SEGMENT_SIZE):
+    """
+    Yield (first, flags) for consecutive segments of odd numbers up to limit
+
+    flags[i] is 1 when first + 2*i is prime. Each segment is a bytearray of
+    segment_size flags crossed off with C-level slice assignment, so memory
+    stays at O(segment_size + sqrt(limit)) however large limit is.
+    """
+    base = _small_primes(math.isqrt(limit))
+    zeros = memoryview(bytes(segment_size))
+    for low in range(3, limit + 1, 2 * segment_size):
+        high = min(low + 2 * segment_size - 2, limit if limit % 2 else limit - 1)
+        size = (high - low) // 2 + 1
+        flags = bytearray([1]) * size
+        for p in base:
+            square = p * p
+            if square > high:
+                break
+            first = max(square, (low + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            start = (first - low) // 2
+            if start < size:
+                flags[start::p] = zeros[:(size - 1 - start) // p + 1]
+        yield low, flags
+
+
+def iter_primes(limit: Union[int, str], start: Union[int, str] = 2) -> Iterable[int]:
+    """
+    Generate the primes p with start <= p <= limit, in increasing order
+
+    Args:
+        limit: Largest number to consider
+        start: Smallest number to consider
+
+    Raises:
+        CalculatorError: If limit or start is not an integer (raised by the
+            call itself, before iteration starts)
+
+    Time Complexity: O(limit log log limit)
+    Space Complexity: O(SIEVE_SEGMENT_SIZE + sqrt(limit))
+    """
+    return _iter_primes(_validate_limit(limit), _validate_limit(start, 'start'))
+
+
+def _iter_primes(limit: int, start: int) -> Iterable[int]:
+    if limit < 2 or start > limit:
+        return
+    if start <= 2:
+        yield 2
+    for low, flags in _sieve_segments(limit):
+        high = low + 2 * len(flags)
+        if high <= start:
+            continue
+        numbers = range(low, high, 2)
+        if low < start:
+            offset = (start - low + 1) // 2
+            numbers, flags = numbers[offset:], flags[offset:]
+        yield from compress(numbers, flags)
+
+
+def count_primes(limit: Union[int, str]) -> int:
+    """
+    Number of primes <= limit, counted segment by segment without storing them
+
+    Time Complexity: O(limit log log limit)
+    Space Complexity: O(SIEVE_SEGMENT_SIZE + sqrt(limit))
+    """
+    limit = _validate_limit(limit)
+    if limit < 2:
+        return 0
+    return 1 + sum(flags.count(1) for _, flags in _sieve_segments(limit))
+
+
+class PrimeSieve:
+    """
+    Bit-packed, odd-only primality table up to a fixed limit
+
+    Bit i of ``bits`` (a bytearray, little-endian within each byte) stands
+    for 2*i + 3, so the table needs limit / 16 bytes: about 62.5 MB for 10**9,
+    against 500 MB for a bytearray of odd-only flags and 8 GB for a list of
+    bools. It is filled one
+    segment at a time; each segment is packed to bits with C-level
+    translate/int/to_bytes conversions.
+    """
+
+    __slots__ = ('limit', 'bits')
+
+    def __init__(self, limit: Union[int, str]):
+        self.limit = _validate_limit(limit)
+        if self.limit < 0:
+            raise CalculatorError("Sieve limit must be non-negative")
+        packed = bytearray()
+        pending = b''
+        for _, flags in _sieve_segments(max(self.limit, 2)):
+            # Segments hold a multiple of 8 flags except the last, so only it needs padding
+            ascii_bits = flags.translate(_BITS_TO_ASCII)
+            pending += ascii_bits
+            usable = len(pending) // 8 * 8
+            if usable:
+                chunk = pending[:usable]
+                packed += int(chunk[::-1], 2).to_bytes(usable // 8, 'little')
+                pending = pending[usable:]
+        if pending:
+            padded = pending + b'0' * (8 - len(pending))
+            packed += int(padded[::-1], 2).to_bytes(1, 'little')
+        self.bits = packed
+
+    def is_prime(self, n: Union[int, str]) -> bool:
+        n = _validate_limit(n, 'n')
+        if n > self.limit:
+            raise CalculatorError(f"{n} is beyond the sieve limit {self.limit}")
+        if n < 2:
+            return False
+        if n % 2 == 0:
+            return n == 2
+        i = (n - 3) // 2
+        return bool(self.bits[i >> 3] >> (i & 7) & 1)
+
+    __contains__ = is_prime
+
+    def count(self) -> int:
+        """Number of primes <= limit"""
+        if self.limit < 2:
+            return 0
+        return 1 + int.from_bytes(self.bits, 'little').bit_count()
+
+    def __iter__(self):
+        if self.limit >= 2:
+            yield 2
+        step = SIEVE_SEGMENT_SIZE // 8
+        for offset in range(0, len(self.bits), step):
+            chunk = self.bits[offset:offset + step]
+            ascii_bits = format(int.from_bytes(chunk, 'little'), f'0{8 * len(chunk)}b')[::-1]
+            first = 3 + 16 * offset
+            yield from compress(range(first, min(first + 16 * len(chunk), self.limit + 1), 2),
+                                ascii_bits.encode().translate(_ASCII_TO_BITS))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+def factorial_prime_exponent(n: Union[int, str], p: int) -> int:
+    """
+    Exponent of the prime p in n! (Legendre's formula: sum of n // p**k)
+
+    Raises:
+        CalculatorError: If n is negative or not an integer, or p < 2
+    """
+    n = _validate_limit(n, 'n')
+    if n < 0:
+        raise CalculatorError("Factorial is not defined for negative numbers")
+    if p < 2:
+        raise CalculatorError("p must be a prime")
+    exponent = 0
+    while n:
+        n //= p
+        exponent += n
+    return exponent
+
+
+def factorial_prime_exponents(n: Union[int, str]) -> List[Tuple[int, int]]:
+    """Prime factorization of n! as (prime, exponent) pairs in increasing prime order"""
+    n = _validate_limit(n, 'n')
+    if n < 0:
+        raise CalculatorError("Factorial is not defined for negative numbers")
+    return [(p, factorial_prime_exponent(n, p)) for p in iter_primes(n)]
+
+
+def prime_factorial(n: Union[int, str]) -> int:
+    """
+    Calculate n! from its prime factorization
+
+    Primes are grouped by the bits of their exponents, so
+    n! = prod_k (product of primes whose exponent has bit k) ** (2 ** k),
+    evaluated with repeated squaring (Horner's rule over k). Each group is
+    multiplied with a product tree. Big-int squaring is cheaper than general
+    multiplication, so this beats multiplying 1..n for large n. Unlike
+    factorial(), there is no upper limit on n.
+
+    Raises:
+        CalculatorError: If n is negative or not an integer
+    """
+    exponents = factorial_prime_exponents(n)
+    if not exponents:
+        return 1
+    groups = [[] for _ in range(exponents[0][1].bit_length())]
+    for p, exponent in exponents:
+        for k in range(exponent.bit_length()):
+            if exponent >> k & 1:
+                groups[k].append(p)
+    result = 1
+    for group in reversed(groups):
+        result = result * result * _product_tree(group)
+    return result
+
+
 # ==========================================
 # DATA PROCESSING FUNCTIONS (FIXED)
 # ==========================================
@@ -289,12 +817,25 @@ def process_data(data_list: List[Union[int, float, str]], handle_zeros: str = 'i
         - Negative numbers: return absolute value
         - Zero: based on handle_zeros parameter
         
+    SparseVector input is processed in O(nnz) and returns a SparseVector
+    whose dense form equals the dense result (for 'drop', a vector of just
+    the kept values).
+
+    range, ArithmeticSequence and ProcessedSequence input returns a
+    ProcessedSequence: a lazy, read-only view equal to the list the dense
+    path would return, built in O(log n) time and O(1) space.
+        
     Raises:
         CalculatorError: If input validation fails
         
     Time Complexity: O(n)
     Space Complexity: O(n)
     """
+    if isinstance(data_list, SparseVector):
+        return data_list.process(handle_zeros)
+    if isinstance(data_list, (range, ArithmeticSequence, ProcessedSequence)):
+        return _as_sequence(data_list).process(handle_zeros)
+    
     if not isinstance(data_list, list):
         raise CalculatorError("Input must be a list")
     
@@ -326,6 +867,346 @@ def process_data(data_list: List[Union[int, float, str]], handle_zeros: str = 'i
     return results
 
 
+# ==========================================
+# SPARSE VECTORS
+# ==========================================
+
+class SparseVector:
+    """
+    Zero-heavy numeric series stored as (indices, values) of its non-zeros
+
+    Values are validated once at construction and explicit zeros are dropped,
+    so calculate_average(), find_maximum() and process_data() run in
+    O(nnz) on it. Position ``indices[k]`` of the dense series holds
+    ``values[k]``; every other position is 0.
+    """
+
+    __slots__ = ('length', 'indices', 'values')
+
+    def __init__(self, length: int, indices: Iterable[int], values: Iterable[Union[int, float, str]]):
+        if not isinstance(length, int) or length < 0:
+            raise CalculatorError("Sparse vector length must be a non-negative integer")
+        indices = list(indices)
+        values = list(values)
+        if len(indices) != len(values):
+            raise CalculatorError(f"indices and values must have the same length ({len(indices)} != {len(values)})")
+        kept_indices, kept_values = [], []
+        previous = -1
+        for k, (index, value) in enumerate(zip(indices, values)):
+            if not isinstance(index, int) or not previous < index < length:
+                raise CalculatorError(f"Sparse index {index!r} at position {k} must be an increasing "
+                                      f"integer in [0, {length})")
+            previous = index
+            try:
+                num = validate_numeric_input(value, f"values[{k}]")
+            except CalculatorError as e:
+                raise CalculatorError(f"Invalid item at index {index} in numbers: {str(e)}")
+            if num != 0:
+                kept_indices.append(index)
+                kept_values.append(num)
+        self.length = length
+        self.indices = array('q', kept_indices)
+        self.values = kept_values
+
+    @classmethod
+    def _from_validated(cls, length: int, indices: Iterable[int],
+                        values: List[Union[int, float]]) -> "SparseVector":
+        """Build from already validated, increasing indices and non-zero values"""
+        vector = cls.__new__(cls)
+        vector.length = length
+        vector.indices = array('q', indices)
+        vector.values = values
+        return vector
+
+    @classmethod
+    def from_dense(cls, numbers: List[Union[int, float, str]]) -> "SparseVector":
+        """Build a sparse vector from a dense list"""
+        validated = validate_numeric_list(numbers, 'numbers') if numbers else []
+        indices = [i for i, num in enumerate(validated) if num != 0]
+        return cls._from_validated(len(validated), indices, [validated[i] for i in indices])
+
+    def to_dense(self) -> List[Union[int, float]]:
+        """Expand to a plain list with explicit zeros"""
+        dense = [0] * self.length
+        for index, value in zip(self.indices, self.values):
+            dense[index] = value
+        return dense
+
+    @property
+    def nnz(self) -> int:
+        return len(self.values)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SparseVector):
+            return NotImplemented
+        return (self.length == other.length and self.indices == other.indices
+                and self.values == other.values)
+
+    def __repr__(self) -> str:
+        return f"SparseVector(length={self.length}, nnz={self.nnz})"
+
+    def average(self) -> float:
+        """Mean over all positions, zeros included"""
+        if self.length == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+        return sum(self.values) / self.length
+
+    def maximum(self) -> Union[int, float]:
+        """Largest value over all positions, zeros included"""
+        if self.length == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+        if not self.values:
+            return 0
+        peak = max(self.values)
+        return 0 if self.nnz < self.length and peak < 0 else peak
+
+    def process(self, handle_zeros: str = 'include') -> "SparseVector":
+        """
+        process_data() over the non-zeros only
+
+        Returns a SparseVector whose dense form equals the dense result. With
+        'drop' the zeros are gone, so its length is the number of kept values.
+        """
+        if self.length == 0:
+            return SparseVector._from_validated(0, (), [])
+        if handle_zeros not in ['include', 'drop', 'double']:
+            raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+        # Values that are neither > 0 nor < 0 (NaN) become 0 in the dense path,
+        # so they are left out here rather than stored as explicit zeros
+        kept = [(index, x * 2 if x > 0 else -x) for index, x in zip(self.indices, self.values)
+                if x > 0 or x < 0]
+        values = [value for _, value in kept]
+        if handle_zeros == 'drop':
+            return SparseVector._from_validated(len(values), range(len(values)), values)
+        return SparseVector._from_validated(self.length, [index for index, _ in kept], values)
+
+
+# ==========================================
+# ARITHMETIC SEQUENCES
+# ==========================================
+
+class ArithmeticSequence:
+    """
+    Read-only arithmetic progression ``start + i * step`` for i in [0, count)
+
+    Element i is computed exactly as ``start + i * step``, so the descriptor is
+    indistinguishable from the list it describes. The mean (for integer
+    sequences), maximum and process_data() partition follow in closed form
+    without materializing anything. Float sequences keep the maximum and
+    process_data() in closed form; their mean is summed lazily so it matches
+    the materialized sum() bit for bit.
+    """
+
+    __slots__ = ('start', 'step', 'count')
+
+    def __init__(self, start: Union[int, float, str], step: Union[int, float, str], count: int):
+        start = validate_numeric_input(start, 'start')
+        step = validate_numeric_input(step, 'step')
+        if not (math.isfinite(start) and math.isfinite(step)):
+            raise CalculatorError("Sequence start and step must be finite")
+        if not isinstance(count, int) or count < 0:
+            raise CalculatorError("Sequence count must be a non-negative integer")
+        self.start = start
+        self.step = step
+        self.count = count
+
+    @classmethod
+    def from_range(cls, numbers: range) -> "ArithmeticSequence":
+        return cls(numbers.start, numbers.step, len(numbers))
+
+    @property
+    def is_integer(self) -> bool:
+        return type(self.start) is int and type(self.step) is int
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.start + i * self.step for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("sequence index out of range")
+        return self.start + index * self.step
+
+    def __iter__(self):
+        if self.is_integer:
+            return iter(range(self.start, self.start + self.count * self.step, self.step)
+                        if self.step else [self.start] * self.count)
+        start, step = self.start, self.step
+        return (start + i * step for i in range(self.count))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ArithmeticSequence, range, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ArithmeticSequence(start={self.start!r}, step={self.step!r}, count={self.count})"
+
+    def _require_values(self) -> None:
+        if self.count == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+
+    def total(self, lo: int = 0, hi: Optional[int] = None) -> Union[int, float]:
+        """sum() of elements lo..hi-1, O(1) for integer sequences"""
+        hi = self.count if hi is None else hi
+        n = hi - lo
+        if n <= 0:
+            return 0
+        if self.is_integer:
+            # n * (first + last) is always even for integers, so // is exact
+            return n * (2 * self.start + (lo + hi - 1) * self.step) // 2
+        start, step = self.start, self.step
+        return sum(start + i * step for i in range(lo, hi))
+
+    def average(self) -> float:
+        """Mean, computed as total / count like calculate_average()"""
+        self._require_values()
+        return self.total() / self.count
+
+    def maximum(self) -> Union[int, float]:
+        """Largest element, always at one end of a monotone sequence"""
+        self._require_values()
+        return self[-1] if self.step > 0 else self[0]
+
+    def _first_index(self, predicate) -> int:
+        """First index whose element satisfies a predicate that is monotone along the sequence"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if predicate(self.start + mid * self.step):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def process(self, handle_zeros: str = 'include'):
+        """process_data() as a lazy view of sign segments"""
+        if self.count == 0:
+            return []
+        if handle_zeros not in ['include', 'drop', 'double']:
+            raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+        if self.step >= 0:
+            zero_at = self._first_index(lambda x: x >= 0)
+            positive_at = self._first_index(lambda x: x > 0)
+            segments = [('negative', 0, zero_at), ('zero', zero_at, positive_at),
+                        ('positive', positive_at, self.count)]
+        else:
+            zero_at = self._first_index(lambda x: x <= 0)
+            negative_at = self._first_index(lambda x: x < 0)
+            segments = [('positive', 0, zero_at), ('zero', zero_at, negative_at),
+                        ('negative', negative_at, self.count)]
+        return ProcessedSequence(self, [(kind, lo, hi) for kind, lo, hi in segments
+                                        if hi > lo and not (kind == 'zero' and handle_zeros == 'drop')])
+
+
+class ProcessedSequence:
+    """
+    Lazy process_data() result over an ArithmeticSequence
+
+    Stored as (kind, lo, hi) index segments of the source in which every
+    element is positive, zero or negative. Elements are transformed on access
+    exactly as process_data() would, and the view compares equal to the list
+    the dense path returns. calculate_average() and find_maximum() are
+    answered from the segments. Processing the view again doubles every
+    non-zero element, which is kept as a power-of-two ``scale`` (exact for
+    ints and floats alike) instead of a new list.
+    """
+
+    __slots__ = ('source', 'segments', 'scale', '_length')
+
+    def __init__(self, source: ArithmeticSequence, segments: List[Tuple[str, int, int]], scale: int = 1):
+        self.source = source
+        self.segments = segments
+        self.scale = scale
+        self._length = sum(hi - lo for _, lo, hi in segments)
+
+    def _transform(self, kind: str, x):
+        if kind == 'positive':
+            value = x * 2
+        elif kind == 'negative':
+            value = abs(x)
+        else:
+            return 0
+        return value * self.scale if self.scale != 1 else value
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("sequence index out of range")
+        for kind, lo, hi in self.segments:
+            if index < hi - lo:
+                return self._transform(kind, self.source[lo + index])
+            index -= hi - lo
+
+    def __iter__(self):
+        for kind, lo, hi in self.segments:
+            for i in range(lo, hi):
+                yield self._transform(kind, self.source[i])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ProcessedSequence, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ProcessedSequence(length={self._length}, scale={self.scale}, source={self.source!r})"
+
+    def to_list(self) -> List[Union[int, float]]:
+        return list(self)
+
+    def _require_values(self) -> None:
+        if self._length == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+
+    def average(self) -> float:
+        """Mean, O(1) when the source is an integer sequence"""
+        self._require_values()
+        if not self.source.is_integer:
+            return sum(self) / self._length
+        total = 0
+        for kind, lo, hi in self.segments:
+            if kind == 'positive':
+                total += 2 * self.source.total(lo, hi)
+            elif kind == 'negative':
+                total -= self.source.total(lo, hi)
+        return total * self.scale / self._length
+
+    def maximum(self) -> Union[int, float]:
+        """Largest element; each segment is monotone, so only its ends are candidates"""
+        self._require_values()
+        candidates = []
+        for kind, lo, hi in self.segments:
+            candidates.append(self._transform(kind, self.source[lo]))
+            candidates.append(self._transform(kind, self.source[hi - 1]))
+        return max(candidates)
+
+    def process(self, handle_zeros: str = 'include'):
+        """process_data() of the view: non-zeros double, zeros stay or go"""
+        if self._length == 0:
+            return []
+        if handle_zeros not in ['include', 'drop', 'double']:
+            raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+        segments = [segment for segment in self.segments
+                    if not (segment[0] == 'zero' and handle_zeros == 'drop')]
+        return ProcessedSequence(self.source, segments, self.scale * 2)
+
+
+def _as_sequence(numbers):
+    return ArithmeticSequence.from_range(numbers) if isinstance(numbers, range) else numbers
+
+
 # ==========================================
 # PERFORMANCE OPTIMIZED UTILITIES
 # ==========================================
@@ -349,12 +1230,58 @@ def timed_execution(func, *args, **kwargs):
     return result, execution_time_ms
 
 
-def batch_calculate_average(list_of_lists: List[List[Union[int, float]]]) -> List[float]:
+def _average_kernel(numbers) -> float:
+    """
+    Average one batch item, using array-backed kernels where possible
+
+    numpy reductions release the GIL, so threads running this kernel over
+    ndarray items run in parallel even on a GIL build. array.array items are
+    already typed and skip validation.
+    """
+    if np is not None and isinstance(numbers, np.ndarray):
+        if numbers.size == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be empty")
+        return numbers.sum().item() / numbers.size
+    if isinstance(numbers, array):
+        if len(numbers) == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be empty")
+        return sum(numbers) / len(numbers)
+    return calculate_average(numbers)
+
+
+def _average_range(list_of_lists, start: int, stop: int) -> List[float]:
+    """Average items start..stop-1, reporting errors by their batch index"""
+    results = []
+    for i in range(start, stop):
+        try:
+            results.append(_average_kernel(list_of_lists[i]))
+        except CalculatorError as e:
+            raise CalculatorError(f"Error in list {i}: {str(e)}")
+    return results
+
+
+def batch_calculate_average(list_of_lists: List[List[Union[int, float]]],
+                            max_workers: Optional[int] = None,
+                            chunk_size: Optional[int] = None,
+                            executor: Optional[Executor] = None) -> List[float]:
     """
     Calculate averages for multiple lists efficiently
     
+    By default items are processed sequentially. Passing ``max_workers`` > 1
+    (or an existing ``executor``) splits the batch into contiguous chunks and
+    runs them on a thread pool. The function keeps no shared mutable state,
+    so it is safe to call concurrently. On a standard (GIL) build, threads
+    only overlap where the reduction releases the GIL, which is the numpy
+    path for ndarray items; pure-Python lists scale on free-threaded
+    CPython only.
+    
     Args:
         list_of_lists: List containing multiple lists of numbers
+            (numpy arrays and array.array items are also accepted)
+        max_workers: Number of worker threads; None or 1 runs sequentially
+        chunk_size: Items per submitted task (default: about 4 tasks per worker,
+            counting os.cpu_count() workers when only an executor is given)
+        executor: Existing executor to submit chunks to instead of creating a pool
         
     Returns:
         List of average values
@@ -362,14 +1289,1161 @@ def batch_calculate_average(list_of_lists: List[List[Union[int, float]]]) -> Lis
     Raises:
         CalculatorError: If any list is invalid
     """
-    results = []
-    for i, numbers in enumerate(list_of_lists):
-        try:
-            avg = calculate_average(numbers)
-            results.append(avg)
-        except CalculatorError as e:
-            raise CalculatorError(f"Error in list {i}: {str(e)}")
-    return results
+    n = len(list_of_lists)
+    if executor is None and (max_workers is None or max_workers <= 1):
+        return _average_range(list_of_lists, 0, n)
+
+    if chunk_size is None:
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, -(-n // (workers * 4)))
+    elif chunk_size < 1:
+        raise CalculatorError("chunk_size must be a positive integer")
+
+    def run(pool: Executor) -> List[float]:
+        futures = [pool.submit(_average_range, list_of_lists, start, min(start + chunk_size, n))
+                   for start in range(0, n, chunk_size)]
+        results = []
+        # Collect in submission order so the lowest failing index is reported
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    if executor is not None:
+        return run(executor)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return run(pool)
+
+
+# ==========================================
+# RAGGED BATCH REDUCTIONS (CSR LAYOUT)
+# ==========================================
+
+class SegmentedStats(NamedTuple):
+    """Per-group results of segmented_stats(), indexed by group"""
+    counts: List[int]
+    sums: List[Union[int, float]]
+    means: List[float]
+    maxima: List[Union[int, float]]
+
+
+def _typed_values(values: List[Union[int, float]]):
+    """
+    Pack validated numbers into int64 or float64 storage when that keeps every value exact
+
+    Integers outside int64 and mixed int/float data stay in a plain list, so
+    the sums and maxima pack_ragged() and RangeStats take over them match
+    calculate_average() and find_maximum() instead of float approximations.
+    """
+    try:
+        return array('q', values)
+    except (TypeError, OverflowError):
+        pass
+    if all(type(v) is float for v in values):
+        return array('d', values)
+    return values
+
+
+def pack_ragged(list_of_lists: List[List[Union[int, float, str]]]):
+    """
+    Convert a list of lists into a flat values array plus group offsets
+
+    Group ``i`` occupies ``values[offsets[i]:offsets[i + 1]]``. Every item is
+    validated exactly once here, so repeated reductions over the packed
+    layout pay no further validation cost.
+
+    Args:
+        list_of_lists: List containing lists of numbers
+
+    Returns:
+        Tuple of (values, offsets); values is an array.array buffer, or a list
+        when the numbers do not all fit int64 or are mixed int and float
+
+    Raises:
+        CalculatorError: If the input is not a list of lists or an item is not numeric
+    """
+    if not isinstance(list_of_lists, list):
+        raise CalculatorError(f"Parameter 'list_of_lists' must be a list, got {type(list_of_lists).__name__}")
+
+    flat = []
+    offsets = array('q', [0])
+    for i, numbers in enumerate(list_of_lists):
+        if not isinstance(numbers, list):
+            raise CalculatorError(f"Error in list {i}: Parameter 'numbers' must be a list, got {type(numbers).__name__}")
+        for j, num in enumerate(numbers):
+            try:
+                flat.append(validate_numeric_input(num, f"numbers[{j}]"))
+            except CalculatorError as e:
+                raise CalculatorError(f"Error in list {i}: Invalid item at index {j} in numbers: {str(e)}")
+        offsets.append(len(flat))
+    return _typed_values(flat), offsets
+
+
+def _check_offsets(offsets, n_values: int) -> None:
+    """Validate CSR offsets: start at 0, non-decreasing, end at n_values"""
+    if len(offsets) == 0 or offsets[0] != 0:
+        raise CalculatorError("Offsets must start with 0")
+    if offsets[-1] != n_values:
+        raise CalculatorError(f"Last offset must equal the number of values ({n_values}), got {offsets[-1]}")
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] < offsets[i]:
+            raise CalculatorError(f"Offsets must be non-decreasing (offset {i + 1} < offset {i})")
+        if offsets[i + 1] == offsets[i]:
+            raise CalculatorError(f"Error in group {i}: group cannot be empty")
+
+
+def segmented_stats(values, offsets) -> SegmentedStats:
+    """
+    Compute per-group count, sum, mean and maximum over a CSR layout
+
+    Each group is reduced in place through a zero-copy memoryview slice (a
+    list slice when the values do not fit typed storage), so the cost per
+    group is a couple of C-level reductions instead of a full
+    calculate_average() call with its own validation. numpy inputs use
+    ``reduceat`` and reduce every group in one vectorized call.
+
+    Args:
+        values: Flat numeric values (array.array, numpy array or list)
+        offsets: Group boundaries, ``len(groups) + 1`` non-decreasing integers
+
+    Returns:
+        SegmentedStats with one entry per group
+
+    Raises:
+        CalculatorError: If offsets are malformed, a group is empty or a value is not numeric
+    """
+    if isinstance(values, list):
+        values = _typed_values(validate_numeric_list(values, 'values')) if values else array('q')
+    _check_offsets(offsets, len(values))
+
+    if np is not None and isinstance(values, np.ndarray):
+        starts = np.asarray(offsets[:-1], dtype=np.intp)
+        counts = np.diff(np.asarray(offsets, dtype=np.intp))
+        sums = np.add.reduceat(values, starts)
+        return SegmentedStats(counts.tolist(), sums.tolist(), (sums / counts).tolist(),
+                              np.maximum.reduceat(values, starts).tolist())
+
+    view = memoryview(values) if isinstance(values, array) else values
+    counts, sums, means, maxima = [], [], [], []
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        group = view[start:end]
+        total = sum(group)
+        count = end - start
+        counts.append(count)
+        sums.append(total)
+        try:
+            means.append(total / count)
+        except OverflowError:
+            raise CalculatorError(f"Error in group {i}: mean is too large for a float")
+        maxima.append(max(group))
+    return SegmentedStats(counts, sums, means, maxima)
+
+
+def batch_describe_ragged(list_of_lists: List[List[Union[int, float, str]]]) -> SegmentedStats:
+    """
+    Pack a list of lists once and return per-group count, sum, mean and maximum
+
+    Args:
+        list_of_lists: List containing lists of numbers
+
+    Returns:
+        SegmentedStats with one entry per inner list
+
+    Raises:
+        CalculatorError: If any list is empty or contains non-numeric values
+    """
+    values, offsets = pack_ragged(list_of_lists)
+    return segmented_stats(values, offsets)
+
+
+# ==========================================
+# RANGE QUERIES OVER STATIC SERIES
+# ==========================================
+
+class RangeStats:
+    """
+    Precomputed index for mean and maximum of any slice ``numbers[i:j]``
+
+    Built once in O(n log n):
+        - prefix sums, so a slice mean is (prefix[j] - prefix[i]) / (j - i)
+        - a sparse table, where level k holds the maximum of every window of
+          2**k values, so a slice maximum is the larger of two overlapping
+          windows
+
+    Both are stored as int64/float64 arrays when the series allows it
+    (all ints in int64 range, or all floats) and as lists otherwise, so
+    results keep the types calculate_average() and find_maximum() return.
+    For integer series every answer equals calculate_average(numbers[i:j])
+    and find_maximum(numbers[i:j]) exactly; for float series the mean comes
+    from differences of running sums and may differ in the last bits.
+
+    Memory: about 8 * n * (log2(n) + 2) bytes with array storage.
+
+    Usage:
+        index = RangeStats(series)
+        index.average(100, 5000), index.maximum(100, 5000)
+        index.average_many([(0, 10), (5, 50)])
+    """
+
+    def __init__(self, numbers: List[Union[int, float, str]]):
+        values = validate_numeric_list(numbers, 'numbers')
+        self._n = len(values)
+        prefix = list(accumulate(values, initial=0))
+        if type(prefix[-1]) is float:
+            prefix[0] = 0.0  # lets an all-float series use float64 storage
+        self._prefix = _typed_values(prefix)
+        levels = [_typed_values(values)]
+        width = 1
+        while 2 * width <= self._n:
+            previous = levels[-1]
+            # max() keeps the left operand on ties, i.e. the leftmost maximum, as find_maximum() does
+            levels.append(_typed_values(list(map(max, previous[:len(previous) - width], previous[width:]))))
+            width *= 2
+        self._levels = levels
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate storage used by the index"""
+        total = 0
+        for storage in [self._prefix] + self._levels:
+            total += len(storage) * (storage.itemsize if isinstance(storage, array) else 8)
+        return total
+
+    def _check(self, i: int, j: int) -> Tuple[int, int]:
+        """Return (i, j) as plain ints; integer-like indices (e.g. numpy ints) are accepted, bools are not"""
+        try:
+            if isinstance(i, bool) or isinstance(j, bool):
+                raise TypeError
+            i, j = operator.index(i), operator.index(j)
+        except TypeError:
+            raise CalculatorError(f"Range [{i!r}, {j!r}) must have integer bounds")
+        if not 0 <= i < j <= self._n:
+            raise CalculatorError(f"Range [{i}, {j}) must be non-empty and within [0, {self._n}]")
+        return i, j
+
+    def total(self, i: int, j: int) -> Union[int, float]:
+        """sum(numbers[i:j]) in O(1)"""
+        i, j = self._check(i, j)
+        return self._prefix[j] - self._prefix[i]
+
+    def average(self, i: int, j: int) -> float:
+        """calculate_average(numbers[i:j]) in O(1)"""
+        i, j = self._check(i, j)
+        return (self._prefix[j] - self._prefix[i]) / (j - i)
+
+    def maximum(self, i: int, j: int) -> Union[int, float]:
+        """find_maximum(numbers[i:j]) in O(1)"""
+        i, j = self._check(i, j)
+        level = (j - i).bit_length() - 1
+        table = self._levels[level]
+        return max(table[i], table[j - (1 << level)])
+
+    def average_many(self, pairs: Iterable[Tuple[int, int]]) -> List[float]:
+        """average() for each (i, j) pair"""
+        prefix, check = self._prefix, self._check
+        results = []
+        for i, j in pairs:
+            i, j = check(i, j)
+            results.append((prefix[j] - prefix[i]) / (j - i))
+        return results
+
+    def maximum_many(self, pairs: Iterable[Tuple[int, int]]) -> List[Union[int, float]]:
+        """maximum() for each (i, j) pair"""
+        levels, check = self._levels, self._check
+        results = []
+        for i, j in pairs:
+            i, j = check(i, j)
+            level = (j - i).bit_length() - 1
+            table = levels[level]
+            results.append(max(table[i], table[j - (1 << level)]))
+        return results
+
+
+# ==========================================
+# KEYED GROUP-BY AGGREGATION
+# ==========================================
+
+class GroupAggregator:
+    """
+    Running per-key aggregates for (key, value) streams
+
+    Each key maps to a slot in a handful of parallel columns holding the
+    count, sum, mean, M2, min and max for that key, so memory grows with the
+    number of distinct keys rather than the number of values. Counts, means
+    and M2 live in typed arrays; sums and extremes keep the exact Python
+    numbers, so integer groups report the same totals and maxima as sum()
+    and find_maximum(). Tables built by separate workers can be combined
+    with merge().
+    """
+
+    def __init__(self):
+        self._slots = {}
+        self._counts = array('q')
+        self._sums = []
+        self._means = array('d')
+        self._m2 = array('d')
+        self._mins = []
+        self._maxs = []
+
+    def _slot(self, key: Hashable) -> int:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._counts)
+            self._slots[key] = slot
+            self._counts.append(0)
+            self._sums.append(0)
+            self._means.append(0.0)
+            self._m2.append(0.0)
+            self._mins.append(None)
+            self._maxs.append(None)
+        return slot
+
+    def add(self, key: Hashable, value: Union[int, float, str]) -> None:
+        """
+        Fold one value into the aggregates for key
+
+        Raises:
+            CalculatorError: If value is not numeric or too large for the float moments
+        """
+        try:
+            num = validate_numeric_input(value, 'value')
+        except CalculatorError as e:
+            raise CalculatorError(f"Invalid value for key {key!r}: {str(e)}")
+        slot = self._slot(key)
+        count = self._counts[slot] + 1
+        try:
+            delta = num - self._means[slot]
+            mean = self._means[slot] + delta / count
+            m2 = self._m2[slot] + delta * (num - mean)
+        except OverflowError:
+            raise CalculatorError(f"Invalid value for key {key!r}: value is too large for a float")
+        self._counts[slot] = count
+        self._sums[slot] += num
+        self._means[slot] = mean
+        self._m2[slot] = m2
+        if count == 1 or num < self._mins[slot]:
+            self._mins[slot] = num
+        if count == 1 or num > self._maxs[slot]:
+            self._maxs[slot] = num
+
+    def update(self, pairs: Iterable[Tuple[Hashable, Union[int, float, str]]]) -> "GroupAggregator":
+        """Fold an iterable of (key, value) pairs; returns self"""
+        for key, value in pairs:
+            self.add(key, value)
+        return self
+
+    def update_arrays(self, keys, values) -> "GroupAggregator":
+        """
+        Fold parallel key and value sequences; returns self
+
+        Raises:
+            CalculatorError: If the sequences differ in length
+        """
+        if len(keys) != len(values):
+            raise CalculatorError(f"keys and values must have the same length ({len(keys)} != {len(values)})")
+        return self.update(zip(keys, values))
+
+    def _moments(self, slot: int):
+        return (self._counts[slot], self._sums[slot], self._means[slot],
+                self._m2[slot], self._mins[slot], self._maxs[slot])
+
+    def merge(self, other: "GroupAggregator") -> "GroupAggregator":
+        """Merge a partial table from another worker into this one; returns self"""
+        for key, other_slot in other._slots.items():
+            slot = self._slot(key)
+            (self._counts[slot], self._sums[slot], self._means[slot],
+             self._m2[slot], self._mins[slot], self._maxs[slot]) = merge_moments(
+                self._moments(slot), other._moments(other_slot))
+        return self
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def keys(self):
+        return self._slots.keys()
+
+    def __getitem__(self, key: Hashable) -> Summary:
+        """
+        Return the Summary for key
+
+        Raises:
+            CalculatorError: If no values have been seen for key
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            raise CalculatorError(f"No values recorded for key {key!r}")
+        return summary_from_moments(self._moments(slot), 0)
+
+    def items(self):
+        """Yield (key, Summary) pairs"""
+        for key in self._slots:
+            yield key, self[key]
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+
+def group_by(pairs: Iterable[Tuple[Hashable, Union[int, float, str]]]) -> GroupAggregator:
+    """
+    Aggregate (key, value) pairs without materializing per-key lists
+
+    Args:
+        pairs: Iterable of (key, value) pairs
+
+    Returns:
+        GroupAggregator holding count, sum, mean, min and max per key
+
+    Raises:
+        CalculatorError: If any value is not numeric
+    """
+    return GroupAggregator().update(pairs)
+
+
+# ==========================================
+# CONCURRENT AGGREGATION
+# ==========================================
+
+class _Shard:
+    """One thread's partial aggregate; only its owner thread writes to it"""
+
+    __slots__ = ('lock', 'moments')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.moments = EMPTY_MOMENTS
+
+
+class ShardedAggregator:
+    """
+    Running count, sum, mean, min and max fed from many threads
+
+    Every ingesting thread gets its own shard on first use, so inserts touch
+    only that shard's lock, which is uncontended except while a snapshot is
+    being taken. snapshot() briefly holds every shard lock and merges the
+    partial aggregates, giving a consistent point-in-time view.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._registry_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._registry_lock:  # once per thread
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def add(self, value: Union[int, float, str]) -> None:
+        """
+        Add one value from the calling thread
+
+        Raises:
+            CalculatorError: If value is not numeric or too large for the float moments
+        """
+        num = validate_numeric_input(value, 'value')
+        shard = self._shard()
+        with shard.lock:
+            count, total, mean, m2, minimum, maximum = shard.moments
+            count += 1
+            try:
+                delta = num - mean
+                mean += delta / count
+                m2 += delta * (num - mean)
+            except OverflowError:
+                raise CalculatorError("Invalid value: value is too large for a float")
+            if count == 1:
+                minimum = maximum = num
+            elif num < minimum:
+                minimum = num
+            elif num > maximum:
+                maximum = num
+            shard.moments = (count, total + num, mean, m2, minimum, maximum)
+
+    def add_many(self, values: List[Union[int, float, str]]) -> None:
+        """
+        Add a list of values from the calling thread in one shard update
+
+        Raises:
+            CalculatorError: If the list is empty or contains non-numeric values
+                or values too large for the float moments
+        """
+        validated = validate_numeric_list(values, 'values')
+        try:
+            moments = chunk_moments(validated)
+        except OverflowError:
+            raise CalculatorError("Invalid item in values: value is too large for a float")
+        shard = self._shard()
+        with shard.lock:
+            shard.moments = merge_moments(shard.moments, moments)
+
+    def snapshot(self) -> Summary:
+        """
+        Merge all shards into a consistent Summary
+
+        Raises:
+            CalculatorError: If no values have been added
+        """
+        with self._registry_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            shard.lock.acquire()
+        try:
+            parts = [shard.moments for shard in shards]
+        finally:
+            for shard in shards:
+                shard.lock.release()
+        merged = EMPTY_MOMENTS
+        for part in parts:
+            merged = merge_moments(merged, part)
+        if merged[0] == 0:
+            raise CalculatorError("No values have been added")
+        return summary_from_moments(merged, 0)
+
+    def calculate_average(self) -> float:
+        return self.snapshot().mean
+
+    def find_maximum(self) -> Union[int, float]:
+        return self.snapshot().maximum
+
+
+# ==========================================
+# ORDER STATISTICS UNDER UPDATES
+# ==========================================
+
+SORTED_SERIES_LOAD = 512
+
+
+class SortedSeries:
+    """
+    Mutable sorted multiset of numbers with rank, select and percentile queries
+
+    Values live in a list of sorted blocks of roughly ``load`` items, with
+    the block maxima kept alongside for bisection and a Fenwick tree over
+    the block lengths for positional lookups. Inserting or deleting touches
+    one block (a memmove of at most 2 * load references) plus O(log b) index
+    updates, where b is the number of blocks; blocks are split or dropped as
+    they grow or empty out.
+
+    Complexity:
+        add / remove:            O(log n + load)
+        minimum / maximum:       O(1)
+        rank / select:           O(log n)
+        percentile:              O(log n)
+
+    Usage:
+        series = SortedSeries([5, "3.5", 9])
+        series.add(7)
+        series.remove(9)
+        series.maximum(), series.rank(6), series.percentile(50)
+    """
+
+    def __init__(self, values: Iterable[Union[int, float, str]] = (), load: int = SORTED_SERIES_LOAD):
+        if load < 2:
+            raise CalculatorError("load must be at least 2")
+        self._load = load
+        self._blocks: List[list] = []
+        self._maxes: List[Union[int, float]] = []
+        self._tree: List[int] = [0]
+        self._len = 0
+        self.update(values)
+
+    @staticmethod
+    def _validate(value, param_name: str) -> Union[int, float]:
+        num = validate_numeric_input(value, param_name)
+        if num != num:
+            raise CalculatorError(f"Parameter '{param_name}' cannot be NaN (it has no rank)")
+        return num
+
+    # ------------------------------------------
+    # Block index (Fenwick tree over block lengths)
+    # ------------------------------------------
+
+    def _rebuild_index(self) -> None:
+        size = len(self._blocks)
+        tree = [0] * (size + 1)
+        for i, block in enumerate(self._blocks, 1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _index_add(self, block: int, delta: int) -> None:
+        tree = self._tree
+        i = block + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _count_before(self, block: int) -> int:
+        """Number of values in blocks [0, block)"""
+        tree = self._tree
+        total = 0
+        while block:
+            total += tree[block]
+            block -= block & -block
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Map a position in sorted order to (block, offset)"""
+        tree = self._tree
+        block = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = block + step
+            if nxt < len(tree) and tree[nxt] <= index:
+                block = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return block, index
+
+    # ------------------------------------------
+    # Updates
+    # ------------------------------------------
+
+    def add(self, value: Union[int, float, str]) -> None:
+        """Insert one value (strings are converted)"""
+        num = self._validate(value, 'value')
+        self._insert(num)
+
+    def _insert(self, num: Union[int, float]) -> None:
+        if not self._blocks:
+            self._blocks.append([num])
+            self._maxes.append(num)
+            self._rebuild_index()
+            self._len = 1
+            return
+        i = bisect.bisect_right(self._maxes, num)
+        if i == len(self._blocks):
+            i -= 1
+            self._blocks[i].append(num)
+            self._maxes[i] = num
+        else:
+            bisect.insort_right(self._blocks[i], num)
+        self._len += 1
+        block = self._blocks[i]
+        if len(block) > 2 * self._load:
+            half = len(block) // 2
+            self._blocks[i:i + 1] = [block[:half], block[half:]]
+            self._maxes[i:i + 1] = [block[half - 1], block[-1]]
+            self._rebuild_index()
+        else:
+            self._index_add(i, 1)
+
+    def update(self, values: Iterable[Union[int, float, str]]) -> None:
+        """Insert many values; large batches are merged with one sort"""
+        validated = []
+        for i, value in enumerate(values):
+            try:
+                validated.append(self._validate(value, f"values[{i}]"))
+            except CalculatorError as e:
+                raise CalculatorError(f"Invalid item at index {i} in values: {str(e)}")
+        if len(validated) > self._len // 8:
+            merged = list(self._iter_values())
+            merged.extend(validated)
+            merged.sort()
+            load = self._load
+            self._blocks = [merged[i:i + load] for i in range(0, len(merged), load)]
+            self._maxes = [block[-1] for block in self._blocks]
+            self._len = len(merged)
+            self._rebuild_index()
+        else:
+            for num in validated:
+                self._insert(num)
+
+    def remove(self, value: Union[int, float, str]) -> None:
+        """Delete one occurrence of value, raising CalculatorError if absent"""
+        num = self._validate(value, 'value')
+        if not self._discard(num):
+            raise CalculatorError(f"Value {num!r} is not in the series")
+
+    def discard(self, value: Union[int, float, str]) -> bool:
+        """Delete one occurrence of value if present; returns whether it was"""
+        return self._discard(self._validate(value, 'value'))
+
+    def _discard(self, num: Union[int, float]) -> bool:
+        i = bisect.bisect_left(self._maxes, num)
+        if i == len(self._blocks):
+            return False
+        block = self._blocks[i]
+        j = bisect.bisect_left(block, num)
+        if block[j] != num:
+            return False
+        del block[j]
+        self._len -= 1
+        if not block:
+            del self._blocks[i]
+            del self._maxes[i]
+            self._rebuild_index()
+        else:
+            self._maxes[i] = block[-1]
+            self._index_add(i, -1)
+        return True
+
+    # ------------------------------------------
+    # Queries
+    # ------------------------------------------
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _iter_values(self):
+        for block in self._blocks:
+            yield from block
+
+    def __iter__(self):
+        return self._iter_values()
+
+    def __contains__(self, value) -> bool:
+        try:
+            num = self._validate(value, 'value')
+        except CalculatorError:
+            return False
+        i = bisect.bisect_left(self._maxes, num)
+        return i < len(self._blocks) and self._blocks[i][bisect.bisect_left(self._blocks[i], num)] == num
+
+    def __repr__(self) -> str:
+        return f"SortedSeries(len={self._len})"
+
+    def _require_values(self) -> None:
+        if self._len == 0:
+            raise CalculatorError("SortedSeries is empty")
+
+    def minimum(self) -> Union[int, float]:
+        self._require_values()
+        return self._blocks[0][0]
+
+    def maximum(self) -> Union[int, float]:
+        self._require_values()
+        return self._maxes[-1]
+
+    def select(self, k: int) -> Union[int, float]:
+        """Value at position k of the sorted order (negative k counts from the end)"""
+        if k < 0:
+            k += self._len
+        if not 0 <= k < self._len:
+            raise CalculatorError(f"Rank {k} is out of range for {self._len} values")
+        block, offset = self._locate(k)
+        return self._blocks[block][offset]
+
+    __getitem__ = select
+
+    def rank(self, value: Union[int, float, str]) -> int:
+        """Number of values strictly less than value"""
+        num = self._validate(value, 'value')
+        i = bisect.bisect_left(self._maxes, num)
+        if i == len(self._blocks):
+            return self._len
+        return self._count_before(i) + bisect.bisect_left(self._blocks[i], num)
+
+    def count(self, value: Union[int, float, str]) -> int:
+        """Number of occurrences of value"""
+        num = self._validate(value, 'value')
+        i = bisect.bisect_right(self._maxes, num)
+        upper = self._len if i == len(self._blocks) else \
+            self._count_before(i) + bisect.bisect_right(self._blocks[i], num)
+        return upper - self.rank(num)
+
+    def percentile(self, p: Union[int, float, str]) -> Union[int, float]:
+        """
+        p-th percentile (0-100) with linear interpolation between closest ranks
+
+        Matches numpy.percentile's default ('linear') method.
+        """
+        p = validate_numeric_input(p, 'p')
+        if not 0 <= p <= 100:
+            raise CalculatorError("Percentile must be between 0 and 100")
+        self._require_values()
+        position = (self._len - 1) * p / 100
+        lower = math.floor(position)
+        low = self.select(lower)
+        if lower == position:
+            return low
+        high = self.select(lower + 1)
+        return low + (high - low) * (position - lower)
+
+
+# ==========================================
+# VECTOR AND MATRIX KERNELS
+# ==========================================
+
+MATMUL_BLOCK_SIZE = 64
+
+
+def _validate_vector(vector, param_name: str) -> array:
+    """Validate a vector once and pack it into typed storage"""
+    return _typed_values(validate_numeric_list(list(vector) if isinstance(vector, (tuple, array)) else vector,
+                                               param_name))
+
+
+def _validate_matrix(matrix, param_name: str) -> List[array]:
+    """
+    Validate a rectangular matrix once and pack each row into typed storage
+
+    Raises:
+        CalculatorError: If the matrix is empty, ragged or contains non-numeric values
+    """
+    if not isinstance(matrix, list) or len(matrix) == 0:
+        raise CalculatorError(f"Parameter '{param_name}' must be a non-empty list of rows")
+    rows = [_validate_vector(row, f"{param_name}[{i}]") for i, row in enumerate(matrix)]
+    width = len(rows[0])
+    for i, row in enumerate(rows):
+        if len(row) != width:
+            raise CalculatorError(f"Parameter '{param_name}' is not rectangular: row {i} has "
+                                  f"{len(row)} columns, expected {width}")
+    return rows
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend not in ('auto', 'python', 'numpy'):
+        raise CalculatorError("backend must be 'auto', 'python' or 'numpy'")
+    if backend == 'numpy' and np is None:
+        raise CalculatorError("backend 'numpy' requested but numpy is not installed")
+    if backend == 'auto' and np is None:
+        return 'python'
+    return backend
+
+
+def _numpy_dtype(left: List, right: List, inner: int) -> Optional[str]:
+    """
+    numpy dtype whose product equals the pure-Python one, or None
+
+    float64 when every row of either operand is float64-packed, since every
+    product is then a float in Python too. int64 only when both operands are
+    int64-packed and the largest possible partial sum fits, because numpy
+    wraps silently on overflow. Anything else (mixed rows, big ints) is None.
+    """
+    rows = left + right
+    if not all(isinstance(row, array) for row in rows):
+        return None
+    if all(row.typecode == 'd' for row in left) or all(row.typecode == 'd' for row in right):
+        return 'float64'
+    if any(row.typecode != 'q' for row in rows):
+        return None
+    peak_left = max(max(map(abs, row), default=0) for row in left)
+    peak_right = max(max(map(abs, row), default=0) for row in right)
+    return 'int64' if peak_left * peak_right * inner < 2**63 else None
+
+
+def _numpy_product(left: List, right, dtype: Optional[str]) -> list:
+    """left @ right on numpy; dtype None keeps Python numbers in object arrays so ints stay exact"""
+    dtype = dtype or object
+    return (np.array(left, dtype=dtype) @ np.array(right, dtype=dtype)).tolist()
+
+
+def dot(a: List[Union[int, float, str]], b: List[Union[int, float, str]]) -> Union[int, float]:
+    """
+    Dot product of two vectors
+
+    Each operand is validated once; the products and the sum then run in
+    C via ``sum(map(operator.mul, a, b))``.
+
+    Raises:
+        CalculatorError: If the vectors are empty, non-numeric or differ in length
+
+    Time Complexity: O(n)
+    """
+    a_vals = _validate_vector(a, 'a')
+    b_vals = _validate_vector(b, 'b')
+    if len(a_vals) != len(b_vals):
+        raise CalculatorError(f"Vectors must have the same length ({len(a_vals)} != {len(b_vals)})")
+    return sum(map(operator.mul, a_vals, b_vals))
+
+
+def matvec(matrix: List[List[Union[int, float, str]]], vector: List[Union[int, float, str]],
+           backend: str = 'python') -> List[Union[int, float]]:
+    """
+    Matrix-vector product
+
+    Args:
+        matrix: m x n matrix as a list of rows
+        vector: Vector of length n
+        backend: 'python', 'numpy' or 'auto' (numpy when installed and
+            the result is exact in int64/float64, otherwise python)
+
+    Returns:
+        List of m values
+
+    Raises:
+        CalculatorError: If operands are invalid or their shapes do not match
+    """
+    backend = _resolve_backend(backend)
+    rows = _validate_matrix(matrix, 'matrix')
+    vec = _validate_vector(vector, 'vector')
+    if len(rows[0]) != len(vec):
+        raise CalculatorError(f"Shape mismatch: matrix has {len(rows[0])} columns, vector has {len(vec)} items")
+    if backend != 'python':
+        dtype = _numpy_dtype(rows, [vec], len(vec))
+        if dtype is not None or backend == 'numpy':
+            return _numpy_product(rows, vec, dtype)
+    return [sum(map(operator.mul, row, vec)) for row in rows]
+
+
+def matmul(a: List[List[Union[int, float, str]]], b: List[List[Union[int, float, str]]],
+           backend: str = 'python', block_size: int = MATMUL_BLOCK_SIZE) -> List[List[Union[int, float]]]:
+    """
+    Matrix-matrix product
+
+    The pure-Python kernel transposes ``b`` once so every inner product runs
+    over two contiguous typed arrays, and blocks all three loops: the output
+    is walked in ``block_size`` x ``block_size`` tiles, and each tile is
+    accumulated over ``block_size``-long segments of the shared dimension,
+    so the row and column segments a tile reuses stay in cache. Segments are
+    added in order, so results equal one sum() per output cell.
+
+    On numpy, int64 is used only when no partial sum can overflow; other
+    integer input runs on object arrays (backend='numpy') or in Python
+    (backend='auto'), so results never depend on whether numpy is installed.
+
+    Args:
+        a: m x k matrix as a list of rows
+        b: k x n matrix as a list of rows
+        backend: 'python', 'numpy' or 'auto' (numpy when installed and
+            the result is exact in int64/float64, otherwise python)
+        block_size: Tile edge length for the pure-Python kernel
+
+    Returns:
+        m x n result as a list of rows
+
+    Raises:
+        CalculatorError: If operands are invalid or their shapes do not match
+
+    Time Complexity: O(m * k * n)
+    """
+    backend = _resolve_backend(backend)
+    if block_size < 1:
+        raise CalculatorError("block_size must be a positive integer")
+    a_rows = _validate_matrix(a, 'a')
+    b_rows = _validate_matrix(b, 'b')
+    if len(a_rows[0]) != len(b_rows):
+        raise CalculatorError(f"Shape mismatch: a has {len(a_rows[0])} columns, b has {len(b_rows)} rows")
+    if backend != 'python':
+        dtype = _numpy_dtype(a_rows, b_rows, len(b_rows))
+        if dtype is not None or backend == 'numpy':
+            return _numpy_product(a_rows, b_rows, dtype)
+
+    m, n, inner = len(a_rows), len(b_rows[0]), len(b_rows)
+    b_cols = [_typed_values(list(col)) for col in zip(*b_rows)]
+    k_starts = range(0, inner, block_size)
+    result = [[0] * n for _ in range(m)]
+    mul = operator.mul
+    for i0 in range(0, m, block_size):
+        i_block = range(i0, min(i0 + block_size, m))
+        for j0 in range(0, n, block_size):
+            j1 = min(j0 + block_size, n)
+            for k0 in k_starts:
+                k1 = k0 + block_size
+                col_segments = [col[k0:k1] for col in b_cols[j0:j1]]
+                for i in i_block:
+                    row_segment = a_rows[i][k0:k1]
+                    out = result[i]
+                    out[j0:j1] = [sum(map(mul, row_segment, segment), partial)
+                                  for segment, partial in zip(col_segments, out[j0:j1])]
+    return result
+
+
+# ==========================================
+# TRUSTED-INPUT FAST API
+# ==========================================
+
+class FastCalculator:
+    """
+    Unchecked variants of the calculator functions for trusted numeric input
+
+    Available as ``calculator_fixed.fast``. Inputs must already be int/float
+    values (and lists of them); there is no type validation or string
+    conversion. Results for valid input are identical to the validating
+    functions, and the semantic errors (division by zero, empty lists,
+    invalid factorial arguments, unknown handle_zeros) still raise
+    CalculatorError with the same messages.
+    """
+
+    @staticmethod
+    def add(a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
+        return a + b
+
+    @staticmethod
+    def subtract(a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
+        return a - b
+
+    @staticmethod
+    def multiply(a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
+        return a * b
+
+    @staticmethod
+    def divide(a: Union[int, float], b: Union[int, float]) -> float:
+        if b == 0:
+            raise CalculatorError("Division by zero is not allowed")
+        return a / b
+
+    @staticmethod
+    def calculate_average(numbers: List[Union[int, float]]) -> float:
+        if not numbers:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+        return sum(numbers) / len(numbers)
+
+    @staticmethod
+    def find_maximum(numbers: List[Union[int, float]]) -> Union[int, float]:
+        if not numbers:
+            raise CalculatorError("Parameter 'numbers' cannot be an empty list")
+        return max(numbers)
+
+    @staticmethod
+    def factorial(n: Union[int, float]) -> int:
+        if isinstance(n, float):
+            # Integral floats are accepted, as in the validating factorial()
+            if not n.is_integer():
+                raise CalculatorError("Factorial is only defined for integers")
+            n = int(n)
+        if n < 0:
+            raise CalculatorError("Factorial is not defined for negative numbers")
+        if n > 1000:
+            raise CalculatorError("Factorial input too large (max 1000)")
+        return math.factorial(n)
+
+    @staticmethod
+    def process_data(data_list: List[Union[int, float]], handle_zeros: str = 'include') -> List[Union[int, float]]:
+        if not data_list:
+            return []
+        if handle_zeros == 'drop':
+            return [x * 2 if x > 0 else abs(x) for x in data_list if x > 0 or x < 0]
+        if handle_zeros not in ('include', 'double'):
+            raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+        return [x * 2 if x > 0 else (abs(x) if x < 0 else 0) for x in data_list]
+
+    @staticmethod
+    def batch_calculate_average(list_of_lists: List[List[Union[int, float]]]) -> List[float]:
+        results = []
+        for i, numbers in enumerate(list_of_lists):
+            if not numbers:
+                raise CalculatorError(f"Error in list {i}: Parameter 'numbers' cannot be an empty list")
+            results.append(sum(numbers) / len(numbers))
+        return results
+
+
+fast = FastCalculator()
+
+
+# ==========================================
+# BOUNDED MEMOIZATION
+# ==========================================
+
+class _CachedError:
+    """Marker for a cached CalculatorError; a fresh exception is raised on every hit"""
+
+    __slots__ = ('message',)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+_INVALID_NUMBER = object()
+_MEMOIZED_OPERATIONS = {'add': add, 'subtract': subtract, 'multiply': multiply,
+                        'divide': divide, 'factorial': factorial}
+
+
+def _cache_stats(cached) -> dict:
+    info = cached.cache_info()
+    lookups = info.hits + info.misses
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+            'maxsize': info.maxsize, 'hit_rate': info.hits / lookups if lookups else 0.0}
+
+
+class MemoizedCalculator:
+    """
+    Opt-in memoization for the scalar operations and string parsing
+
+    Each operation is cached under its name and raw arguments, typed so that
+    1, 1.0 and True stay distinct; a hit skips parsing entirely. On a miss,
+    string operands are converted through a second cache keyed by the string,
+    so new pairs of already-seen operands are not parsed again. Failed calls
+    are cached too and raise a new CalculatorError with the same message on
+    every hit. Both caches are LRU-bounded (functools.lru_cache) and safe to
+    share between threads. Unhashable arguments bypass the cache, as do
+    float zeros, because 0.0 and -0.0 are equal keys but give differently
+    signed results.
+
+    Usage:
+        memo = MemoizedCalculator(maxsize=100000)
+        memo.add("1.5", "2.5")
+        memo.stats()
+    """
+
+    def __init__(self, maxsize: int = 65536, parse_maxsize: Optional[int] = None):
+        if maxsize < 1 or (parse_maxsize is not None and parse_maxsize < 1):
+            raise CalculatorError("maxsize must be a positive integer")
+        self._parse = lru_cache(maxsize=parse_maxsize or maxsize)(self._convert)
+        self._results = lru_cache(maxsize=maxsize, typed=True)(self._compute)
+
+    @staticmethod
+    def _convert(value: str):
+        try:
+            return validate_numeric_input(value, 'value')
+        except CalculatorError:
+            return _INVALID_NUMBER
+
+    def parse(self, value, param_name: str) -> Union[int, float]:
+        """validate_numeric_input() with string conversions served from the cache"""
+        if not isinstance(value, str):
+            return validate_numeric_input(value, param_name)
+        number = self._parse(value)
+        if number is _INVALID_NUMBER:
+            raise CalculatorError(f"Parameter '{param_name}' must be numeric, got '{value}'")
+        return number
+
+    def _compute(self, name: str, *args):
+        func = _MEMOIZED_OPERATIONS[name]
+        params = ('a', 'b') if len(args) == 2 else ('n',)
+        try:
+            return func(*(self.parse(value, param) for value, param in zip(args, params)))
+        except CalculatorError as e:
+            return _CachedError(str(e))
+
+    def _call(self, name: str, *args):
+        for arg in args:
+            if arg.__class__ is float and arg == 0:
+                return _MEMOIZED_OPERATIONS[name](*args)
+        try:
+            result = self._results(name, *args)
+        except TypeError:
+            return _MEMOIZED_OPERATIONS[name](*args)  # unhashable argument
+        if result.__class__ is _CachedError:
+            raise CalculatorError(result.message)
+        return result
+
+    def add(self, a, b) -> Union[int, float]:
+        return self._call('add', a, b)
+
+    def subtract(self, a, b) -> Union[int, float]:
+        return self._call('subtract', a, b)
+
+    def multiply(self, a, b) -> Union[int, float]:
+        return self._call('multiply', a, b)
+
+    def divide(self, a, b) -> float:
+        return self._call('divide', a, b)
+
+    def factorial(self, n) -> int:
+        return self._call('factorial', n)
+
+    def stats(self) -> dict:
+        """Hits, misses, size and hit rate of the result and parsing caches"""
+        return {'results': _cache_stats(self._results), 'parsed': _cache_stats(self._parse)}
+
+    def clear(self) -> None:
+        self._results.cache_clear()
+        self._parse.cache_clear()
 
 
 # ==========================================
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Lazy Expression Graphs for Calculator Operations
+================================================
+
+Calculator operations applied to ``lazy(data)`` build a small DAG instead of
+running immediately. ``compute()`` then:
+
+1. Deduplicates shared subexpressions: nodes are identified structurally,
+   so two separately built ``process_data(x)`` nodes are evaluated once.
+2. Fuses element-wise stages (``process_data``) into the reductions that
+   consume them (``calculate_average``, ``find_maximum``) and runs every
+   consumer of a data source in a single chunked pass, validating each input
+   item only once.
+
+Results match eager execution: integer sums are accumulated per chunk, while
+averages over float data keep their values from the first float on and sum
+them in one call, as ``sum()`` is order- and version-sensitive for floats.
+If the fused pass meets anything the eager functions would reject (a
+non-list source, a non-numeric item, an empty reduction, an invalid
+``handle_zeros``), the graph is re-evaluated eagerly so the same
+CalculatorError is raised.
+
+Usage:
+    x = lazy(data)
+    doubled = process_data(x)
+    avg, peak = compute(calculate_average(doubled), find_maximum(doubled))
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import calculator_fixed as eager
+from calculator_fixed import CalculatorError, validate_numeric_input
+
+LAZY_CHUNK_SIZE = 4096
+
+STREAM_OPS = ('source', 'process_data')
+REDUCTION_OPS = ('calculate_average', 'find_maximum')
+SCALAR_OPS = ('const', 'add', 'subtract', 'multiply', 'divide')
+
+
+class LazyNode:
+    """One operation in a lazy expression graph"""
+
+    __slots__ = ('op', 'inputs', 'params', '_key')
+
+    def __init__(self, op: str, inputs: Tuple["LazyNode", ...] = (), params: tuple = ()):
+        self.op = op
+        self.inputs = inputs
+        self.params = params
+        self._key = None
+
+    @property
+    def key(self) -> tuple:
+        """Structural identity used for common-subexpression elimination"""
+        if self._key is None:
+            if self.op == 'source':
+                params = (id(self.params[0]),)
+            elif self.op == 'const':
+                params = (type(self.params[0]).__name__, repr(self.params[0]))
+            else:
+                params = self.params
+            self._key = (self.op, params, tuple(node.key for node in self.inputs))
+        return self._key
+
+    @property
+    def is_stream(self) -> bool:
+        return self.op in STREAM_OPS
+
+    def compute(self, chunk_size: int = LAZY_CHUNK_SIZE) -> Any:
+        """Evaluate this node"""
+        return compute(self, chunk_size=chunk_size)[0]
+
+    def __repr__(self) -> str:
+        if self.op == 'source':
+            return f"lazy(<{type(self.params[0]).__name__}>)"
+        if self.op == 'const':
+            return repr(self.params[0])
+        args = [repr(node) for node in self.inputs] + [repr(p) for p in self.params]
+        return f"{self.op}({', '.join(args)})"
+
+
+def lazy(data) -> LazyNode:
+    """Wrap input data as the source of a lazy expression"""
+    return LazyNode('source', params=(data,))
+
+
+def _stream(value, op: str) -> LazyNode:
+    if not isinstance(value, LazyNode):
+        return lazy(value)
+    if not value.is_stream:
+        raise CalculatorError(f"{op}() expects a sequence, got scalar expression {value!r}")
+    return value
+
+
+def _scalar(value, op: str) -> LazyNode:
+    if not isinstance(value, LazyNode):
+        return LazyNode('const', params=(value,))
+    if value.is_stream:
+        raise CalculatorError(f"{op}() expects a scalar, got sequence expression {value!r}")
+    return value
+
+
+def process_data(data, handle_zeros: str = 'include') -> LazyNode:
+    return LazyNode('process_data', (_stream(data, 'process_data'),), (handle_zeros,))
+
+
+def calculate_average(numbers) -> LazyNode:
+    return LazyNode('calculate_average', (_stream(numbers, 'calculate_average'),))
+
+
+def find_maximum(numbers) -> LazyNode:
+    return LazyNode('find_maximum', (_stream(numbers, 'find_maximum'),))
+
+
+def add(a, b) -> LazyNode:
+    return LazyNode('add', (_scalar(a, 'add'), _scalar(b, 'add')))
+
+
+def subtract(a, b) -> LazyNode:
+    return LazyNode('subtract', (_scalar(a, 'subtract'), _scalar(b, 'subtract')))
+
+
+def multiply(a, b) -> LazyNode:
+    return LazyNode('multiply', (_scalar(a, 'multiply'), _scalar(b, 'multiply')))
+
+
+def divide(a, b) -> LazyNode:
+    return LazyNode('divide', (_scalar(a, 'divide'), _scalar(b, 'divide')))
+
+
+class _Fallback(Exception):
+    """Raised inside the fused pass when eager semantics must decide the outcome"""
+
+
+def _collect(outputs: Tuple[LazyNode, ...]) -> Tuple[Dict[tuple, LazyNode], List[tuple]]:
+    """Deduplicate the graph and return (key -> node, keys in topological order)"""
+    nodes: Dict[tuple, LazyNode] = {}
+    order: List[tuple] = []
+
+    def visit(node: LazyNode):
+        key = node.key
+        if key in nodes:
+            return
+        for child in node.inputs:
+            visit(child)
+        nodes[key] = node
+        order.append(key)
+
+    for node in outputs:
+        visit(node)
+    return nodes, order
+
+
+def plan(*outputs: LazyNode) -> Dict[str, int]:
+    """Describe how compute() would run the graph (unique nodes and data passes)"""
+    nodes, order = _collect(outputs)
+    return {
+        'nodes': len(order),
+        'passes': sum(1 for key in order if nodes[key].op == 'source'),
+        'fused_reductions': sum(1 for key in order if nodes[key].op in REDUCTION_OPS),
+    }
+
+
+def _transform(values: list, handle_zeros: str) -> list:
+    """process_data() over an already validated chunk"""
+    if handle_zeros == 'drop':
+        return [x * 2 if x > 0 else abs(x) for x in values if x > 0 or x < 0]
+    return [x * 2 if x > 0 else (abs(x) if x < 0 else 0) for x in values]
+
+
+def _fused_pass(source: LazyNode, nodes: Dict[tuple, LazyNode], order: List[tuple],
+                wanted: set, chunk_size: int) -> Dict[tuple, Any]:
+    """Run every stream stage and reduction fed by one source in a single chunked pass"""
+    data = source.params[0]
+    if not isinstance(data, list):
+        raise _Fallback()
+
+    source_key = source.key
+    stages, reducers = [], []
+    fed = {source_key}
+    for key in order:
+        node = nodes[key]
+        if not node.inputs or node.inputs[0].key not in fed:
+            continue
+        if node.op == 'process_data':
+            if node.params[0] not in ('include', 'drop', 'double') and data:
+                raise _Fallback()
+            stages.append(key)
+            fed.add(key)
+        elif node.op in REDUCTION_OPS:
+            reducers.append(key)
+
+    materialized = {key: [] for key in stages if key in wanted}
+    totals = {key: 0 for key in reducers}
+    tails = {key: None for key in reducers}
+    counts = {key: 0 for key in reducers}
+    maxima = {key: None for key in reducers}
+
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        try:
+            values = {source_key: [validate_numeric_input(v, 'value') for v in chunk]}
+        except CalculatorError:
+            raise _Fallback()
+        for key in stages:
+            node = nodes[key]
+            values[key] = _transform(values[node.inputs[0].key], node.params[0])
+        for key, out in materialized.items():
+            out.extend(values[key])
+        for key in reducers:
+            chunk_values = values[nodes[key].inputs[0].key]
+            if not chunk_values:
+                continue
+            if nodes[key].op == 'calculate_average':
+                # Integer totals are exact whatever the chunking. Float summation is
+                # order- and version-dependent (sum() compensates within one call on
+                # 3.12+), so from the first non-int on the values are kept and added
+                # by a single sum() at the end, exactly as eager calculate_average() does.
+                if tails[key] is not None:
+                    tails[key].extend(chunk_values)
+                elif all(type(v) is int for v in chunk_values):
+                    totals[key] += sum(chunk_values)
+                else:
+                    tails[key] = list(chunk_values)
+                counts[key] += len(chunk_values)
+            else:
+                chunk_max = max(chunk_values)
+                if maxima[key] is None or chunk_max > maxima[key]:
+                    maxima[key] = chunk_max
+
+    results: Dict[tuple, Any] = {source_key: data}
+    results.update(materialized)
+    for key in reducers:
+        if nodes[key].op == 'calculate_average':
+            if counts[key] == 0:
+                raise _Fallback()
+            total = totals[key] if tails[key] is None else sum(tails[key], totals[key])
+            results[key] = total / counts[key]
+        else:
+            if maxima[key] is None:
+                raise _Fallback()
+            results[key] = maxima[key]
+    return results
+
+
+def _evaluate_eager(nodes: Dict[tuple, LazyNode], order: List[tuple]) -> Dict[tuple, Any]:
+    """Evaluate the deduplicated graph with the eager calculator functions"""
+    results: Dict[tuple, Any] = {}
+    for key in order:
+        node = nodes[key]
+        args = [results[child.key] for child in node.inputs]
+        if node.op in ('source', 'const'):
+            results[key] = node.params[0]
+        else:
+            results[key] = getattr(eager, node.op)(*args, *node.params)
+    return results
+
+
+def compute(*outputs: LazyNode, chunk_size: int = LAZY_CHUNK_SIZE) -> tuple:
+    """
+    Evaluate one or more lazy expressions together
+
+    Shared subexpressions are evaluated once and every source is scanned
+    once, however many reductions consume it.
+
+    Args:
+        *outputs: Nodes to evaluate
+        chunk_size: Items validated and transformed per step of the fused pass
+
+    Returns:
+        Tuple of results in the order of outputs
+
+    Raises:
+        CalculatorError: Exactly as the equivalent eager calls would
+    """
+    if chunk_size < 1:
+        raise CalculatorError("chunk_size must be a positive integer")
+    nodes, order = _collect(outputs)
+    wanted = {node.key for node in outputs}
+    try:
+        results: Dict[tuple, Any] = {}
+        for key in order:
+            if nodes[key].op == 'source':
+                results.update(_fused_pass(nodes[key], nodes, order, wanted, chunk_size))
+        for key in order:
+            node = nodes[key]
+            if node.op == 'const':
+                results[key] = node.params[0]
+            elif node.op in SCALAR_OPS:
+                results[key] = getattr(eager, node.op)(*(results[child.key] for child in node.inputs))
+    except _Fallback:
+        results = _evaluate_eager(nodes, order)
+    return tuple(results[node.key] for node in outputs)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Out-of-core process_data
+========================
+
+Runs process_data() over inputs larger than memory. Input is read in
+fixed-size chunks from a text file (one value per line) or any iterable,
+each chunk is validated and transformed, and the results are appended to a
+binary output file of native float64 values that can be memory-mapped
+afterwards. Memory use is bounded by the chunk size.
+
+After every chunk the output is flushed to disk and a small checkpoint file
+(``<output>.ckpt``) records how many input items have been consumed and how
+many values written, together with the settings and a SHA-256 fingerprint of
+the consumed input. Re-running the same job resumes from the last
+checkpoint, discarding any partially written tail; a checkpoint written for
+different input or settings is refused rather than silently reused.
+
+Results are stored as float64, so integer results must fit in 53 bits to be
+exact; larger ones raise CalculatorError instead of being rounded.
+
+Usage:
+    result = process_data_to_file("readings.txt", "processed.f64", handle_zeros='drop')
+    values = load_results("processed.f64")     # memory-mapped, float64
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Union
+
+from calculator_fixed import CalculatorError, validate_numeric_input
+
+OOC_CHUNK_SIZE = 65536
+ITEM_SIZE = array('d').itemsize
+_MISSING = object()
+
+
+class OutOfCoreResult(NamedTuple):
+    """Summary of an out-of-core run"""
+    items_read: int
+    values_written: int
+    chunks: int
+    resumed: bool
+
+
+def _checkpoint_path(output_path: str) -> str:
+    return output_path + '.ckpt'
+
+
+def _read_checkpoint(output_path: str):
+    try:
+        with open(_checkpoint_path(output_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(output_path: str, state: dict) -> None:
+    """Atomically replace the checkpoint file"""
+    path = _checkpoint_path(output_path)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _iter_source(source: Union[str, Iterable]) -> Iterator:
+    """Yield input items from a text file path or an iterable"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+    else:
+        yield from source
+
+
+def _fingerprint_chunk(hasher, chunk: list) -> None:
+    """Feed items to the input fingerprint; the digest does not depend on chunking"""
+    hasher.update(''.join(f"{item}\n" for item in chunk).encode('utf-8', 'surrogatepass'))
+
+
+def _process_chunk(chunk: list, offset: int, handle_zeros: str) -> array:
+    """process_data() over one chunk, reporting errors by global index"""
+    out = array('d')
+    for i, item in enumerate(chunk, offset):
+        try:
+            num = validate_numeric_input(item, f"data_list[{i}]")
+        except CalculatorError as e:
+            raise CalculatorError(f"Error processing item at index {i}: {str(e)}")
+        if num > 0:
+            num = num * 2
+        elif num < 0:
+            num = abs(num)
+        elif handle_zeros == 'drop':
+            continue
+        else:
+            num = 0  # zeros, -0.0 and NaN all become 0, as in process_data()
+        if type(num) is int and num > 2**53:
+            raise CalculatorError(f"Error processing item at index {i}: result {num} "
+                                  f"cannot be stored exactly as float64")
+        out.append(num)
+    return out
+
+
+def process_data_to_file(source: Union[str, Iterable], output_path: str,
+                         handle_zeros: str = 'include', chunk_size: int = OOC_CHUNK_SIZE,
+                         resume: bool = True) -> OutOfCoreResult:
+    """
+    Run process_data() chunk by chunk and append the results to a binary file
+
+    Args:
+        source: Path to a text file with one value per line, or an iterable of values
+        output_path: Binary output file (native float64 values)
+        handle_zeros: How to handle zeros ('include', 'drop', 'double')
+        chunk_size: Number of input items held in memory at a time
+        resume: Continue from an existing checkpoint instead of starting over.
+            The already consumed part of source is re-read to check it against
+            the checkpoint's fingerprint (for a completed job, all of it).
+
+    Returns:
+        OutOfCoreResult with totals for the whole job
+
+    Raises:
+        CalculatorError: If parameters are invalid, an item is not numeric, an
+            integer result exceeds 2**53, or the checkpoint was written for
+            different input or settings (pass resume=False to start over)
+
+    Space Complexity: O(chunk_size)
+    """
+    if handle_zeros not in ['include', 'drop', 'double']:
+        raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+    if chunk_size < 1:
+        raise CalculatorError("chunk_size must be a positive integer")
+
+    state = _read_checkpoint(output_path) if resume else None
+    if state is not None:
+        for setting, value in (('handle_zeros', handle_zeros), ('chunk_size', chunk_size)):
+            if state.get(setting) != value:
+                raise CalculatorError(f"Checkpoint was written with {setting}={state.get(setting)!r}; "
+                                      f"pass resume=False to start over")
+    if state is None:
+        state = {'items_read': 0, 'values_written': 0, 'chunks': 0, 'handle_zeros': handle_zeros,
+                 'chunk_size': chunk_size, 'fingerprint': hashlib.sha256().hexdigest(), 'complete': False}
+    resumed = state['items_read'] > 0 or state['complete']
+
+    items = _iter_source(source)
+    hasher = hashlib.sha256()
+    # Re-read the input already accounted for by the checkpoint and make sure it is the same
+    remaining = state['items_read']
+    while remaining:
+        consumed = list(islice(items, min(remaining, chunk_size)))
+        if not consumed:
+            break
+        _fingerprint_chunk(hasher, consumed)
+        remaining -= len(consumed)
+    if state['complete'] and next(items, _MISSING) is not _MISSING:
+        remaining = -1
+    if remaining or hasher.hexdigest() != state['fingerprint']:
+        raise CalculatorError(f"Checkpoint for {output_path} was written for different input; "
+                              f"pass resume=False to start over")
+    if state['complete']:
+        return OutOfCoreResult(state['items_read'], state['values_written'], state['chunks'], True)
+
+    mode = 'r+b' if resumed and os.path.exists(output_path) else 'wb'
+    with open(output_path, mode) as out:
+        # Drop anything written after the last checkpoint
+        out.truncate(state['values_written'] * ITEM_SIZE)
+        out.seek(0, os.SEEK_END)
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if not chunk:
+                break
+            processed = _process_chunk(chunk, state['items_read'], handle_zeros)
+            _fingerprint_chunk(hasher, chunk)
+            processed.tofile(out)
+            out.flush()
+            os.fsync(out.fileno())
+            state['items_read'] += len(chunk)
+            state['values_written'] += len(processed)
+            state['chunks'] += 1
+            state['fingerprint'] = hasher.hexdigest()
+            _write_checkpoint(output_path, state)
+
+    state['complete'] = True
+    _write_checkpoint(output_path, state)
+    return OutOfCoreResult(state['items_read'], state['values_written'], state['chunks'], resumed)
+
+
+def load_results(output_path: str) -> memoryview:
+    """
+    Memory-map an output file as a read-only float64 view
+
+    Returns:
+        memoryview of format 'd'; pages are loaded on access
+    """
+    size = os.path.getsize(output_path)
+    if size == 0:
+        return memoryview(b'').cast('d')
+    with open(output_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast('d')
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Asyncio Streaming Pipeline with Bounded Queues
+==============================================
+
+Chains stages such as parse -> validate -> process_data -> running aggregate
+over a stream that never has to fit in memory. Each stage is a coroutine
+that takes chunks from a bounded ``asyncio.Queue`` and puts its output on
+the next one, so a slow stage makes the stages before it wait (backpressure)
+instead of letting buffers grow. Stages marked ``offload=True`` run their
+function in an executor, which keeps the event loop free for socket and
+file I/O while CPU-heavy chunks are processed.
+
+Data moves in chunks (lists of values, or bytes blocks before parsing) so
+queue and scheduling overhead is paid per chunk, not per value. Per-stage
+metrics record chunks and items in and out, busy time, throughput and the
+depth of each stage's input queue.
+
+Usage:
+    aggregate = RunningAggregate()
+    pipeline = (Pipeline(queue_size=8)
+                .add_stage("parse", parse_numbers, offload=True)
+                .add_stage("validate", validate_values(), offload=True)
+                .add_stage("process", process_values('drop'), offload=True)
+                .add_stage("aggregate", aggregate.update))
+    await pipeline.run(read_chunks("readings.txt"))
+    aggregate.summary(), pipeline.report()
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import AsyncIterator, Callable, Iterable, List, NamedTuple, Optional, Union
+
+import calculator_fixed
+from calculator_fixed import (
+    EMPTY_MOMENTS, CalculatorError, Moments, Summary, chunk_moments, merge_moments,
+    summary_from_moments, validate_numeric_input
+)
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_CHUNK_BYTES = 1 << 20
+_END = object()
+
+
+class StageMetrics(NamedTuple):
+    """
+    Counters for one stage
+
+    items_in is len() of each input chunk, so it counts bytes for a stage fed
+    raw blocks; throughput is items_in per second of pipeline wall time and
+    queue_max/queue_mean describe the stage's input queue.
+    """
+    name: str
+    chunks: int
+    items_in: int
+    items_out: int
+    busy_s: float
+    throughput: float
+    queue_max: int
+    queue_mean: float
+
+
+class _Stage:
+    __slots__ = ('name', 'func', 'offload', 'chunks', 'items_in', 'items_out',
+                 'busy', 'depth_max', 'depth_total', 'depth_samples')
+
+    def __init__(self, name: str, func: Callable, offload: bool):
+        self.name = name
+        self.func = func
+        self.offload = offload
+        self.chunks = self.items_in = self.items_out = 0
+        self.busy = 0.0
+        self.depth_max = self.depth_total = self.depth_samples = 0
+
+    def record_depth(self, depth: int) -> None:
+        self.depth_total += depth
+        self.depth_samples += 1
+        if depth > self.depth_max:
+            self.depth_max = depth
+
+
+class Pipeline:
+    """
+    Linear chain of stages connected by bounded queues
+
+    A stage function takes one chunk and returns the chunk for the next
+    stage; the last stage's return values are discarded, so it is normally a
+    sink such as RunningAggregate.update. A CalculatorError (or any other
+    exception) in a stage cancels the whole pipeline and is re-raised by run().
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, executor: Optional[Executor] = None):
+        if queue_size < 1:
+            raise CalculatorError("queue_size must be a positive integer")
+        self.queue_size = queue_size
+        self.executor = executor
+        self._stages: List[_Stage] = []
+        self._start: Optional[float] = None
+        self._end: Optional[float] = None
+
+    def add_stage(self, name: str, func: Callable, offload: bool = False) -> "Pipeline":
+        """Append a stage; offload=True runs func in the executor (default: the loop's thread pool)"""
+        if any(stage.name == name for stage in self._stages):
+            raise CalculatorError(f"Stage name '{name}' is already used")
+        self._stages.append(_Stage(name, func, offload))
+        return self
+
+    async def _put(self, queue: asyncio.Queue, chunk, stage: _Stage) -> None:
+        await queue.put(chunk)
+        stage.record_depth(queue.qsize())
+
+    async def _feed(self, source, queue: asyncio.Queue) -> None:
+        first = self._stages[0]
+        if hasattr(source, '__aiter__'):
+            async for chunk in source:
+                await self._put(queue, chunk, first)
+        else:
+            for chunk in source:
+                await self._put(queue, chunk, first)
+        await queue.put(_END)
+
+    async def _run_stage(self, index: int, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]) -> None:
+        stage = self._stages[index]
+        following = self._stages[index + 1] if outbox is not None else None
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await inbox.get()
+            if chunk is _END:
+                if outbox is not None:
+                    await outbox.put(_END)
+                return
+            started = time.perf_counter()
+            if stage.offload:
+                result = await loop.run_in_executor(self.executor, stage.func, chunk)
+            else:
+                result = stage.func(chunk)
+            stage.busy += time.perf_counter() - started
+            stage.chunks += 1
+            stage.items_in += len(chunk)
+            if result is not None:
+                stage.items_out += len(result)
+                if outbox is not None:
+                    await self._put(outbox, result, following)
+
+    async def run(self, source: Union[Iterable, AsyncIterator]) -> List[StageMetrics]:
+        """
+        Stream every chunk from source through the stages
+
+        Args:
+            source: Iterable or async iterable of chunks
+
+        Returns:
+            Final metrics for each stage
+
+        Raises:
+            CalculatorError: If there are no stages, or as raised by a stage
+        """
+        if not self._stages:
+            raise CalculatorError("Pipeline has no stages")
+        queues = [asyncio.Queue(self.queue_size) for _ in self._stages]
+        self._start, self._end = time.perf_counter(), None
+        tasks = [asyncio.ensure_future(self._feed(source, queues[0]))]
+        for index in range(len(self._stages)):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            tasks.append(asyncio.ensure_future(self._run_stage(index, queues[index], outbox)))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self._end = time.perf_counter()
+        return self.metrics()
+
+    def metrics(self) -> List[StageMetrics]:
+        """Current metrics; may be called while the pipeline runs"""
+        if self._start is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._end or time.perf_counter()) - self._start
+        return [StageMetrics(stage.name, stage.chunks, stage.items_in, stage.items_out, stage.busy,
+                             stage.items_in / elapsed if elapsed else 0.0, stage.depth_max,
+                             stage.depth_total / stage.depth_samples if stage.depth_samples else 0.0)
+                for stage in self._stages]
+
+    def report(self) -> str:
+        """Metrics as a printable table"""
+        lines = [f"{'Stage':<12} {'Chunks':>8} {'Items in':>14} {'Items out':>14} {'Busy':>9} "
+                 f"{'In/s':>14} {'Queue max':>10} {'Queue avg':>10}"]
+        for m in self.metrics():
+            lines.append(f"{m.name:<12} {m.chunks:>8,} {m.items_in:>14,} {m.items_out:>14,} "
+                         f"{m.busy_s:>8.2f}s {m.throughput:>14,.0f} {m.queue_max:>10} {m.queue_mean:>10.2f}")
+        return "\n".join(lines)
+
+
+# ==========================================
+# SOURCES
+# ==========================================
+
+async def read_chunks(path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Read a text file in blocks that end on line boundaries; reads run in the default executor"""
+    loop = asyncio.get_running_loop()
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            block = await loop.run_in_executor(None, f.read, chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                tail = block
+                continue
+            tail = block[cut:]
+            yield block[:cut]
+        if tail:
+            yield tail
+
+
+async def stream_chunks(reader: asyncio.StreamReader, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Read a socket stream in blocks that end on whitespace boundaries"""
+    tail = b''
+    while True:
+        block = await reader.read(chunk_bytes)
+        if not block:
+            break
+        block = tail + block
+        cut = max(block.rfind(b'\n'), block.rfind(b' ')) + 1
+        tail = block[cut:]
+        if cut:
+            yield block[:cut]
+    if tail:
+        yield tail
+
+
+# ==========================================
+# STAGES AND SINKS
+# ==========================================
+
+def _parse_token(token: bytes):
+    text = token.decode('utf-8', 'replace')
+    try:
+        return validate_numeric_input(text, 'value')
+    except CalculatorError:
+        return text  # left for the validate stage to report with its index
+
+
+def parse_numbers(block: bytes) -> List[Union[int, float, str]]:
+    """Split a bytes block on whitespace and convert tokens as validate_numeric_input() would"""
+    tokens = block.split()
+    try:
+        return list(map(int, tokens))
+    except ValueError:
+        return [_parse_token(token) for token in tokens]
+
+
+def validate_values(param_name: str = 'values') -> Callable[[list], list]:
+    """
+    Stage validating each chunk, reporting errors by index in the whole stream
+
+    The returned function keeps a running offset, so run it in the event
+    loop or a thread pool (a process pool would not carry the offset over).
+    """
+    offset = 0
+
+    def validate(chunk: list) -> List[Union[int, float]]:
+        nonlocal offset
+        start = offset
+        offset += len(chunk)
+        if set(map(type, chunk)) <= {int, float}:
+            return chunk
+        validated = []
+        for i, value in enumerate(chunk, start):
+            try:
+                validated.append(validate_numeric_input(value, f"{param_name}[{i}]"))
+            except CalculatorError as e:
+                raise CalculatorError(f"Invalid item at index {i} in {param_name}: {str(e)}")
+        return validated
+
+    return validate
+
+
+def process_values(handle_zeros: str = 'include') -> Callable[[list], list]:
+    """Stage running process_data() on each chunk (picklable, so process pools work too)"""
+    if handle_zeros not in ['include', 'drop', 'double']:
+        raise CalculatorError("handle_zeros must be 'include', 'drop', or 'double'")
+    return partial(calculator_fixed.process_data, handle_zeros=handle_zeros)
+
+
+class RunningAggregate:
+    """Sink stage that merges count, sum, mean, min, max and variance chunk by chunk"""
+
+    def __init__(self):
+        self.moments: Moments = EMPTY_MOMENTS
+
+    def update(self, chunk: List[Union[int, float]]) -> None:
+        if chunk:
+            self.moments = merge_moments(self.moments, chunk_moments(chunk))
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def summary(self, ddof: int = 0) -> Summary:
+        if self.count == 0:
+            raise CalculatorError("Parameter 'numbers' cannot be empty")
+        return summary_from_moments(self.moments, ddof)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Call-Trace Recorder and Replay Load Generator
+=============================================
+
+Records a sample of calls to the public calculator functions into a compact
+JSONL trace and replays traces offline, so changes can be benchmarked
+against real traffic instead of synthetic ``list(range(n))`` inputs.
+
+Each trace line holds the offset from the start of recording (``t``, in
+seconds), the function name (``fn``) and encoded arguments (``a``/``k``).
+Scalars are stored verbatim, except integers too long for JSON, which are
+stored by bit length and sign. Lists are stored verbatim when small (and
+``record_values`` is on) or as a shape descriptor (length, element type,
+nested list lengths) that replay turns back into an equivalent input.
+Recording never changes the outcome of a traced call: an event that cannot
+be encoded or written is skipped and counted in ``TraceRecorder.dropped``.
+
+Usage:
+    recorder = TraceRecorder("calls.jsonl", sample_rate=0.01)
+    recorder.install()            # patches calculator_fixed's public functions
+    ...                           # run the service
+    recorder.close()
+
+    python calculator_trace.py calls.jsonl --speed 10
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import calculator_fixed
+from calculator_fixed import CalculatorError
+
+TRACED_FUNCTIONS = [
+    'add', 'subtract', 'multiply', 'divide', 'calculate_average', 'find_maximum',
+    'factorial', 'process_data', 'batch_calculate_average', 'describe',
+]
+
+
+def _dtype(values) -> str:
+    """Name the element type of a flat sequence ('int', 'float', 'str' or 'mixed')"""
+    names = {type(v).__name__ for v in values}
+    if not names:
+        return 'int'
+    return names.pop() if len(names) == 1 else 'mixed'
+
+
+# json cannot write ints above Python's 4300-digit str() limit (about 14000 bits)
+MAX_INLINE_INT_BITS = 4096
+
+
+def _inlinable(value: Any) -> bool:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value.bit_length() <= MAX_INLINE_INT_BITS
+    return value is None or isinstance(value, (bool, float, str))
+
+
+def encode_arg(value: Any, record_values: bool = True, inline_limit: int = 16) -> Dict[str, Any]:
+    """Encode one argument as a JSON-compatible value or shape descriptor"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        if not _inlinable(value):
+            return {'int_bits': value.bit_length(), 'negative': value < 0}
+        return {'v': value}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, (list, tuple)) for item in value):
+            return {'lists': [len(item) for item in value],
+                    'dtype': _dtype(x for item in value for x in item)}
+        if record_values and len(value) <= inline_limit and all(map(_inlinable, value)):
+            return {'v': list(value)}
+        return {'len': len(value), 'dtype': _dtype(value)}
+    return {'type': type(value).__name__}
+
+
+def _synthesize(length: int, dtype: str, rng: random.Random) -> list:
+    """Generate a list of the given length and element type"""
+    values = [rng.randint(-1000, 1000) for _ in range(length)]
+    if dtype == 'float':
+        return [v / 7 for v in values]
+    if dtype == 'str':
+        return [str(v) for v in values]
+    if dtype == 'mixed':
+        return [v if i % 3 == 0 else (str(v) if i % 3 == 1 else v / 7) for i, v in enumerate(values)]
+    return values
+
+
+def decode_arg(spec: Dict[str, Any], rng: random.Random) -> Any:
+    """Rebuild an argument from its encoded form"""
+    if 'v' in spec:
+        return spec['v']
+    if 'int_bits' in spec:
+        bits = spec['int_bits']
+        value = rng.getrandbits(bits) | (1 << (bits - 1))
+        return -value if spec['negative'] else value
+    if 'lists' in spec:
+        return [_synthesize(length, spec['dtype'], rng) for length in spec['lists']]
+    if 'len' in spec:
+        return _synthesize(spec['len'], spec['dtype'], rng)
+    raise CalculatorError(f"Cannot replay argument of type {spec.get('type')!r}")
+
+
+class TraceRecorder:
+    """
+    Sampling recorder for calculator calls
+
+    Writes are serialized with a lock, so wrapped functions can be called
+    from several threads. Only the outermost traced call on a thread is
+    recorded; calls the calculator makes internally (for example
+    batch_calculate_average calling calculate_average) are not.
+
+    Attributes:
+        recorded: Calls written to the trace
+        dropped: Sampled calls that could not be encoded or written
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0, record_values: bool = True,
+                 inline_limit: int = 16, seed: Optional[int] = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise CalculatorError("sample_rate must be between 0 and 1")
+        self.path = path
+        self.sample_rate = sample_rate
+        self.record_values = record_values
+        self.inline_limit = inline_limit
+        self.recorded = 0
+        self.dropped = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._start = time.perf_counter()
+        self._originals: Dict[str, Callable] = {}
+
+    def record(self, name: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        """Write one call to the trace if it is sampled"""
+        if self.sample_rate < 1.0 and self._rng.random() >= self.sample_rate:
+            return
+        entry = {
+            't': round(time.perf_counter() - self._start, 6),
+            'fn': name,
+            'a': [encode_arg(a, self.record_values, self.inline_limit) for a in args],
+        }
+        if kwargs:
+            entry['k'] = {k: encode_arg(v, self.record_values, self.inline_limit) for k, v in kwargs.items()}
+        line = json.dumps(entry, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self.recorded += 1
+
+    def wrap(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """Return a version of func that records its calls"""
+        name = name or func.__name__
+
+        def traced(*args, **kwargs):
+            if getattr(self._local, 'active', False):
+                return func(*args, **kwargs)
+            self._local.active = True
+            try:
+                try:
+                    self.record(name, args, kwargs)
+                except Exception:
+                    # A tracing failure must never change the traced call's outcome
+                    with self._lock:
+                        self.dropped += 1
+                return func(*args, **kwargs)
+            finally:
+                self._local.active = False
+        traced.__name__ = func.__name__
+        traced.__doc__ = func.__doc__
+        traced.__wrapped__ = func
+        return traced
+
+    def install(self, module=calculator_fixed, names: List[str] = TRACED_FUNCTIONS) -> None:
+        """Patch the named module functions so every call goes through the recorder"""
+        for name in names:
+            original = getattr(module, name)
+            self._originals[name] = original
+            setattr(module, name, self.wrap(original, name))
+        self._module = module
+
+    def uninstall(self) -> None:
+        """Restore the functions patched by install()"""
+        for name, original in self._originals.items():
+            setattr(self._module, name, original)
+        self._originals.clear()
+
+    def close(self) -> None:
+        self.uninstall()
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ReplayReport(NamedTuple):
+    """Result of replaying a trace"""
+    calls: int
+    errors: int
+    elapsed_s: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    per_function: Dict[str, int]
+
+
+def load_trace(path: str, seed: int = 0) -> List[tuple]:
+    """Decode a trace into (offset, name, args, kwargs) tuples"""
+    rng = random.Random(seed)
+    calls = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            args = tuple(decode_arg(spec, rng) for spec in entry['a'])
+            kwargs = {k: decode_arg(spec, rng) for k, spec in entry.get('k', {}).items()}
+            calls.append((entry['t'], entry['fn'], args, kwargs))
+    return calls
+
+
+def replay(path: str, speed: Optional[float] = None, module=calculator_fixed,
+           seed: int = 0) -> ReplayReport:
+    """
+    Re-run a trace against module
+
+    Inputs are decoded up front so only the calls themselves are timed.
+
+    Args:
+        path: Trace file written by TraceRecorder
+        speed: Pacing factor relative to the original timestamps
+            (1.0 = original speed, 10.0 = ten times faster, None = as fast as possible)
+        module: Module providing the traced functions
+        seed: Seed for synthesizing inputs from shape descriptors
+
+    Returns:
+        ReplayReport with throughput and latency percentiles
+    """
+    if speed is not None and speed <= 0:
+        raise CalculatorError("speed must be positive")
+    calls = load_trace(path, seed)
+    latencies = []
+    errors = 0
+    per_function: Dict[str, int] = {}
+    start = time.perf_counter()
+    for offset, name, args, kwargs in calls:
+        if speed is not None:
+            delay = offset / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        func = getattr(module, name)
+        call_start = time.perf_counter()
+        try:
+            func(*args, **kwargs)
+        except CalculatorError:
+            errors += 1
+        latencies.append((time.perf_counter() - call_start) * 1000)
+        per_function[name] = per_function.get(name, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    return ReplayReport(len(calls), errors, elapsed, len(calls) / elapsed if elapsed else 0.0,
+                        percentile(0.50), percentile(0.95), percentile(0.99), per_function)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a calculator call trace")
+    parser.add_argument("trace", help="JSONL trace written by TraceRecorder")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="pacing factor vs original timestamps (omit for max speed)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = replay(args.trace, speed=args.speed, seed=args.seed)
+    print(f"Calls:      {report.calls:,} ({report.errors:,} raised CalculatorError)")
+    print(f"Elapsed:    {report.elapsed_s:.3f}s")
+    print(f"Throughput: {report.throughput:,.0f} calls/s")
+    print(f"Latency:    p50 {report.p50_ms:.4f}ms  p95 {report.p95_ms:.4f}ms  p99 {report.p99_ms:.4f}ms")
+    for name, count in sorted(report.per_function.items(), key=lambda item: -item[1]):
+        print(f"  {name:<26} {count:>10,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the micro-batching scheduler
+"""
+
+import asyncio
+import unittest
+
+from calculator_fixed import add, divide, calculate_average, CalculatorError
+import calculator_batching
+from calculator_batching import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test that batched calls behave exactly like unbatched ones"""
+
+    def test_results_match_unbatched_calls(self):
+        """Test each caller gets its own result from a shared batch"""
+        pairs = [(i, "2") for i in range(20)] + [("1.5", 2.5)]
+        lists = [[1, 2, 3], ["4", 5.5]]
+
+        async def run():
+            async with MicroBatcher(max_batch_size=8, max_delay=0.01) as batcher:
+                sums = await asyncio.gather(*(batcher.add(a, b) for a, b in pairs))
+                means = await asyncio.gather(*(batcher.calculate_average(l) for l in lists))
+                return sums, means, batcher.batches_run
+
+        sums, means, batches_run = asyncio.run(run())
+        self.assertEqual(sums, [add(a, b) for a, b in pairs])
+        self.assertEqual(means, [calculate_average(l) for l in lists])
+        self.assertLess(batches_run, len(pairs) + len(lists))
+
+    def test_errors_resolve_individual_futures(self):
+        """Test that a failing request does not affect the rest of its batch"""
+        async def run():
+            batcher = MicroBatcher(max_batch_size=100, max_delay=0.001)
+            return await asyncio.gather(
+                batcher.divide(10, 4), batcher.divide(1, 0), batcher.divide("x", 1),
+                batcher.calculate_average([]), return_exceptions=True)
+
+        ok, zero, bad, empty = asyncio.run(run())
+        self.assertEqual(ok, divide(10, 4))
+        self.assertIsInstance(zero, CalculatorError)
+        self.assertIn("Division by zero", str(zero))
+        self.assertIsInstance(bad, CalculatorError)
+        self.assertIn("cannot be an empty list", str(empty))
+
+    def test_unexpected_errors_do_not_stall_batch(self):
+        """Test that an OverflowError reaches only its own caller"""
+        async def run():
+            batcher = MicroBatcher(max_batch_size=100, max_delay=0.001)
+            return await asyncio.wait_for(asyncio.gather(
+                batcher.divide(10**400, 1), batcher.divide(9, 3), batcher.add(1, 2),
+                batcher.calculate_average([10**400]), batcher.calculate_average([1, 2]),
+                return_exceptions=True), timeout=5)
+
+        huge, ok, total, huge_mean, mean = asyncio.run(run())
+        self.assertIsInstance(huge, OverflowError)
+        self.assertIsInstance(huge_mean, OverflowError)
+        self.assertEqual((ok, total, mean), (divide(9, 3), 3, 1.5))
+
+    def test_failed_batch_gives_each_caller_its_own_error(self):
+        """Test that a kernel failure is chained into a separate exception per caller"""
+        def broken(requests):
+            raise MemoryError("kernel failed")
+
+        async def run():
+            batcher = MicroBatcher(max_batch_size=3, max_delay=0.001)
+            return await asyncio.gather(*(batcher.add(i, 1) for i in range(3)), return_exceptions=True)
+
+        original = calculator_batching.BATCH_KERNELS['add']
+        calculator_batching.BATCH_KERNELS['add'] = broken
+        try:
+            errors = asyncio.run(run())
+        finally:
+            calculator_batching.BATCH_KERNELS['add'] = original
+        self.assertEqual(len({id(e) for e in errors}), 3)
+        for error in errors:
+            self.assertIsInstance(error, CalculatorError)
+            self.assertIsInstance(error.__cause__, MemoryError)
+            self.assertIn("kernel failed", str(error))
+
+    def test_invalid_configuration(self):
+        """Test scheduler parameter validation"""
+        with self.assertRaises(CalculatorError):
+            MicroBatcher(max_batch_size=0)
+        with self.assertRaises(CalculatorError):
+            MicroBatcher(max_delay=-1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent result cache
+"""
+
+import os
+import tempfile
+import unittest
+from array import array
+
+from calculator_fixed import add, factorial, batch_calculate_average, CalculatorError
+from calculator_cache import PersistentCache, make_key, qualified_name
+
+
+class TestPersistentCache(unittest.TestCase):
+    """Test the SQLite-backed cache"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def counted_factorial(self, n):
+        self.calls += 1
+        return factorial(n)
+
+    def test_warm_restart_skips_recomputation(self):
+        """Test that a new cache instance on the same file serves stored results"""
+        with PersistentCache(self.path) as cache:
+            self.assertEqual(cache.call(self.counted_factorial, 500), factorial(500))
+            self.assertEqual(cache.stats()['misses'], 1)
+        with PersistentCache(self.path) as cache:
+            cached = cache.wrap(self.counted_factorial)
+            self.assertEqual(cached(500), factorial(500))
+            self.assertEqual(cached("500"), factorial(500))  # normalized key
+            self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(self.calls, 1)
+
+    def test_key_normalization(self):
+        """Test that equivalent arguments share a key"""
+        self.assertEqual(make_key("f", ([1, "2"],), {}), make_key("f", ((1, 2),), {}))
+        self.assertNotEqual(make_key("f", (1,), {}), make_key("g", (1,), {}))
+        self.assertNotEqual(make_key("f", ([1, 2],), {}), make_key("f", ([1, 3],), {}))
+
+    def test_large_ints_and_dict_keys(self):
+        """Test keys for ints beyond the decimal digit limit and for dicts with mixed key types"""
+        self.assertNotEqual(make_key("f", (10**5000,), {}), make_key("f", (10**5000 + 1,), {}))
+        self.assertNotEqual(make_key("f", (2**70,), {}), make_key("f", (2**70 + 1,), {}))
+        self.assertNotEqual(make_key("f", ({1: 2},), {}), make_key("f", ({"1": 2},), {}))
+        self.assertEqual(make_key("f", ({"a": 1, 2: 3},), {}), make_key("f", ({2: 3, "a": 1},), {}))
+        with PersistentCache(self.path) as cache:
+            self.assertEqual(cache.call(add, 10**5000, 1), 10**5000 + 1)
+            self.assertEqual(cache.call(add, 10**5000, 1), 10**5000 + 1)
+            self.assertEqual(cache.hits, 1)
+
+    def test_functions_keyed_by_qualified_name(self):
+        """Test that lambdas and local functions are never served from each other's entries"""
+        def local_factorial(n):
+            return -n
+
+        with PersistentCache(self.path) as cache:
+            self.assertEqual(cache.call(lambda x: x + 1, 1), 2)
+            self.assertEqual(cache.call(lambda x: x * 100, 1), 100)
+            self.assertEqual(cache.call(local_factorial, 5), -5)
+            self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(qualified_name(factorial), "calculator_fixed.factorial")
+        self.assertIsNone(qualified_name(local_factorial))
+
+    def test_buffers_keyed_by_content(self):
+        """Test that buffers hash their contents and unknown objects skip the cache"""
+        a = array('d', range(5000))
+        b = array('d', range(5000))
+        b[2500] = -1.0
+        self.assertNotEqual(make_key("f", (memoryview(a),), {}), make_key("f", (memoryview(b),), {}))
+        self.assertEqual(make_key("f", (memoryview(a),), {}), make_key("f", (memoryview(array('d', a)),), {}))
+        self.assertIsNone(make_key("f", (object(),), {}))
+        with PersistentCache(self.path) as cache:
+            self.assertEqual(cache.call(lambda x: 42, object()), 42)
+            self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_eviction_and_errors(self):
+        """Test LRU eviction bounds and that failing calls are not cached"""
+        with PersistentCache(self.path, max_entries=3) as cache:
+            for n in range(6):
+                cache.call(factorial, n)
+            self.assertEqual(cache.stats()['entries'], 3)
+            self.assertEqual(cache.call(batch_calculate_average, [[1, 2], [3]]), [1.5, 3.0])
+            with self.assertRaises(CalculatorError):
+                cache.call(factorial, -1)
+            self.assertFalse(cache.get(make_key(qualified_name(factorial), (-1,), {}))[0])
+        with PersistentCache(self.path, max_bytes=1) as cache:
+            cache.call(factorial, 100)
+            self.assertEqual(cache.stats()['entries'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
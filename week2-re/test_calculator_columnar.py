@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar file format
+"""
+
+import os
+import tempfile
+import unittest
+
+from calculator_fixed import calculate_average, find_maximum, process_data, CalculatorError
+from calculator_columnar import write_series, ColumnarFile
+
+
+class TestColumnarFormat(unittest.TestCase):
+    """Test round trips, index-only statistics and streaming"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "series.calc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_all_codecs(self):
+        """Test every codec reproduces the data and the index answers statistics"""
+        ints = [(i * 7919) % 1000 - 500 for i in range(2500)] + [2**62, -2**62]
+        floats = [v / 8 for v in ints[:2500]]
+        for data, dtype, codecs in ((ints, 'q', ('none', 'zlib', 'delta', 'shuffle')),
+                                    (floats, 'd', ('none', 'zlib', 'shuffle'))):
+            for codec in codecs:
+                self.assertEqual(write_series(self.path, data, codec=codec, block_size=300), len(data))
+                with ColumnarFile(self.path) as series:
+                    self.assertEqual(series.dtype, dtype)
+                    self.assertEqual(len(series.blocks), -(-len(data) // 300))
+                    self.assertEqual(series.read_all(), data)
+                    self.assertEqual(series.find_maximum(), find_maximum(data))
+                    self.assertAlmostEqual(series.calculate_average(), calculate_average(data))
+
+    def test_streaming_process_data(self):
+        """Test block-wise process_data matches the in-memory result"""
+        data = [0, 3, -2, 0, 5, -1] * 100
+        write_series(self.path, (str(v) for v in data), block_size=64)
+        with ColumnarFile(self.path) as series:
+            self.assertEqual(series.dtype, 'q')
+            streamed = [v for block in series.process_blocks('drop') for v in block]
+        self.assertEqual(streamed, process_data(data, 'drop'))
+
+    def test_auto_dtype_for_iterables(self):
+        """Test that 'auto' inspects streamed values instead of assuming float64"""
+        big = [2**60 + i for i in range(10)]
+        write_series(self.path, iter(big), block_size=4)
+        with ColumnarFile(self.path) as series:
+            self.assertEqual((series.dtype, series.read_all()), ('q', big))
+        write_series(self.path, (v / 2 for v in range(10)), block_size=4)
+        with ColumnarFile(self.path) as series:
+            self.assertEqual(series.dtype, 'd')
+        for values in ([1.5, 2**60], iter([1.5, 2, 3, 2**60]), iter([1, 2, 3, 4, 0.5])):
+            with self.assertRaises(CalculatorError):
+                write_series(self.path, values, block_size=2)
+        write_series(self.path, iter([0.5, 2**60]), dtype='d')
+
+    def test_corrupt_files(self):
+        """Test that truncated or damaged files raise CalculatorError"""
+        write_series(self.path, list(range(1000)), codec='zlib', block_size=100)
+        with open(self.path, "rb") as f:
+            good = f.read()
+        damaged = [good[:20], good[:-3], good[:5] + b"x" + good[6:], good[:6] + b"\xff" + good[7:],
+                   good[:-16] + (10**6).to_bytes(4, 'little') + good[-12:]]
+        for raw in damaged:
+            with open(self.path, "wb") as f:
+                f.write(raw)
+            with self.assertRaises(CalculatorError):
+                with ColumnarFile(self.path) as series:
+                    series.read_all()
+        with open(self.path, "wb") as f:
+            f.write(good[:40] + b"\x00" * 8 + good[48:])
+        with ColumnarFile(self.path) as series:
+            with self.assertRaises(CalculatorError):
+                series.read_block(0)
+
+    def test_validation(self):
+        """Test invalid inputs and files raise CalculatorError"""
+        with self.assertRaises(CalculatorError):
+            write_series(self.path, [1, "abc"])
+        with self.assertRaises(CalculatorError):
+            write_series(self.path, [1.5], codec='delta')
+        write_series(self.path, [])
+        with ColumnarFile(self.path) as series:
+            with self.assertRaises(CalculatorError):
+                series.calculate_average()
+        with open(self.path, "wb") as f:
+            f.write(b"not a series")
+        with self.assertRaises(CalculatorError):
+            ColumnarFile(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
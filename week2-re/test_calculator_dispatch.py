@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for adaptive backend dispatch
+"""
+
+import os
+import tempfile
+import unittest
+
+import calculator_fixed
+from calculator_fixed import CalculatorError
+from calculator_dispatch import Dispatcher, DISPATCHED_FUNCTIONS, _numpy_exact
+
+
+class TestDispatcher(unittest.TestCase):
+    """Test backend selection, overrides and calibration caching"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmpdir.name, "dispatch.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_selection_by_size_and_override(self):
+        """Test that thresholds pick the backend and results match calculator_fixed"""
+        thresholds = {name: {'process': 50} for name in DISPATCHED_FUNCTIONS}
+        data = [(i * 13) % 17 - 8 for i in range(200)]
+        with Dispatcher(thresholds=thresholds, workers=2) as dispatcher:
+            self.assertEqual(dispatcher.calculate_average(data[:10]), calculator_fixed.calculate_average(data[:10]))
+            self.assertEqual(dispatcher.last_backend, 'python')
+            self.assertEqual(dispatcher.calculate_average(data), calculator_fixed.calculate_average(data))
+            self.assertEqual(dispatcher.last_backend, 'process')
+            self.assertEqual(dispatcher.find_maximum(data), calculator_fixed.find_maximum(data))
+            for handle_zeros in ('include', 'drop'):
+                self.assertEqual(dispatcher.process_data(data, handle_zeros),
+                                 calculator_fixed.process_data(data, handle_zeros))
+            batch = [data[i:i + 5] for i in range(0, 200, 5)]
+            self.assertEqual(dispatcher.batch_calculate_average(batch),
+                             calculator_fixed.batch_calculate_average(batch))
+            self.assertEqual(dispatcher.find_maximum(data, backend='python'), max(data))
+            self.assertEqual(dispatcher.last_backend, 'python')
+            self.assertEqual(dispatcher.calls[('calculate_average', 'process')], 1)
+
+    def test_errors_match_python_backend(self):
+        """Test that failures on another backend raise the reference error"""
+        thresholds = {name: {'process': 1} for name in DISPATCHED_FUNCTIONS}
+        with Dispatcher(thresholds=thresholds, workers=2) as dispatcher:
+            with self.assertRaises(CalculatorError) as context:
+                dispatcher.calculate_average([1, 2, 3, "abc"])
+            self.assertIn("index 3", str(context.exception))
+            with self.assertRaises(CalculatorError):
+                dispatcher.find_maximum([])
+            with self.assertRaises(CalculatorError):
+                dispatcher.find_maximum([1], backend='gpu')
+            for batch in ([[1], 5], [[1, 2], None, [3]], [[1], [], [2]]):
+                with self.assertRaises(CalculatorError) as expected:
+                    calculator_fixed.batch_calculate_average(batch)
+                with self.assertRaises(CalculatorError) as context:
+                    dispatcher.batch_calculate_average(batch)
+                self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_numpy_only_for_exact_inputs(self):
+        """Test that inputs numpy would coerce differently never take the numpy path"""
+        self.assertTrue(_numpy_exact([1, -2, 3]))
+        self.assertTrue(_numpy_exact([1.5, 2.0]))
+        for data in ([1, 2.5], ["1e3", 2], [" 7 "], [2**63, 1], [True, 2]):
+            self.assertFalse(_numpy_exact(data))
+        thresholds = {name: {'numpy': 1} for name in DISPATCHED_FUNCTIONS}
+        dispatcher = Dispatcher(thresholds=thresholds, calibrate=False)
+        for data in (["1e3", "2"], [1, 2.5, 3]):
+            self.assertEqual(dispatcher.choose('find_maximum', data), 'python')
+
+    def test_calibration_is_cached(self):
+        """Test that calibration results are written once and reused"""
+        with Dispatcher(cache_path=self.cache_path, workers=1) as dispatcher:
+            pass
+        self.assertTrue(os.path.exists(self.cache_path))
+        with Dispatcher(cache_path=self.cache_path, calibrate=False) as reloaded:
+            self.assertEqual(reloaded.thresholds, dispatcher.thresholds)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
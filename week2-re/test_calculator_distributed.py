@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scatter-gather execution over TCP workers
+"""
+
+import socket
+import unittest
+
+import calculator_fixed
+from calculator_fixed import CalculatorError
+from calculator_distributed import (
+    Coordinator, decode_lists, decode_values, encode_lists, encode_values,
+    start_local_workers, stop_local_workers
+)
+
+
+def _unused_address():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()
+
+
+class TestEncoding(unittest.TestCase):
+    """Test the compact value encoding"""
+
+    def test_round_trip(self):
+        """Test that values and their types survive encoding"""
+        for values in ([], [1, -2, 3], [1.5, float('inf')], [1, 2.5, "3"], [2**70, 1], [True, 0]):
+            encoded = encode_values(values)
+            self.assertEqual(decode_values(encoded), values)
+            self.assertEqual([type(v) for v in decode_values(encoded)], [type(v) for v in values])
+        self.assertEqual(encode_values([1, 2])[:1], b'q')
+        self.assertEqual(encode_values([1.0, 2.0])[:1], b'd')
+        lists = [[1, 2], [], [0.5, "x"]]
+        self.assertEqual(decode_lists(encode_lists(lists)), lists)
+
+
+class TestCoordinator(unittest.TestCase):
+    """Test scatter-gather results, error parity and retries against local workers"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.workers = start_local_workers(3)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_local_workers(cls.workers)
+
+    def setUp(self):
+        self.data = [(i * 37) % 1001 - 500 for i in range(3000)] + [2.5, "4", "-1.5"]
+
+    def test_results_match_local(self):
+        """Test every distributed function against calculator_fixed"""
+        with Coordinator([w.address for w in self.workers], shard_size=400) as coordinator:
+            ints = self.data[:3000]
+            self.assertEqual(coordinator.calculate_average(ints), calculator_fixed.calculate_average(ints))
+            self.assertAlmostEqual(coordinator.calculate_average(self.data),
+                                   calculator_fixed.calculate_average(self.data))
+            self.assertEqual(coordinator.find_maximum(self.data), calculator_fixed.find_maximum(self.data))
+            summary = coordinator.describe(self.data, ddof=1)
+            expected = calculator_fixed.describe(self.data, ddof=1)
+            self.assertEqual((summary.count, summary.minimum, summary.maximum),
+                             (expected.count, expected.minimum, expected.maximum))
+            self.assertAlmostEqual(summary.variance, expected.variance)
+            for handle_zeros in ('include', 'drop', 'double'):
+                self.assertEqual(coordinator.process_data(self.data, handle_zeros),
+                                 calculator_fixed.process_data(self.data, handle_zeros))
+            batch = [self.data[i:i + 7] for i in range(0, len(self.data), 7)]
+            self.assertEqual(coordinator.batch_calculate_average(batch),
+                             calculator_fixed.batch_calculate_average(batch))
+            self.assertGreaterEqual(coordinator.shards_sent, 8)
+
+    def test_errors_match_local(self):
+        """Test that worker-side validation errors surface as the local message"""
+        bad = self.data[:1000] + ["abc"] + self.data[:1000]
+        with Coordinator([w.address for w in self.workers], shard_size=100) as coordinator:
+            for method, args in ((coordinator.calculate_average, (bad,)),
+                                 (coordinator.find_maximum, (bad,)),
+                                 (coordinator.process_data, (bad, 'drop')),
+                                 (coordinator.calculate_average, ([],)),
+                                 (coordinator.process_data, (self.data, 'bogus')),
+                                 (coordinator.batch_calculate_average, ([[1], []],))):
+                local = getattr(calculator_fixed, method.__name__)
+                with self.assertRaises(CalculatorError) as expected:
+                    local(*args)
+                with self.assertRaises(CalculatorError) as context:
+                    method(*args)
+                self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_unencodable_input_runs_locally(self):
+        """Test that input the wire format cannot carry matches the local result or error"""
+        with Coordinator([w.address for w in self.workers], shard_size=2) as coordinator:
+            for method, args in ((coordinator.batch_calculate_average, ([[1, 2], (3, 4)],)),
+                                 (coordinator.batch_calculate_average, ([[1], 5],)),
+                                 (coordinator.calculate_average, ([1, 2, object()],))):
+                local = getattr(calculator_fixed, method.__name__)
+                with self.assertRaises(CalculatorError) as expected:
+                    local(*args)
+                with self.assertRaises(CalculatorError) as context:
+                    method(*args)
+                self.assertEqual(str(context.exception), str(expected.exception))
+            huge = [10**5000, 1, 2]
+            self.assertEqual(coordinator.find_maximum(huge), 10**5000)
+        with self.assertRaises(CalculatorError):
+            encode_values([1, object()])
+        with self.assertRaises(CalculatorError):
+            encode_lists([[1], (2,)])
+
+    def test_failed_worker_is_retried(self):
+        """Test that shards sent to a dead worker are re-sent to a live one"""
+        addresses = [_unused_address()] + [w.address for w in self.workers]
+        with Coordinator(addresses, shard_size=500) as coordinator:
+            self.assertEqual(coordinator.find_maximum(self.data), calculator_fixed.find_maximum(self.data))
+            self.assertGreater(coordinator.retried, 0)
+
+    def test_worker_fault_is_reported_once(self):
+        """Test that an unexpected worker exception is raised with its cause and not retried"""
+        with Coordinator([w.address for w in self.workers], shard_size=10) as coordinator:
+            with self.assertRaises(CalculatorError) as context:
+                coordinator.describe([10**400, 1])
+            self.assertIn("OverflowError", str(context.exception))
+            self.assertEqual((coordinator.shards_sent, coordinator.retried), (1, 0))
+            self.assertEqual(coordinator.find_maximum([1, 2]), 2)
+
+    def test_all_workers_down(self):
+        """Test that a shard fails after exhausting its retries"""
+        with Coordinator([_unused_address()], retries=1, timeout=2) as coordinator:
+            with self.assertRaises(CalculatorError) as context:
+                coordinator.calculate_average([1, 2, 3])
+            self.assertIn("failed after 2 attempts", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
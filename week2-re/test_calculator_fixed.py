@@ -4,15 +4,27 @@ Unit tests for the fixed calculator module
 Tests all bug fixes and ensures proper functionality
 """
 
+import math
+import threading
 import unittest
+import statistics
 import sys
 import os
+from array import array
+
+import calculator_fixed
 
 # Import the fixed calculator
 from calculator_fixed import (
     add, subtract, multiply, divide, calculate_average, factorial, 
     find_maximum, process_data, CalculatorError, timed_execution,
-    batch_calculate_average
+    batch_calculate_average, describe, Summary, pack_ragged,
+    segmented_stats, batch_describe_ragged, GroupAggregator, group_by,
+    dot, matvec, matmul, SparseVector, fast, ShardedAggregator,
+    parallel_factorial, MemoizedCalculator, ArithmeticSequence, ProcessedSequence,
+    SortedSeries, iter_primes, count_primes, PrimeSieve, factorial_prime_exponent,
+    factorial_prime_exponents, prime_factorial, RangeStats, validate_numeric_list,
+    Moments, EMPTY_MOMENTS, chunk_moments, merge_moments, summary_from_moments
 )
 
 
@@ -115,6 +127,19 @@ class TestFixedCalculatorFunctions(unittest.TestCase):
         result_rec = factorial(10, iterative=False)
         self.assertEqual(result_iter, result_rec)
 
+    def test_parallel_factorial(self):
+        """Test the process-parallel product tree against math.factorial"""
+        self.assertEqual(parallel_factorial(0), 1)
+        self.assertEqual(parallel_factorial("10"), factorial(10))
+        self.assertEqual(parallel_factorial(3000, workers=3, min_n=100), math.factorial(3000))
+        self.assertEqual(parallel_factorial(2500, workers=1), math.factorial(2500))
+        for n in (399, 400, 1000):
+            self.assertEqual(factorial(n), math.factorial(n))
+        with self.assertRaises(CalculatorError):
+            parallel_factorial(-1)
+        with self.assertRaises(CalculatorError):
+            parallel_factorial(10, workers=0)
+
     # ==========================================
     # DATA PROCESSING TESTS
     # ==========================================
@@ -173,6 +198,17 @@ class TestFixedCalculatorFunctions(unittest.TestCase):
         with self.assertRaises(CalculatorError):
             batch_calculate_average([[1, 2, 3], []])
 
+    def test_batch_calculate_average_threaded(self):
+        """Test thread-pool mode matches the sequential path"""
+        lists = [[i, i + 1, i + 2] for i in range(50)] + [array('d', [1.0, 2.0])]
+        expected = batch_calculate_average(lists)
+        self.assertEqual(batch_calculate_average(lists, max_workers=4), expected)
+        self.assertEqual(batch_calculate_average(lists, max_workers=3, chunk_size=7), expected)
+        
+        with self.assertRaises(CalculatorError) as context:
+            batch_calculate_average([[1]] * 10 + [[]] + [["x"]], max_workers=4, chunk_size=2)
+        self.assertIn("list 10", str(context.exception))
+
     # ==========================================
     # INTEGRATION TESTS
     # ==========================================
@@ -252,6 +288,674 @@ class TestPerformanceImprovements(unittest.TestCase):
         self.assertLessEqual(time_iter, time_rec * 2)
 
 
+class TestDescribe(unittest.TestCase):
+    """Test single-pass summary statistics"""
+
+    def test_describe_matches_existing_functions(self):
+        """Test describe() agrees with calculate_average, find_maximum and statistics"""
+        data = [2, 4, 4, 4, 5, 5, 7, 9]
+        summary = describe(data)
+        self.assertIsInstance(summary, Summary)
+        self.assertEqual(summary.count, 8)
+        self.assertEqual(summary.total, 40)
+        self.assertEqual(summary.mean, calculate_average(data))
+        self.assertEqual(summary.maximum, find_maximum(data))
+        self.assertEqual(summary.minimum, 2)
+        self.assertAlmostEqual(summary.variance, statistics.pvariance(data))
+        self.assertAlmostEqual(summary.std_dev, 2.0)
+        self.assertAlmostEqual(describe(data, ddof=1).variance, statistics.variance(data))
+
+    def test_describe_chunked_and_array_paths(self):
+        """Test that chunked iterables and arrays give the same result as lists"""
+        data = [float(i % 97) * 1.5 - 20 for i in range(10000)]
+        expected = describe(data)
+        chunked = describe((x for x in data), chunk_size=7)
+        self.assertEqual(chunked.count, expected.count)
+        self.assertAlmostEqual(chunked.mean, expected.mean)
+        self.assertAlmostEqual(chunked.variance, expected.variance)
+        from_array = describe(array('d', data))
+        self.assertEqual(from_array.maximum, expected.maximum)
+        self.assertAlmostEqual(from_array.variance, expected.variance)
+        self.assertEqual(describe(["1", "2.5"]).total, 3.5)
+
+    def test_describe_mean_across_chunks(self):
+        """Test the mean against calculate_average() when several chunks are merged"""
+        ints = [(i * 7919) % 100003 - 50000 for i in range(20000)]
+        self.assertEqual(describe(ints, chunk_size=4096).mean, calculate_average(ints))
+        floats = [((i * 7919) % 100003) * 20.0 / 100003 - 10.0 for i in range(20000)]
+        self.assertAlmostEqual(describe(floats, chunk_size=4096).mean, calculate_average(floats), places=12)
+
+    def test_moments_api(self):
+        """Test merging per-chunk moments in any grouping against describe()"""
+        data = [(i * 37) % 1001 - 500 for i in range(3000)]
+        parts = [chunk_moments(data[i:i + 700]) for i in range(0, len(data), 700)]
+        self.assertIsInstance(parts[0], Moments)
+        forward = EMPTY_MOMENTS
+        for part in parts:
+            forward = merge_moments(forward, part)
+        backward = EMPTY_MOMENTS
+        for part in reversed(parts):
+            backward = merge_moments(part, tuple(backward))
+        expected = describe(data, ddof=1)
+        for moments in (forward, backward):
+            summary = summary_from_moments(moments, ddof=1)
+            self.assertEqual((summary.count, summary.total, summary.minimum, summary.maximum),
+                             (expected.count, expected.total, expected.minimum, expected.maximum))
+            self.assertAlmostEqual(summary.variance, expected.variance)
+        self.assertEqual(merge_moments(EMPTY_MOMENTS, EMPTY_MOMENTS), EMPTY_MOMENTS)
+        with self.assertRaises(CalculatorError):
+            summary_from_moments(EMPTY_MOMENTS)
+
+    def test_describe_validation(self):
+        """Test describe() error handling"""
+        with self.assertRaises(CalculatorError):
+            describe([])
+        with self.assertRaises(CalculatorError):
+            describe(iter([]))
+        with self.assertRaises(CalculatorError) as context:
+            describe([1, 2, "abc"], chunk_size=2)
+        self.assertIn("index 2", str(context.exception))
+        with self.assertRaises(CalculatorError):
+            describe([5], ddof=1)
+        with self.assertRaises(CalculatorError):
+            describe("123")
+
+
+class TestSegmentedStats(unittest.TestCase):
+    """Test CSR-layout batch reductions"""
+
+    def test_pack_and_reduce(self):
+        """Test per-group results match calculate_average and find_maximum"""
+        lists = [[1, 2, 3], [4.5, "5"], [7]]
+        values, offsets = pack_ragged(lists)
+        self.assertEqual(list(offsets), [0, 3, 5, 6])
+        stats = segmented_stats(values, offsets)
+        self.assertEqual(stats.counts, [3, 2, 1])
+        self.assertEqual(stats.sums, [6, 9.5, 7])
+        self.assertEqual(stats.means, [calculate_average(l) for l in lists])
+        self.assertEqual(stats.maxima, [find_maximum(l) for l in lists])
+        self.assertEqual(batch_describe_ragged(lists), stats)
+        self.assertEqual(segmented_stats([1, 2, 3], [0, 1, 3]).means, [1.0, 2.5])
+
+    def test_exact_values_outside_int64(self):
+        """Test that big integers and mixed groups keep exact sums and maxima"""
+        lists = [[2**63, 1], [3, 0.5, 7]]
+        stats = batch_describe_ragged(lists)
+        self.assertEqual(stats.sums, [2**63 + 1, 10.5])
+        self.assertEqual(stats.maxima, [find_maximum(l) for l in lists])
+        self.assertIs(type(stats.maxima[1]), int)
+        self.assertEqual(stats.means, [calculate_average(l) for l in lists])
+        with self.assertRaises(CalculatorError) as context:
+            batch_describe_ragged([[1], [10**400]])
+        self.assertIn("group 1", str(context.exception))
+
+    def test_empty_group_reported_by_index(self):
+        """Test that empty groups and bad offsets raise with the group index"""
+        with self.assertRaises(CalculatorError) as context:
+            batch_describe_ragged([[1], [2], []])
+        self.assertIn("group 2", str(context.exception))
+        with self.assertRaises(CalculatorError):
+            segmented_stats(array('d', [1.0, 2.0]), [0, 3])
+        with self.assertRaises(CalculatorError) as context:
+            pack_ragged([[1], [2, "x"]])
+        self.assertIn("list 1", str(context.exception))
+
+
+class TestGroupAggregator(unittest.TestCase):
+    """Test keyed group-by aggregation"""
+
+    def test_group_by_matches_per_key_functions(self):
+        """Test per-key results match calculate_average and find_maximum"""
+        readings = {"a": [1, 5, 3], "b": [-2.5, 4], "c": [7]}
+        pairs = [(k, v) for k, vs in readings.items() for v in vs]
+        table = group_by(pairs)
+        self.assertEqual(len(table), 3)
+        for key, values in readings.items():
+            summary = table[key]
+            self.assertEqual(summary.count, len(values))
+            self.assertEqual(summary.total, sum(values))
+            self.assertAlmostEqual(summary.mean, calculate_average(values))
+            self.assertEqual(summary.maximum, find_maximum(values))
+            self.assertEqual(summary.minimum, min(values))
+
+    def test_integer_groups_stay_exact(self):
+        """Test that integer groups keep int totals and extremes and overflow is reported"""
+        table = group_by([('a', 10), ('a', 3), ('b', 2**53 + 1), ('b', 0.5)])
+        self.assertEqual((table['a'].total, table['a'].minimum, table['a'].maximum), (13, 3, 10))
+        self.assertIs(type(table['a'].maximum), int)
+        self.assertEqual(table['b'].maximum, 2**53 + 1)
+        with self.assertRaises(CalculatorError) as context:
+            group_by([('a', 10**400)])
+        self.assertIn("too large", str(context.exception))
+
+    def test_merge_partial_tables(self):
+        """Test merging worker tables equals aggregating everything at once"""
+        keys = [i % 4 for i in range(100)]
+        values = [float(i * 7 % 13) for i in range(100)]
+        whole = GroupAggregator().update_arrays(keys, values)
+        left = GroupAggregator().update_arrays(keys[:37], values[:37])
+        right = GroupAggregator().update_arrays(keys[37:], values[37:])
+        merged = left.merge(right)
+        for key in whole.keys():
+            self.assertEqual(merged[key].count, whole[key].count)
+            self.assertAlmostEqual(merged[key].mean, whole[key].mean)
+            self.assertAlmostEqual(merged[key].variance, whole[key].variance)
+            self.assertEqual(merged[key].maximum, whole[key].maximum)
+
+    def test_group_by_validation(self):
+        """Test group-by error handling"""
+        with self.assertRaises(CalculatorError) as context:
+            group_by([("a", 1), ("b", "abc")])
+        self.assertIn("'b'", str(context.exception))
+        with self.assertRaises(CalculatorError):
+            GroupAggregator().update_arrays([1, 2], [1])
+        with self.assertRaises(CalculatorError):
+            GroupAggregator()["missing"]
+
+
+class TestMatrixKernels(unittest.TestCase):
+    """Test vector and matrix kernels"""
+
+    def naive_matmul(self, a, b):
+        return [[sum(multiply(a[i][k], b[k][j]) for k in range(len(b)))
+                 for j in range(len(b[0]))] for i in range(len(a))]
+
+    def test_dot_and_matvec(self):
+        """Test dot and matrix-vector products against scalar multiply/add"""
+        self.assertEqual(dot([1, 2, 3], ["4", 5, 6]), 32)
+        self.assertAlmostEqual(dot([0.5, 1.5], [2, 2]), 4.0)
+        self.assertEqual(matvec([[1, 2], [3, 4], [5, 6]], [1, -1]), [-1, -1, -1])
+
+    def test_matmul_blocked(self):
+        """Test that tiled matmul matches the naive product for awkward shapes"""
+        a = [[(i * 7 + j * 3) % 11 - 5 for j in range(13)] for i in range(9)]
+        b = [[(i * 5 + j) % 7 - 3 for j in range(10)] for i in range(13)]
+        expected = self.naive_matmul(a, b)
+        self.assertEqual(matmul(a, b), expected)
+        self.assertEqual(matmul(a, b, block_size=4), expected)
+        floats = [[v / 3 for v in row] for row in a]
+        self.assertEqual(matmul(floats, b, block_size=4), matmul(floats, b, block_size=64))
+
+    def test_auto_backend_stays_exact(self):
+        """Test that 'auto' only hands numpy operands it multiplies exactly"""
+        big = [[2**40, 2**40], [1, 2]]
+        self.assertEqual(matmul(big, big, backend='auto'), self.naive_matmul(big, big))
+        self.assertEqual(matvec(big, [2**40, 1], backend='auto'), [2**80 + 2**40, 2**40 + 2])
+        numpy_dtype = calculator_fixed._numpy_dtype
+        packed = calculator_fixed._validate_matrix
+        self.assertEqual(numpy_dtype(packed([[1, 2]], 'a'), packed([[3], [4]], 'b'), 2), 'int64')
+        self.assertIsNone(numpy_dtype(packed(big, 'a'), packed(big, 'b'), 2))
+        self.assertIsNone(numpy_dtype(packed([[2**70]], 'a'), packed([[1]], 'b'), 1))
+        self.assertEqual(numpy_dtype(packed([[0.5, 1.5]], 'a'), packed(big, 'b'), 2), 'float64')
+        self.assertIsNone(numpy_dtype(packed([[1, 2], [0.5, 1.5]], 'a'), packed(big, 'b'), 2))
+
+    def test_shape_and_value_validation(self):
+        """Test that invalid operands raise CalculatorError"""
+        with self.assertRaises(CalculatorError):
+            dot([1, 2], [1])
+        with self.assertRaises(CalculatorError):
+            matmul([[1, 2], [3]], [[1], [2]])
+        with self.assertRaises(CalculatorError):
+            matmul([[1, 2]], [[1, 2]])
+        with self.assertRaises(CalculatorError):
+            matvec([[1, "x"]], [1, 2])
+        with self.assertRaises(CalculatorError):
+            matmul([[1]], [[1]], backend='fortran')
+
+
+class TestSparseVector(unittest.TestCase):
+    """Test sparse input support in the statistical and processing functions"""
+
+    def test_sparse_matches_dense(self):
+        """Test every handle_zeros policy and reduction against the dense path"""
+        for dense in ([0, 0, 3, 0, -2.5, 0, 0, 7, 0], [0, -4, 0, -1, 0], [0, 0, 0]):
+            sparse = SparseVector.from_dense(dense)
+            self.assertEqual(sparse.to_dense(), dense)
+            self.assertEqual(calculate_average(sparse), calculate_average(dense))
+            self.assertEqual(find_maximum(sparse), find_maximum(dense))
+            for handle_zeros in ('include', 'drop', 'double'):
+                result = process_data(sparse, handle_zeros)
+                self.assertIsInstance(result, SparseVector)
+                self.assertEqual(result.to_dense(), process_data(dense, handle_zeros))
+
+    def test_sparse_construction(self):
+        """Test validation and normalization of sparse inputs"""
+        sparse = SparseVector(1000000, [5, 999999], ["2", -1])
+        self.assertEqual(sparse.nnz, 2)
+        self.assertEqual(find_maximum(sparse), 2)
+        self.assertEqual(calculate_average(sparse), 1 / 1000000)
+        self.assertEqual(SparseVector(4, [1, 2], [0, 5]).nnz, 1)
+        with self.assertRaises(CalculatorError):
+            SparseVector(3, [2, 1], [1, 1])
+        with self.assertRaises(CalculatorError):
+            SparseVector(3, [3], [1])
+        with self.assertRaises(CalculatorError):
+            SparseVector(3, [0], ["abc"])
+        with self.assertRaises(CalculatorError):
+            calculate_average(SparseVector(0, [], []))
+        self.assertEqual(process_data(SparseVector(0, [], [])), SparseVector(0, [], []))
+
+    def test_sparse_process_keeps_invariant(self):
+        """Test that NaN, which the dense path maps to 0, is not stored as a non-zero"""
+        sparse = SparseVector(5, [1, 3], [float('nan'), -2])
+        for handle_zeros in ('include', 'double'):
+            result = sparse.process(handle_zeros)
+            self.assertEqual((list(result.indices), result.values), ([3], [2]))
+            self.assertEqual(result.to_dense(), process_data(sparse.to_dense(), handle_zeros))
+        self.assertEqual(sparse.process('drop').to_dense(), [2])
+
+
+class TestFastAPI(unittest.TestCase):
+    """Test the trusted-input fast namespace"""
+
+    def test_fast_matches_validating_functions(self):
+        """Test identical results for valid numeric input"""
+        data = [3, -1.5, 0, 8, -2, 0]
+        self.assertEqual(fast.add(2, 3.5), add(2, 3.5))
+        self.assertEqual(fast.subtract(2, 3), subtract(2, 3))
+        self.assertEqual(fast.multiply(4, 2.5), multiply(4, 2.5))
+        self.assertEqual(fast.divide(7, 2), divide(7, 2))
+        self.assertEqual(fast.calculate_average(data), calculate_average(data))
+        self.assertEqual(fast.find_maximum(data), find_maximum(data))
+        self.assertEqual(fast.factorial(20), factorial(20))
+        self.assertEqual(fast.factorial(5.0), factorial(5.0))
+        for handle_zeros in ('include', 'drop', 'double'):
+            self.assertEqual(fast.process_data(data, handle_zeros), process_data(data, handle_zeros))
+        self.assertEqual(fast.batch_calculate_average([[1, 2], [5]]), batch_calculate_average([[1, 2], [5]]))
+
+    def test_fast_semantic_errors(self):
+        """Test that semantic errors keep their CalculatorError messages"""
+        checks = [
+            lambda f: f.divide(1, 0),
+            lambda f: f.calculate_average([]),
+            lambda f: f.find_maximum([]),
+            lambda f: f.factorial(-1),
+            lambda f: f.factorial(1001),
+            lambda f: f.factorial(2.5),
+            lambda f: f.factorial(float('inf')),
+            lambda f: f.process_data([1], 'bogus'),
+            lambda f: f.batch_calculate_average([[1], []]),
+        ]
+        for check in checks:
+            with self.assertRaises(CalculatorError) as slow_error:
+                check(calculator_fixed)
+            with self.assertRaises(CalculatorError) as fast_error:
+                check(fast)
+            self.assertEqual(str(fast_error.exception), str(slow_error.exception))
+
+
+class TestShardedAggregator(unittest.TestCase):
+    """Test concurrent ingestion into per-thread shards"""
+
+    def test_concurrent_inserts_merge_exactly(self):
+        """Test that values added from many threads all appear in the snapshot"""
+        aggregator = ShardedAggregator()
+        per_thread = [[t * 1000 + i for i in range(500)] for t in range(8)]
+
+        def ingest(values):
+            for value in values[:250]:
+                aggregator.add(value)
+            aggregator.add_many(values[250:])
+
+        threads = [threading.Thread(target=ingest, args=(values,)) for values in per_thread]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        everything = [v for values in per_thread for v in values]
+        summary = aggregator.snapshot()
+        self.assertEqual(summary.count, len(everything))
+        self.assertEqual(summary.total, sum(everything))
+        self.assertAlmostEqual(aggregator.calculate_average(), calculate_average(everything))
+        self.assertEqual(aggregator.find_maximum(), find_maximum(everything))
+        self.assertEqual(summary.minimum, 0)
+        self.assertAlmostEqual(summary.variance, statistics.pvariance(everything))
+
+    def test_sharded_validation(self):
+        """Test error handling"""
+        aggregator = ShardedAggregator()
+        with self.assertRaises(CalculatorError):
+            aggregator.snapshot()
+        with self.assertRaises(CalculatorError):
+            aggregator.add("abc")
+        aggregator.add("2.5")
+        self.assertEqual(aggregator.calculate_average(), 2.5)
+
+    def test_integer_shards_stay_exact(self):
+        """Test that integer totals and extremes are exact and overflow is reported"""
+        aggregator = ShardedAggregator()
+        aggregator.add(2**53 + 1)
+        aggregator.add_many([3, 10])
+        summary = aggregator.snapshot()
+        self.assertEqual((summary.total, summary.minimum, summary.maximum), (2**53 + 14, 3, 2**53 + 1))
+        self.assertIs(type(summary.maximum), int)
+        for call in (lambda: aggregator.add(10**400), lambda: aggregator.add_many([1, 10**400])):
+            with self.assertRaises(CalculatorError) as context:
+                call()
+            self.assertIn("too large", str(context.exception))
+        self.assertEqual(aggregator.snapshot(), summary)
+
+
+class TestMemoization(unittest.TestCase):
+    """Test the bounded memoization layer"""
+
+    def test_memoized_results_and_hit_rate(self):
+        """Test cached results match and repeated calls are hits"""
+        memo = MemoizedCalculator(maxsize=100)
+        for _ in range(3):
+            self.assertEqual(memo.add("1.5", "2.5"), add("1.5", "2.5"))
+            self.assertEqual(memo.divide("10", 4), divide("10", 4))
+        self.assertEqual(memo.factorial("6"), 720)
+        self.assertEqual(memo.subtract("2.5", "1.5"), 1.0)
+        self.assertIsInstance(memo.add(1, 2), int)
+        self.assertIsInstance(memo.add(1.0, 2), float)
+        stats = memo.stats()
+        self.assertEqual(stats['results']['hits'], 4)
+        self.assertEqual(stats['results']['misses'], 6)
+        # "2.5" and "1.5" were already parsed for add()
+        self.assertEqual(stats['parsed']['hits'], 2)
+
+    def test_signed_zero_is_not_conflated(self):
+        """Test that 0.0 and -0.0 operands give correctly signed results"""
+        memo = MemoizedCalculator()
+        self.assertEqual(str(memo.multiply(0.0, 1)), "0.0")
+        self.assertEqual(str(memo.multiply(-0.0, 1)), str(multiply(-0.0, 1)))
+        self.assertEqual(str(memo.add(-0.0, -0.0)), str(add(-0.0, -0.0)))
+        self.assertEqual(str(memo.multiply("-0.0", 1)), str(multiply("-0.0", 1)))
+
+    def test_cached_errors_still_raise(self):
+        """Test that errors are cached but raised as CalculatorError every time"""
+        memo = MemoizedCalculator()
+        for _ in range(2):
+            with self.assertRaises(CalculatorError) as context:
+                memo.divide("1", "0")
+            self.assertEqual(str(context.exception), "Division by zero is not allowed")
+            with self.assertRaises(CalculatorError) as context:
+                memo.add("abc", 1)
+            self.assertEqual(str(context.exception), "Parameter 'a' must be numeric, got 'abc'")
+        with self.assertRaises(CalculatorError) as context:
+            memo.add(1, "abc")
+        self.assertEqual(str(context.exception), "Parameter 'b' must be numeric, got 'abc'")
+        with self.assertRaises(CalculatorError):
+            memo.add([1], 2)
+        self.assertEqual(memo.stats()['results']['hits'], 2)
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entries are evicted"""
+        memo = MemoizedCalculator(maxsize=2)
+        memo.add(1, 1)
+        memo.add(2, 2)
+        memo.add(1, 1)
+        memo.add(3, 3)
+        self.assertEqual(memo.stats()['results']['size'], 2)
+        memo.add(2, 2)
+        self.assertEqual(memo.stats()['results']['hits'], 1)
+        memo.clear()
+        self.assertEqual(memo.stats()['results']['size'], 0)
+
+    def test_thread_safety(self):
+        """Test concurrent callers get correct results"""
+        memo = MemoizedCalculator(maxsize=50)
+        errors = []
+
+        def worker(offset):
+            for i in range(500):
+                a = str((i + offset) % 80)
+                if memo.multiply(a, "3") != int(a) * 3:
+                    errors.append(a)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(memo.stats()['results']['size'], 50)
+
+
+class TestArithmeticSequence(unittest.TestCase):
+    """Test closed-form paths for range and ArithmeticSequence input"""
+
+    def test_range_matches_materialized(self):
+        """Test reductions and process_data against the list path"""
+        for numbers in (range(1, 11), range(-5, 6), range(10, -11, -3), range(7, 8), range(-9, -1, 2)):
+            dense = list(numbers)
+            self.assertEqual(calculate_average(numbers), calculate_average(dense))
+            self.assertEqual(find_maximum(numbers), find_maximum(dense))
+            for handle_zeros in ('include', 'drop', 'double'):
+                view = process_data(numbers, handle_zeros)
+                expected = process_data(dense, handle_zeros)
+                self.assertIsInstance(view, ProcessedSequence)
+                self.assertEqual(view, expected)
+                self.assertEqual(view[-1], expected[-1])
+                self.assertEqual(calculate_average(view), calculate_average(expected))
+                self.assertEqual(find_maximum(view), find_maximum(expected))
+
+    def test_processing_a_view_matches_materialized(self):
+        """Test that process_data() accepts its own ProcessedSequence output"""
+        for numbers in (range(-5, 6), ArithmeticSequence(-1.5, 0.5, 7)):
+            for first in ('include', 'drop', 'double'):
+                for second in ('include', 'drop', 'double'):
+                    view = process_data(process_data(numbers, first), second)
+                    expected = process_data(process_data(list(numbers), first), second)
+                    self.assertIsInstance(view, ProcessedSequence)
+                    self.assertEqual(list(view), expected)
+                    self.assertEqual(calculate_average(view), calculate_average(expected))
+                    self.assertEqual(find_maximum(view), find_maximum(expected))
+        self.assertEqual(process_data(process_data(range(0, 1), 'drop')), [])
+        with self.assertRaises(CalculatorError):
+            process_data(process_data(range(3)), 'bogus')
+
+    def test_float_sequence_matches_materialized(self):
+        """Test that float descriptors reproduce the materialized values exactly"""
+        for start, step, count in ((-1.3, 0.1, 40), (2.5, -0.7, 9), (0.0, 0.25, 5), (4, 0, 3)):
+            sequence = ArithmeticSequence(start, step, count)
+            dense = [start + i * step for i in range(count)]
+            self.assertEqual(list(sequence), dense)
+            self.assertEqual(calculate_average(sequence), calculate_average(dense))
+            self.assertEqual(find_maximum(sequence), find_maximum(dense))
+            for handle_zeros in ('include', 'drop'):
+                view = process_data(sequence, handle_zeros)
+                self.assertEqual(list(view), process_data(dense, handle_zeros))
+                self.assertEqual(find_maximum(view), find_maximum(process_data(dense, handle_zeros)))
+
+    def test_huge_range_is_constant_time(self):
+        """Test that large ranges are answered without materializing"""
+        numbers = range(1, 10**15 + 1)
+        self.assertEqual(calculate_average(numbers), (10**15 + 1) / 2)
+        self.assertEqual(find_maximum(numbers), 10**15)
+        view = process_data(range(-10**12, 10**12), 'drop')
+        self.assertEqual(len(view), 2 * 10**12 - 1)
+        self.assertEqual(find_maximum(view), 2 * (10**12 - 1))
+        self.assertEqual(calculate_average(view), (10**12 * (10**12 + 1) // 2 + (10**12 - 1) * 10**12) / (2 * 10**12 - 1))
+
+    def test_errors_match_list_path(self):
+        """Test empty input and invalid parameters"""
+        with self.assertRaises(CalculatorError) as context:
+            calculate_average(range(0))
+        self.assertEqual(str(context.exception), "Parameter 'numbers' cannot be an empty list")
+        with self.assertRaises(CalculatorError):
+            find_maximum(process_data(range(0, 1), 'drop'))
+        self.assertEqual(process_data(range(0), 'bogus'), [])
+        with self.assertRaises(CalculatorError):
+            process_data(range(3), 'bogus')
+        with self.assertRaises(CalculatorError):
+            ArithmeticSequence(float('inf'), 1, 3)
+        with self.assertRaises(CalculatorError):
+            ArithmeticSequence(0, "abc", 3)
+
+
+class TestSortedSeries(unittest.TestCase):
+    """Test the order-statistic container against a sorted list"""
+
+    def test_matches_sorted_list_under_updates(self):
+        """Test inserts, deletes and queries with tiny blocks to force splits and merges"""
+        import bisect
+        import random
+        rng = random.Random(7)
+        series = SortedSeries(load=4)
+        reference = []
+        for step in range(2000):
+            if rng.random() < 0.6 or not reference:
+                value = rng.choice([rng.randint(-50, 50), rng.uniform(-50, 50)])
+                series.add(value)
+                bisect.insort(reference, value)
+            else:
+                value = rng.choice(reference)
+                series.remove(value)
+                reference.remove(value)
+            if step % 50 == 0 and reference:
+                self.assertEqual(list(series), reference)
+                self.assertEqual(series.maximum(), reference[-1])
+                self.assertEqual(series.minimum(), reference[0])
+                k = rng.randrange(len(reference))
+                self.assertEqual(series[k], reference[k])
+                probe = rng.randint(-60, 60)
+                self.assertEqual(series.rank(probe), bisect.bisect_left(reference, probe))
+                self.assertEqual(series.count(probe), reference.count(probe))
+        self.assertEqual(len(series), len(reference))
+
+    def test_percentile_and_bulk_update(self):
+        """Test percentile interpolation, string conversion and bulk loading"""
+        series = SortedSeries(["3", 1, 2.5, 4])
+        series.update(range(10, 0, -1))
+        values = sorted([3, 1, 2.5, 4] + list(range(1, 11)))
+        self.assertEqual(list(series), values)
+        self.assertEqual(series.percentile(0), 1)
+        self.assertEqual(series.percentile(100), 10)
+        self.assertAlmostEqual(series.percentile(50), statistics.median(values))
+        self.assertEqual(series.select(-1), 10)
+        self.assertIn("2.5", series)
+        self.assertNotIn(11, series)
+
+    def test_validation(self):
+        """Test that invalid values and queries raise CalculatorError"""
+        series = SortedSeries()
+        with self.assertRaises(CalculatorError):
+            series.maximum()
+        with self.assertRaises(CalculatorError):
+            series.add("abc")
+        with self.assertRaises(CalculatorError):
+            series.add(float('nan'))
+        with self.assertRaises(CalculatorError) as context:
+            series.update([1, "x"])
+        self.assertIn("index 1", str(context.exception))
+        series.add(1)
+        with self.assertRaises(CalculatorError):
+            series.remove(2)
+        self.assertFalse(series.discard(2))
+        with self.assertRaises(CalculatorError):
+            series.select(1)
+        with self.assertRaises(CalculatorError):
+            series.percentile(101)
+
+
+class TestPrimeSieve(unittest.TestCase):
+    """Test the segmented sieve and the prime-based factorial"""
+
+    def test_primes_match_trial_division(self):
+        """Test small limits, including segment boundaries"""
+        def trial(limit):
+            return [p for p in range(2, limit + 1) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+
+        for limit in (0, 1, 2, 3, 10, 97, 1000, 10007):
+            expected = trial(limit)
+            self.assertEqual(list(iter_primes(limit)), expected)
+            self.assertEqual(count_primes(limit), len(expected))
+            sieve = PrimeSieve(limit)
+            self.assertEqual(list(sieve), expected)
+            self.assertEqual(sieve.count(), len(expected))
+            self.assertEqual([n for n in range(limit + 1) if n in sieve], expected)
+        self.assertEqual(list(iter_primes(100, start=90)), [97])
+
+    def test_counts_across_segments(self):
+        """Test known prime counts across several segments"""
+        self.assertEqual(count_primes(10**6), 78498)
+        sieve = PrimeSieve(10**6)
+        self.assertEqual(sieve.count(), 78498)
+        self.assertEqual(sieve.nbytes, -(-((10**6 - 1) // 2) // 8))
+        self.assertEqual(list(iter_primes(1000003, start=999980)), [999983, 1000003])
+        self.assertTrue(sieve.is_prime(999983))
+        with self.assertRaises(CalculatorError):
+            sieve.is_prime(10**6 + 1)
+        for limit, start in (("abc", 2), (10.5, 2), (100, "x")):
+            with self.assertRaises(CalculatorError):
+                iter_primes(limit, start)
+
+    def test_prime_factorial(self):
+        """Test Legendre exponents and n! from its factorization"""
+        self.assertEqual(factorial_prime_exponent(100, 2), 97)
+        self.assertEqual(factorial_prime_exponent(100, 5), 24)
+        self.assertEqual(factorial_prime_exponents(10), [(2, 8), (3, 4), (5, 2), (7, 1)])
+        for n in (0, 1, 2, 10, 1000, 6000):
+            self.assertEqual(prime_factorial(n), math.factorial(n))
+        self.assertEqual(parallel_factorial(6000, workers=1), math.factorial(6000))
+        with self.assertRaises(CalculatorError):
+            prime_factorial(-1)
+        with self.assertRaises(CalculatorError):
+            count_primes("abc")
+
+
+class TestRangeStats(unittest.TestCase):
+    """Test O(1) subrange queries against slicing"""
+
+    def test_matches_slicing(self):
+        """Test every subrange of integer, float and mixed series"""
+        import random
+        rng = random.Random(11)
+        series = [
+            [rng.randint(-100, 100) for _ in range(70)],
+            [rng.uniform(-5, 5) for _ in range(33)],
+            [1, 2.0, 2, "3", 3.0, 0, -4],
+        ]
+        for numbers in series:
+            index = RangeStats(numbers)
+            values = validate_numeric_list(numbers, 'numbers')
+            pairs = [(i, j) for i in range(len(values)) for j in range(i + 1, len(values) + 1)]
+            for i, j in pairs:
+                expected_max = find_maximum(values[i:j])
+                self.assertEqual(index.maximum(i, j), expected_max)
+                self.assertIs(type(index.maximum(i, j)), type(expected_max))
+                self.assertAlmostEqual(index.average(i, j), calculate_average(values[i:j]))
+            self.assertEqual(index.maximum_many(pairs), [find_maximum(values[i:j]) for i, j in pairs])
+        ints = series[0]
+        index = RangeStats(ints)
+        pairs = [(i, j) for i in range(0, 70, 3) for j in range(i + 1, 71, 5)]
+        self.assertEqual(index.average_many(pairs), [calculate_average(ints[i:j]) for i, j in pairs])
+        self.assertEqual(index.total(5, 9), sum(ints[5:9]))
+
+    def test_compact_storage_and_errors(self):
+        """Test array storage and range validation"""
+        index = RangeStats(list(range(1000)))
+        self.assertLess(index.nbytes, 8 * 1000 * 12)
+        self.assertEqual(index.average(0, 1000), 499.5)
+        self.assertEqual(RangeStats([2**70, 1]).maximum(0, 2), 2**70)
+        for i, j in ((5, 5), (-1, 3), (0, 1001), (3, 2)):
+            with self.assertRaises(CalculatorError):
+                index.maximum(i, j)
+        with self.assertRaises(CalculatorError):
+            index.average_many([(0, 2), (4, 4)])
+        with self.assertRaises(CalculatorError):
+            RangeStats([])
+
+    def test_index_like_bounds(self):
+        """Test that __index__ bounds are accepted and bools and floats are not"""
+        class Position:
+            def __init__(self, value):
+                self.value = value
+
+            def __index__(self):
+                return self.value
+
+        index = RangeStats([3, 9, 4, 7])
+        self.assertEqual(index.maximum(Position(1), Position(3)), 9)
+        self.assertEqual(index.average_many([(Position(0), 4)]), [5.75])
+        for i, j in ((False, 2), (0, True), (0.0, 2), (0, "2")):
+            with self.assertRaises(CalculatorError):
+                index.average(i, j)
+
+
 def run_fixed_tests():
     """Run all tests for the fixed calculator"""
     print("=" * 60)
@@ -264,6 +968,18 @@ def run_fixed_tests():
     # Add all test cases
     suite.addTest(unittest.makeSuite(TestFixedCalculatorFunctions))
     suite.addTest(unittest.makeSuite(TestPerformanceImprovements))
+    suite.addTest(unittest.makeSuite(TestDescribe))
+    suite.addTest(unittest.makeSuite(TestSegmentedStats))
+    suite.addTest(unittest.makeSuite(TestGroupAggregator))
+    suite.addTest(unittest.makeSuite(TestMatrixKernels))
+    suite.addTest(unittest.makeSuite(TestSparseVector))
+    suite.addTest(unittest.makeSuite(TestFastAPI))
+    suite.addTest(unittest.makeSuite(TestShardedAggregator))
+    suite.addTest(unittest.makeSuite(TestMemoization))
+    suite.addTest(unittest.makeSuite(TestArithmeticSequence))
+    suite.addTest(unittest.makeSuite(TestSortedSeries))
+    suite.addTest(unittest.makeSuite(TestPrimeSieve))
+    suite.addTest(unittest.makeSuite(TestRangeStats))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2, stream=sys.stdout)
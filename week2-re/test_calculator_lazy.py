@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for lazy expression graphs
+"""
+
+import unittest
+
+import calculator_fixed as eager
+from calculator_fixed import CalculatorError
+import calculator_lazy as lz
+
+
+class TestLazyGraphs(unittest.TestCase):
+    """Test that lazy evaluation matches eager execution"""
+
+    def test_fused_results_match_eager(self):
+        """Test shared process_data feeding several reductions"""
+        data = [2, -3, 0, "4", -1.5, 0, 5] * 50
+        for handle_zeros in ('include', 'drop', 'double'):
+            x = lz.lazy(data)
+            processed = lz.process_data(x, handle_zeros)
+            avg, peak, raw_avg, listing = lz.compute(
+                lz.calculate_average(processed), lz.find_maximum(processed),
+                lz.calculate_average(x), processed, chunk_size=16)
+            expected = eager.process_data(data, handle_zeros)
+            self.assertEqual(listing, expected)
+            self.assertEqual(avg, eager.calculate_average(expected))
+            self.assertEqual(peak, eager.find_maximum(expected))
+            self.assertEqual(raw_avg, eager.calculate_average(data))
+
+    def test_float_averages_across_chunks(self):
+        """Test float averages spanning many chunks are bit-identical to eager"""
+        data = [((i * 7919) % 100003 - 50001) * 19.999 + 1e-7 * i for i in range(10000)]
+        mixed = list(range(5000)) + data
+        for values in (data, mixed):
+            x = lz.lazy(values)
+            avg, processed_avg = lz.compute(lz.calculate_average(x),
+                                            lz.calculate_average(lz.process_data(x)), chunk_size=512)
+            self.assertEqual(avg, eager.calculate_average(values))
+            self.assertEqual(processed_avg, eager.calculate_average(eager.process_data(values)))
+
+    def test_common_subexpressions_are_shared(self):
+        """Test that structurally equal nodes are deduplicated into one pass"""
+        data = list(range(-10, 10))
+        ratio = lz.divide(lz.calculate_average(lz.process_data(data)),
+                          lz.find_maximum(lz.process_data(lz.lazy(data))))
+        self.assertEqual(lz.plan(ratio), {'nodes': 5, 'passes': 1, 'fused_reductions': 2})
+        processed = eager.process_data(data)
+        self.assertEqual(ratio.compute(),
+                         eager.divide(eager.calculate_average(processed), eager.find_maximum(processed)))
+        self.assertEqual(lz.add(lz.calculate_average([1, 2]), "1").compute(), 2.5)
+
+    def test_errors_match_eager(self):
+        """Test that invalid inputs raise the same CalculatorError as eager calls"""
+        cases = [
+            lambda m: m.calculate_average(m.process_data([0, 0], 'drop')),
+            lambda m: m.find_maximum([1, "abc"]),
+            lambda m: m.calculate_average(m.process_data([1, 2], 'bogus')),
+            lambda m: m.divide(m.find_maximum([0]), m.calculate_average([0])),
+        ]
+        for build in cases:
+            with self.assertRaises(CalculatorError) as eager_error:
+                build(eager)
+            with self.assertRaises(CalculatorError) as lazy_error:
+                build(lz).compute()
+            self.assertEqual(str(lazy_error.exception), str(eager_error.exception))
+        self.assertEqual(lz.process_data([], 'bogus').compute(), [])
+        with self.assertRaises(CalculatorError):
+            lz.calculate_average(lz.calculate_average([1]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
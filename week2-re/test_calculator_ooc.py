@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for out-of-core process_data
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+from calculator_fixed import process_data, CalculatorError
+from calculator_ooc import process_data_to_file, load_results
+
+
+class TestOutOfCore(unittest.TestCase):
+    """Test chunked, resumable process_data to disk"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "out.f64")
+        self.data = [(i * 37) % 11 - 5 for i in range(1000)]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_matches_in_memory_process_data(self):
+        """Test file and iterator sources against process_data for each policy"""
+        source = os.path.join(self.tmpdir.name, "in.txt")
+        with open(source, "w") as f:
+            f.write("\n".join(str(v) for v in self.data) + "\n")
+        for handle_zeros in ('include', 'drop', 'double'):
+            result = process_data_to_file(source, self.output, handle_zeros, chunk_size=64, resume=False)
+            expected = process_data(self.data, handle_zeros)
+            self.assertEqual(list(load_results(self.output)), expected)
+            self.assertEqual(result.items_read, len(self.data))
+            self.assertEqual(result.values_written, len(expected))
+            self.assertEqual(result.chunks, 16)
+
+    def test_nan_and_negative_zero_match_process_data(self):
+        """Test that NaN and -0.0 are written as 0 or dropped, exactly like process_data()"""
+        data = [float('nan'), -0.0, 1, "-0.0", 0.0, -2.5]
+        for handle_zeros in ('include', 'drop', 'double'):
+            process_data_to_file(data, self.output, handle_zeros, resume=False)
+            written = list(load_results(self.output))
+            expected = process_data(data, handle_zeros)
+            self.assertEqual(written, expected)
+            self.assertEqual([math.copysign(1, v) for v in written], [1.0] * len(expected))
+
+    def test_resume_after_interruption(self):
+        """Test that an interrupted job resumes from its checkpoint"""
+        def interrupted():
+            for i, value in enumerate(self.data):
+                if i == 300:
+                    raise RuntimeError("simulated crash")
+                yield value
+
+        with self.assertRaises(RuntimeError):
+            process_data_to_file(interrupted(), self.output, chunk_size=128)
+        with open(self.output, "ab") as f:
+            f.write(b"partial garbage")
+        result = process_data_to_file(iter(self.data), self.output, chunk_size=128)
+        self.assertTrue(result.resumed)
+        self.assertEqual(list(load_results(self.output)), process_data(self.data))
+        # A completed job is not re-run for the same input and settings
+        self.assertEqual(process_data_to_file(iter(self.data), self.output, chunk_size=128), result)
+
+    def test_checkpoint_for_other_input_is_refused(self):
+        """Test that a checkpoint is only reused for the input and settings that wrote it"""
+        process_data_to_file(self.data, self.output, chunk_size=128)
+        mismatches = [
+            ([], 'include', 128),
+            (self.data + [1], 'include', 128),
+            ([9] + self.data[1:], 'include', 128),
+            (self.data, 'drop', 128),
+            (self.data, 'include', 64),
+        ]
+        for source, handle_zeros, chunk_size in mismatches:
+            with self.assertRaises(CalculatorError) as context:
+                process_data_to_file(source, self.output, handle_zeros, chunk_size)
+            self.assertIn("resume=False", str(context.exception))
+
+        def interrupted():
+            yield from self.data[:300]
+            raise RuntimeError("simulated crash")
+
+        other = os.path.join(self.tmpdir.name, "other.f64")
+        with self.assertRaises(RuntimeError):
+            process_data_to_file(interrupted(), other, chunk_size=128)
+        with self.assertRaises(CalculatorError):
+            process_data_to_file([5] * 1000, other, chunk_size=128)
+        result = process_data_to_file([5] * 1000, other, chunk_size=128, resume=False)
+        self.assertFalse(result.resumed)
+        self.assertEqual(list(load_results(other)), [10] * 1000)
+
+    def test_validation(self):
+        """Test errors report the global item index"""
+        with self.assertRaises(CalculatorError) as context:
+            process_data_to_file([1] * 100 + ["abc"], self.output, chunk_size=30, resume=False)
+        self.assertIn("index 100", str(context.exception))
+        with self.assertRaises(CalculatorError):
+            process_data_to_file([1], self.output, handle_zeros='bogus')
+        with self.assertRaises(CalculatorError) as context:
+            process_data_to_file([1, 2**53 + 1, 10**400], self.output, resume=False)
+        self.assertIn("index 1", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio streaming pipeline
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+import calculator_fixed
+from calculator_fixed import CalculatorError
+from calculator_pipeline import (
+    Pipeline, RunningAggregate, parse_numbers, process_values, read_chunks, validate_values
+)
+
+
+def _full_pipeline(aggregate, handle_zeros='include', queue_size=2):
+    return (Pipeline(queue_size=queue_size)
+            .add_stage("parse", parse_numbers, offload=True)
+            .add_stage("validate", validate_values(), offload=True)
+            .add_stage("process", process_values(handle_zeros), offload=True)
+            .add_stage("aggregate", aggregate.update))
+
+
+class TestPipeline(unittest.TestCase):
+    """Test that streamed results match the in-memory functions"""
+
+    def setUp(self):
+        self.values = [(i * 37) % 1001 - 500 for i in range(5000)] + [2.5, -0.5]
+        self.blocks = [" ".join(map(str, self.values[i:i + 300])).encode() + b"\n"
+                       for i in range(0, len(self.values), 300)]
+
+    def test_results_match_in_memory(self):
+        """Test parse -> validate -> process -> aggregate against describe(process_data())"""
+        for handle_zeros in ('include', 'drop', 'double'):
+            aggregate = RunningAggregate()
+            metrics = asyncio.run(_full_pipeline(aggregate, handle_zeros).run(self.blocks))
+            expected = calculator_fixed.describe(calculator_fixed.process_data(self.values, handle_zeros))
+            summary = aggregate.summary()
+            self.assertEqual((summary.count, summary.total, summary.minimum, summary.maximum),
+                             (expected.count, expected.total, expected.minimum, expected.maximum))
+            self.assertAlmostEqual(summary.variance, expected.variance)
+            self.assertEqual([m.name for m in metrics], ["parse", "validate", "process", "aggregate"])
+            self.assertEqual(metrics[0].chunks, len(self.blocks))
+            self.assertEqual(metrics[1].items_in, len(self.values))
+            self.assertEqual(metrics[3].items_in, expected.count)
+
+    def test_read_chunks_splits_on_lines(self):
+        """Test file reading with blocks smaller than a line"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "values.txt")
+            with open(path, "wb") as f:
+                f.writelines(self.blocks)
+            aggregate = RunningAggregate()
+
+            async def run():
+                await _full_pipeline(aggregate).run(read_chunks(path, chunk_bytes=1000))
+
+            asyncio.run(run())
+        self.assertEqual(aggregate.summary().total,
+                         calculator_fixed.describe(calculator_fixed.process_data(self.values)).total)
+
+    def test_invalid_value_reports_stream_index(self):
+        """Test that the error names the index in the whole stream, as validate_numeric_list() would"""
+        values = self.values[:1000] + ["abc"]
+        blocks = [" ".join(map(str, values[i:i + 300])).encode() for i in range(0, len(values), 300)]
+        with self.assertRaises(CalculatorError) as expected:
+            calculator_fixed.validate_numeric_list(values, 'values')
+        with self.assertRaises(CalculatorError) as context:
+            asyncio.run(_full_pipeline(RunningAggregate()).run(blocks))
+        self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_queues_are_bounded(self):
+        """Test that a slow sink holds queue depth at queue_size"""
+        def slow_sink(chunk):
+            time.sleep(0.002)
+
+        pipeline = Pipeline(queue_size=3).add_stage("double", lambda c: [v * 2 for v in c]) \
+                                         .add_stage("sink", slow_sink)
+        metrics = asyncio.run(pipeline.run([[i] for i in range(100)]))
+        self.assertEqual(metrics[1].items_in, 100)
+        for m in metrics:
+            self.assertLessEqual(m.queue_max, 3)
+        self.assertEqual(metrics[1].queue_max, 3)
+        self.assertIn("sink", pipeline.report())
+
+    def test_invalid_configuration(self):
+        """Test empty pipelines, duplicate stages and bad parameters"""
+        with self.assertRaises(CalculatorError):
+            asyncio.run(Pipeline().run([[1]]))
+        with self.assertRaises(CalculatorError):
+            Pipeline().add_stage("a", len).add_stage("a", len)
+        with self.assertRaises(CalculatorError):
+            Pipeline(queue_size=0)
+        with self.assertRaises(CalculatorError):
+            process_values('bogus')
+        with self.assertRaises(CalculatorError):
+            RunningAggregate().summary()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
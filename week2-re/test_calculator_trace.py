@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the call-trace recorder and replay tool
+"""
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import calculator_fixed
+from calculator_fixed import CalculatorError
+from calculator_trace import TraceRecorder, encode_arg, decode_arg, load_trace, replay
+
+
+class TestTraceRecorder(unittest.TestCase):
+    """Test recording and replaying calculator calls"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "calls.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_record_and_replay(self):
+        """Test that installed functions are traced once per outer call and replayed"""
+        with TraceRecorder(self.path, inline_limit=4) as recorder:
+            recorder.install()
+            calculator_fixed.add("1.5", 2)
+            calculator_fixed.batch_calculate_average([[1, 2], [3, 4, 5]])
+            calculator_fixed.calculate_average(list(range(100)))
+            with self.assertRaises(CalculatorError):
+                calculator_fixed.divide(1, 0)
+            self.assertEqual(recorder.recorded, 4)
+        self.assertFalse(hasattr(calculator_fixed.add, '__wrapped__'))
+
+        with open(self.path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e['fn'] for e in entries],
+                         ['add', 'batch_calculate_average', 'calculate_average', 'divide'])
+        self.assertEqual(entries[2]['a'][0], {'len': 100, 'dtype': 'int'})
+
+        calls = load_trace(self.path)
+        self.assertEqual(calls[0][2], ("1.5", 2))
+        self.assertEqual([len(l) for l in calls[1][2][0]], [2, 3])
+        report = replay(self.path)
+        self.assertEqual(report.calls, 4)
+        self.assertEqual(report.errors, 1)
+        self.assertGreater(report.throughput, 0)
+        self.assertLessEqual(report.p50_ms, report.p99_ms)
+
+    def test_sampling(self):
+        """Test that sample_rate=0 records nothing"""
+        with TraceRecorder(self.path, sample_rate=0.0) as recorder:
+            recorder.wrap(calculator_fixed.add)(1, 2)
+            self.assertEqual(recorder.recorded, 0)
+        with self.assertRaises(CalculatorError):
+            TraceRecorder(self.path, sample_rate=2.0)
+
+    def test_recording_never_changes_the_call(self):
+        """Test huge ints are recorded by size and recording failures are only counted"""
+        with TraceRecorder(self.path) as recorder:
+            recorder.install()
+            self.assertEqual(calculator_fixed.add(10**5000, 1), 10**5000 + 1)
+            self.assertEqual(calculator_fixed.find_maximum([1, -10**5000]), 1)
+            self.assertEqual((recorder.recorded, recorder.dropped), (2, 0))
+            recorder._file.close()
+            self.assertEqual(calculator_fixed.add(1, 2), 3)
+            self.assertEqual(recorder.dropped, 1)
+            recorder._file = open(self.path, 'a', encoding='utf-8')
+        (_, _, args, _), (_, _, (values,), _) = load_trace(self.path)
+        self.assertEqual(args[0].bit_length(), (10**5000).bit_length())
+        self.assertEqual(len(values), 2)
+
+    def test_shape_round_trip(self):
+        """Test that shape descriptors decode to inputs of the same shape and type"""
+        rng = random.Random(1)
+        data = decode_arg(encode_arg(["1", "2", "3"], record_values=False), rng)
+        self.assertEqual(len(data), 3)
+        self.assertTrue(all(isinstance(v, str) for v in data))
+        self.assertEqual(decode_arg(encode_arg(3.5), rng), 3.5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)